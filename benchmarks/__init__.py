@@ -0,0 +1,5 @@
+"""
+Benchmarks of the performance-sensitive stages.
+
+Run a benchmark from the repository root as a module, such as ``python -m benchmarks.manifest_entries``.
+"""
@@ -0,0 +1,76 @@
+"""
+Benchmark of decrypting a manifest asset in-process against decrypting it by the ``dotnet`` decryption library.
+
+Uses the manifest asset at the given path, or random data of the given size if no path is given.
+The key and the IV are read from the arguments or the ``CRYPTO_KEY`` and ``CRYPTO_IV`` environment variables,
+and are random if none is given for the random data.
+
+For a manifest asset, the time to load the decrypted asset by UnityPy is also reported,
+from memory for the in-process path and from the decrypted file for the ``dotnet`` path.
+"""
+import argparse
+import base64
+import os
+# The usage of `subprocess` is safe
+import subprocess  # nosec
+import tempfile
+import time
+
+import UnityPy
+
+from dlasset.utils import decrypt_rijndael_cbc
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks the in-process and the `dotnet` manifest decryption.")
+    parser.add_argument("path", type=str, nargs="?", default=None, help="Encrypted manifest asset path")
+    parser.add_argument("-s", "--size", type=float, default=4, help="Size of the random data in MB if no path")
+    parser.add_argument("-key", "--key", type=str, default=os.environ.get("CRYPTO_KEY"), help="Key in base64")
+    parser.add_argument("-iv", "--iv", type=str, default=os.environ.get("CRYPTO_IV"), help="IV in base64")
+    parser.add_argument("-l", "--lib", type=str, default=os.path.join("lib", "decrypt", "Decrypt.dll"),
+                        help="Path of the decryption library")
+    args = parser.parse_args()
+
+    if args.path:
+        with open(args.path, "rb") as f:
+            data = f.read()
+    else:
+        data = os.urandom(int(args.size * 1024 ** 2) // 32 * 32)
+
+    key = args.key or base64.b64encode(os.urandom(32)).decode()
+    iv = args.iv or base64.b64encode(os.urandom(32)).decode()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path_encrypted = os.path.join(temp_dir, "manifest")
+        path_decrypted = os.path.join(temp_dir, "manifest.decrypted")
+        with open(path_encrypted, "wb") as f:
+            f.write(data)
+
+        start = time.perf_counter()
+        decrypted = decrypt_rijndael_cbc(data, base64.b64decode(key), base64.b64decode(iv))
+        in_process_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        subprocess.run(["dotnet", args.lib, path_encrypted, path_decrypted, key, iv], check=True)  # nosec
+        dotnet_time = time.perf_counter() - start
+
+        with open(path_decrypted, "rb") as f:
+            matched = f.read() == decrypted
+
+        print(f"Data: {len(data) / 1024 ** 2:.2f} MB ({'manifest asset' if args.path else 'random'})")
+        print(f"In-process: {in_process_time:.3f} secs")
+        print(f"dotnet: {dotnet_time:.3f} secs")
+        print(f"Outputs matched: {matched}")
+
+        if args.path:
+            start = time.perf_counter()
+            UnityPy.load(decrypted)
+            print(f"Load from memory: {time.perf_counter() - start:.3f} secs")
+
+            start = time.perf_counter()
+            UnityPy.load(path_decrypted)
+            print(f"Load from file: {time.perf_counter() - start:.3f} secs")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark of the memory footprint and the pickle size of the manifest model.
+
+Builds a synthetic manifest of 4 locales, then reports:
+
+- Memory retained by the manifest model after the parsed manifest trees are released by the caller
+- Size of the pickled entries of an exporting task, which are sent to the workers
+- Size of the pickled manifest model
+"""
+import argparse
+import gc
+import pickle
+import random
+import time
+import tracemalloc
+
+from dlasset.enums import Locale
+from dlasset.manifest import Manifest
+
+
+def make_tree(entry_count: int, seed: int) -> dict:
+    rng = random.Random(seed)
+
+    # Strings are created per locale, as the manifest of each locale is parsed separately
+    entries = []
+    for idx in range(entry_count):
+        dependencies = [f"shader/common/{rng.randrange(200):04d}" for _ in range(rng.randrange(4))]
+        entries.append({
+            "name": f"characters/motion/{idx:06d}/anim_{idx:06d}",
+            "hash": f"{rng.getrandbits(128):032X}",
+            "size": rng.randrange(1024, 4 * 1024 * 1024),
+            "group": rng.randrange(4),
+            "dependencies": dependencies,
+            "assets": [f"assets/_gluonresources/characters/motion/{idx:06d}/anim_{idx:06d}.anim"],
+        })
+    entries.extend(
+        {
+            "name": f"shader/common/{idx:04d}", "hash": f"{rng.getrandbits(128):032X}", "size": 1024, "group": 0,
+            "dependencies": [], "assets": [f"assets/_gluonresources/shader/common/{idx:04d}.shader"],
+        }
+        for idx in range(200)
+    )
+
+    return {
+        "categories": [{"name": "Character", "assets": entries}],
+        "rawAssets": [
+            {"name": f"sound/{idx:05d}.awb", "hash": f"{rng.getrandbits(128):032X}", "size": 1024, "group": 0}
+            for idx in range(entry_count // 10)
+        ],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks the memory and the pickle size of the manifest model.")
+    parser.add_argument("-n", "--entries", type=int, default=60000, help="Count of the entries of each locale")
+    args = parser.parse_args()
+
+    gc.collect()
+    tracemalloc.start()
+
+    data = {locale: make_tree(args.entries, seed=0) for locale in Locale}
+    tree_memory = tracemalloc.get_traced_memory()[0]
+
+    start = time.perf_counter()
+    manifest = Manifest(data)
+    build_time = time.perf_counter() - start
+
+    del data
+    gc.collect()
+    model_memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    manifest_of_locale = manifest.manifests[Locale.JP]
+    task_entries = [
+        manifest.get_entries_including_dependencies(Locale.JP, entry)
+        for entry in list(manifest_of_locale.entries_across_category)[:1000]
+    ]
+    task_pickle_size = sum(len(pickle.dumps(entries)) for entries in task_entries) / len(task_entries)
+
+    start = time.perf_counter()
+    manifest_pickle = pickle.dumps(manifest, protocol=pickle.HIGHEST_PROTOCOL)
+    dump_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pickle.loads(manifest_pickle)
+    load_time = time.perf_counter() - start
+
+    print(f"Manifest trees: {tree_memory / 1024 ** 2:.1f} MB")
+    print(f"Manifest model retained: {model_memory / 1024 ** 2:.1f} MB (built in {build_time:.3f} secs)")
+    print(f"Pickled entries of a task: {task_pickle_size:.0f} bytes on average")
+    print(f"Pickled manifest model: {len(manifest_pickle) / 1024 ** 2:.1f} MB "
+          f"(dumped in {dump_time:.3f} secs, loaded in {load_time:.3f} secs)")
+
+
+if __name__ == '__main__':
+    main()
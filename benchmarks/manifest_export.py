@@ -0,0 +1,90 @@
+"""
+Benchmark of getting the manifest model of all locales from the manifest exporting workers.
+
+Each worker makes a synthetic manifest tree of a locale, standing for the tree exported from the manifest asset,
+then returns either:
+
+- ``tree``: the tree, and the parent builds the models of all locales from the returned trees
+- ``model``: the model of the locale built in the worker
+
+Reports the wall time of the stage, the CPU time spent by the parent, which is serial whatever the worker count is,
+and the growth of the peak RSS of the parent during the stage, sampled every ``RSS_SAMPLE_INTERVAL`` seconds.
+"""
+import argparse
+import tempfile
+import threading
+import time
+from typing import Any, Union
+
+import psutil
+
+from benchmarks.manifest_entries import make_tree
+from dlasset.enums import Locale
+from dlasset.manifest import Manifest, ManifestLocale
+from dlasset.utils import concurrent_run
+
+RSS_SAMPLE_INTERVAL = 0.05
+
+
+def get_manifest_of_locale(mode: str, entry_count: int) -> Union[dict[Any, Any], ManifestLocale]:
+    tree = make_tree(entry_count, seed=0)
+
+    return tree if mode == "tree" else ManifestLocale(tree)
+
+
+class PeakRssSampler:
+    """Sample the RSS of the current process in a thread to get its peak."""
+
+    def __init__(self) -> None:
+        self._process = psutil.Process()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample_loop, daemon=True)
+
+        self.peak = self._process.memory_info().rss
+
+    def _sample_loop(self) -> None:
+        while not self._stop.wait(RSS_SAMPLE_INTERVAL):
+            self.peak = max(self.peak, self._process.memory_info().rss)
+
+    def __enter__(self) -> "PeakRssSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def run_stage(mode: str, entry_count: int, log_dir: str) -> None:
+    sampler = PeakRssSampler()
+    rss_before = sampler.peak
+    start = time.perf_counter()
+    start_cpu = time.process_time()
+
+    with sampler:
+        results = concurrent_run(
+            get_manifest_of_locale, [[mode, entry_count] for _ in Locale], log_dir,
+            key_of_call=lambda *_: object()
+        )
+        manifest = Manifest(dict(zip(Locale, results.values())))
+
+    stage_time = time.perf_counter() - start
+    parent_cpu_time = time.process_time() - start_cpu
+    peak_rss_growth = sampler.peak - rss_before
+
+    print(f"{mode}: {stage_time:.3f} secs, parent CPU {parent_cpu_time:.3f} secs, "
+          f"parent peak RSS +{peak_rss_growth / 1024 ** 2:.1f} MB ({len(manifest.hashes)} hashes)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks returning the manifest of each locale from workers.")
+    parser.add_argument("mode", type=str, choices=("tree", "model"), help="What the workers return")
+    parser.add_argument("-n", "--entries", type=int, default=60000, help="Count of the entries of each locale")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        run_stage(args.mode, args.entries, log_dir)
+
+
+if __name__ == '__main__':
+    main()
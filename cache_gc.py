@@ -0,0 +1,33 @@
+import argparse
+
+from dlasset.config import load_config
+from dlasset.manage import evict_assets
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Evicts the downloaded assets not referenced by the recently used manifests."
+    )
+
+    parser.add_argument("-c", "--config", type=str, required=True,
+                        help="Config file path to use. The assets in the downloaded directory in it are evicted")
+    parser.add_argument("-k", "--keep", type=int, default=1,
+                        help="Count of the most recently used manifest versions to keep the assets of")
+    parser.add_argument("-s", "--max-size", type=float, default=None,
+                        help="Cache size cap in GB. If provided, only the least recently used unreferenced assets "
+                             "are evicted until the cache fits in the cap")
+    parser.add_argument("-n", "--dry-run", action="store_true", default=False,
+                        help="Only report the reclaimable assets without evicting them")
+
+    args = parser.parse_args()
+
+    evict_assets(
+        load_config(args.config).paths.downloaded,
+        keep_versions=args.keep,
+        max_size=int(args.max_size * 1024 ** 3) if args.max_size is not None else None,
+        dry_run=args.dry_run,
+    )
+
+
+if __name__ == '__main__':
+    main()
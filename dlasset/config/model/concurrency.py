@@ -1,19 +1,39 @@
 """Concurrency config model class."""
+import os
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Optional, cast
 
+from dlasset.utils import RetryPolicy
 from .base import ConfigBase
 
 __all__ = ("Concurrency",)
 
+# Same as the default of ``ThreadPoolExecutor``
+DEFAULT_DOWNLOAD_THREADS = min(32, (os.cpu_count() or 1) + 4)
+
 
 @dataclass
 class Concurrency(ConfigBase):
     """Various concurrency settings."""
 
     processes: Optional[int] = field(init=False)
+    download_threads: int = field(init=False)
     batch_size: Optional[int] = field(init=False)
+    max_tasks_per_worker: Optional[int] = field(init=False)
+    memory_budget: Optional[int] = field(init=False)
+    memory_floor: Optional[int] = field(init=False)
+    error_tolerant: bool = field(init=False)
+    retry: RetryPolicy = field(init=False)
 
     def __post_init__(self) -> None:
         self.processes = self.json_obj.get("processes")
+        self.download_threads = self.json_obj.get("downloadThreads", DEFAULT_DOWNLOAD_THREADS)
         self.batch_size = self.json_obj.get("batchSize")
+        self.max_tasks_per_worker = self.json_obj.get("maxTasksPerWorker")
+        self.memory_budget = self.json_obj.get("memoryBudget")
+        self.memory_floor = self.json_obj.get("memoryFloor")
+        self.error_tolerant = cast(bool, self.json_obj.get("errorTolerant", False))
+        self.retry = RetryPolicy(
+            max_retries=self.json_obj.get("maxRetries", 0),
+            backoff=self.json_obj.get("retryBackoff", 1),
+        )
@@ -5,6 +5,7 @@ from typing import Optional
 from .base import ConfigBase
 from .concurrency import Concurrency
 from .global_ import Global
+from .network import Network
 from .paths import Paths
 from .task import AssetAudioTask, AssetTask
 
@@ -17,12 +18,18 @@ class Config(ConfigBase):
 
     paths: Paths = field(init=False)
     concurrency: Concurrency = field(init=False)
+    network: Network = field(init=False)
     asset_tasks: tuple[AssetTask, ...] = field(init=False)
     audio_task: Optional[AssetAudioTask] = field(init=False)
 
     def __post_init__(self) -> None:
         self.paths = Paths(self.json_obj["paths"])
         self.concurrency = Concurrency(self.json_obj.get("concurrency", {}))
+        self.network = Network(self.json_obj.get("network", {}))
+        if "poolSize" not in self.json_obj.get("network", {}):
+            # Keep the connections of all download threads alive
+            http_client = self.network.http_client
+            http_client.pool_size = max(http_client.pool_size, self.concurrency.download_threads)
         self.global_ = Global(self.json_obj.get("global", {}))
         self.asset_tasks = tuple(AssetTask(task) for task in self.json_obj["assets"])
         self.audio_task = AssetAudioTask(self.json_obj["audio"]) if "audio" in self.json_obj else None
@@ -0,0 +1,30 @@
+"""Network config model class."""
+from dataclasses import dataclass, field
+from typing import cast
+
+from dlasset.const import CDN_BASE_URL
+from dlasset.utils import HttpClientSettings
+from .base import ConfigBase
+
+__all__ = ("Network",)
+
+
+@dataclass
+class Network(ConfigBase):
+    """Various network settings."""
+
+    cdn_base_url: str = field(init=False)
+    http_client: HttpClientSettings = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.cdn_base_url = cast(str, self.json_obj.get("cdnBaseUrl", CDN_BASE_URL)).rstrip("/")
+
+        default = HttpClientSettings()
+
+        self.http_client = HttpClientSettings(
+            pool_size=self.json_obj.get("poolSize", default.pool_size),
+            connect_timeout=self.json_obj.get("connectTimeout", default.connect_timeout),
+            read_timeout=self.json_obj.get("readTimeout", default.read_timeout),
+            max_retries=self.json_obj.get("maxRetries", default.max_retries),
+            backoff=self.json_obj.get("retryBackoff", default.backoff),
+        )
@@ -1,3 +1,6 @@
 """Implmentations for the environment."""
 from .args import get_cli_args
+from .context import RunContext, get_run_context
 from .main import Environment, init_env
+from .quarantine import Quarantine
+from .timings import TaskTimings
@@ -2,7 +2,7 @@
 import argparse
 import os
 from dataclasses import dataclass
-from typing import cast
+from typing import Optional, cast
 
 __all__ = ("CliArgs", "get_cli_args")
 
@@ -16,6 +16,10 @@ class CliArgs:
     key: str
     config_path: str
     no_index: bool
+    no_manifest_cache: bool
+    prefetch_only: bool
+    diff_base: Optional[str]
+    dotnet_decrypt: bool
 
 
 def get_cli_args() -> CliArgs:
@@ -32,6 +36,17 @@ def get_cli_args() -> CliArgs:
                         help="Config file path to use")
     parser.add_argument("-ni", "--no-index", action="store_true", default=False,
                         help="File index will be ignored if this flag is provided")
+    parser.add_argument("-nmc", "--no-manifest-cache", action="store_true", default=False,
+                        help="Manifest will be downloaded and processed again even if cached by a previous run")
+    parser.add_argument("-po", "--prefetch-only", action="store_true", default=False,
+                        help="Only download the updated assets to export without exporting them")
+    parser.add_argument("-db", "--diff-base", type=str, default=None,
+                        help="Manifest version code to compare with. If provided, only the assets changed "
+                             "since this version are exported instead of the ones updated in the file index. "
+                             "The manifest of this version must be cached by a previous run")
+    parser.add_argument("-dnd", "--dotnet-decrypt", action="store_true", default=False,
+                        help="Decrypt the manifest assets using the `dotnet` decryption library "
+                             "instead of decrypting them in-process")
 
     args = parser.parse_args()
 
@@ -41,4 +56,8 @@ def get_cli_args() -> CliArgs:
         key=cast(str, args.key or os.environ["CRYPTO_KEY"]),
         config_path=cast(str, args.config),
         no_index=cast(bool, args.no_index),
+        no_manifest_cache=cast(bool, args.no_manifest_cache),
+        prefetch_only=cast(bool, args.prefetch_only),
+        diff_base=cast(Optional[str], args.diff_base),
+        dotnet_decrypt=cast(bool, args.dotnet_decrypt),
     )
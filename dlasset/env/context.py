@@ -0,0 +1,74 @@
+"""Implementations for the run context shared with the worker processes."""
+import os.path
+from dataclasses import dataclass
+from typing import Optional, TYPE_CHECKING
+
+from dlasset.config import Config
+from dlasset.const import MANIFEST_NAMES
+from dlasset.enums import Locale
+from dlasset.utils import configure_http_client
+from .args import CliArgs
+
+if TYPE_CHECKING:
+    from dlasset.manage import CachedAssetIndex
+
+__all__ = ("RunContext", "get_run_context", "set_run_context")
+
+
+@dataclass
+class RunContext:
+    """
+    Settings of a run which don't change during the run.
+
+    Worker processes get this once at start, so the tasks don't need to carry it.
+
+    ``asset_index`` is the index of the downloaded assets of the main process, if loaded.
+    Worker processes get its state at their start, so they don't need to scan the downloaded assets again.
+    """
+
+    args: CliArgs
+    config: Config
+
+    asset_index: Optional["CachedAssetIndex"] = None
+
+    def manifest_asset_path_of_locale(self, locale: Locale) -> str:
+        """Get the manifest asset path of ``locale``."""
+        return os.path.join(self.manifest_asset_dir, MANIFEST_NAMES[locale])
+
+    def manifest_asset_decrypted_path(self, locale: Locale) -> str:
+        """Get the decrypted manifest asset path of ``locale``."""
+        return f"{self.manifest_asset_path_of_locale(locale)}.decrypted"
+
+    @property
+    def manifest_asset_dir(self) -> str:
+        """Directory of the encrypted manifest assets."""
+        return os.path.join(self.config.paths.downloaded, "manifest", self.args.version_code)
+
+    @property
+    def downloaded_assets_dir(self) -> str:
+        """Directory of the downloaded assets."""
+        return os.path.join(self.config.paths.downloaded, "assets")
+
+    @property
+    def run_context(self) -> "RunContext":
+        """Get the run context only, which is cheap to send to the worker processes."""
+        return RunContext(args=self.args, config=self.config, asset_index=self.asset_index)
+
+
+_RUN_CONTEXT: Optional[RunContext] = None
+
+
+def set_run_context(context: RunContext) -> None:
+    """Set the run context of the current process, and apply the process-wide settings of it."""
+    global _RUN_CONTEXT  # pylint: disable=global-statement
+    _RUN_CONTEXT = context
+
+    configure_http_client(context.config.network.http_client)
+
+
+def get_run_context() -> RunContext:
+    """Get the run context of the current process."""
+    if not _RUN_CONTEXT:
+        raise RuntimeError("Run context is not set")
+
+    return _RUN_CONTEXT
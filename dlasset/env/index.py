@@ -90,10 +90,7 @@ class FileIndex:
         # Hash mismatch is considered as updated
         return self._data[locale][entry.name] != entry.hash
 
-    def update_entry(
-            self, locale: Locale, task: "AssetTask", entry: "ManifestEntryBase",
-            subtask_results: dict[AssetSubTask, list["ExportResult"]]
-    ) -> None:
+    def update_entry(self, locale: Locale, entry: "ManifestEntryBase") -> None:
         """Update ``entry`` in the index."""
         if not self.enabled:
             # Do nothing if not enabled
@@ -101,9 +98,16 @@ class FileIndex:
 
         self._data[locale][entry.name] = entry.hash
 
+    def add_export_result(
+            self, locale: Locale, task: "AssetTask", subtask: AssetSubTask, export_result: "ExportResult"
+    ) -> None:
+        """Add ``export_result`` of ``subtask`` to the updated file index if it should be exported."""
+        if not self.enabled:
+            # Do nothing if not enabled
+            return
+
         if self.export_updated or task.export_updated_file_index:
-            for subtask, export_results in subtask_results.items():
-                self._updated[locale][task][subtask].extend(export_results)
+            self._updated[locale][task][subtask].append(export_result)
 
     def _export_index(self) -> None:
         for locale, data in self._data.items():
@@ -3,25 +3,27 @@ import os.path
 import shutil
 from dataclasses import dataclass, field
 from datetime import datetime
+from typing import ContextManager
 
 from dlasset.config import Config
-from dlasset.const import MANIFEST_NAMES
-from dlasset.enums import Locale
 from dlasset.log import init_log, log, log_group_end, log_group_start
+from dlasset.utils import WorkerPool, format_bytes, worker_pool
 from .args import CliArgs
+from .context import RunContext, set_run_context
 from .index import FileIndex
+from .quarantine import Quarantine
+from .timings import TaskTimings
 
 __all__ = ("init_env", "Environment")
 
 
 @dataclass
-class Environment:
+class Environment(RunContext):
     """Settings related to the environment."""
 
-    args: CliArgs
-    config: Config
-
     index: FileIndex = field(init=False)
+    timings: TaskTimings = field(init=False)
+    quarantine: Quarantine = field(init=False)
 
     init_time: datetime = field(init=False)
 
@@ -33,26 +35,47 @@ class Environment:
             export_updated=self.config.global_.export_updated_file_index,
             export_updated_dir=self.config.paths.updated
         )
+        self.timings = TaskTimings(index_dir=self.config.paths.index)
+        self.quarantine = Quarantine(index_dir=self.config.paths.index)
 
         self.init_time = datetime.utcnow()
 
-    def manifest_asset_path_of_locale(self, locale: Locale) -> str:
-        """Get the manifest asset path of ``locale``."""
-        return os.path.join(self.manifest_asset_dir, MANIFEST_NAMES[locale])
-
-    def manifest_asset_decrypted_path(self, locale: Locale) -> str:
-        """Get the decrypted manifest asset path of ``locale``."""
-        return f"{self.manifest_asset_path_of_locale(locale)}.decrypted"
-
     @property
-    def manifest_asset_dir(self) -> str:
-        """Directory of the encrypted manifest assets."""
-        return os.path.join(self.config.paths.downloaded, "manifest", self.args.version_code)
+    def manifest_diff_report_path(self) -> str:
+        """Path of the report of the manifest changes since the version to compare with."""
+        return os.path.join(self.config.paths.log, "manifest-diff.json")
 
     @property
-    def downloaded_assets_dir(self) -> str:
-        """Directory of the downloaded assets."""
-        return os.path.join(self.config.paths.downloaded, "assets")
+    def schedule_report_path(self) -> str:
+        """Path of the report of the predicted and actual duration of the exporting tasks in this run."""
+        return os.path.join(self.config.paths.log, f"schedule-{self.init_time.strftime('%Y%m%d-%H%M%S')}.json")
+
+    def _print_concurrency_info(self) -> None:
+        concurrency = self.config.concurrency
+
+        if concurrency.processes:
+            log("INFO", f"Max processes to use: {concurrency.processes}")
+        log("INFO", f"Max threads to download assets: {concurrency.download_threads}")
+        if concurrency.batch_size:
+            log("INFO", f"Task batch size: {concurrency.batch_size}")
+        if concurrency.max_tasks_per_worker:
+            log("INFO", f"Max tasks per worker: {concurrency.max_tasks_per_worker}")
+        if concurrency.memory_budget:
+            log("INFO", f"Memory budget per worker: {format_bytes(concurrency.memory_budget)}")
+        if concurrency.memory_floor:
+            log("INFO", f"Minimum available memory to start new tasks: {format_bytes(concurrency.memory_floor)}")
+        log("INFO", f"Max retries of a failed task: {concurrency.retry.max_retries}")
+        log("INFO", f"CDN base URL: {self.config.network.cdn_base_url}")
+        log("INFO", f"HTTP connection pool size: {self.config.network.http_client.pool_size}")
+        if self.config.network.http_client.pool_size < concurrency.download_threads:
+            log(
+                "WARNING",
+                "HTTP connection pool size is less than the count of the download threads. "
+                "Connections exceeding the pool size are discarded instead of being reused."
+            )
+        log("INFO", f"Error tolerant: {concurrency.error_tolerant}")
+        if self.quarantine:
+            log("WARNING", f"{len(self.quarantine)} quarantined entries will be exported again.")
 
     def print_info(self) -> None:
         """Print the info about the current environment."""
@@ -65,10 +88,7 @@ class Environment:
         log("INFO", f"Config file path: {self.args.config_path}")
         log("INFO", "-" * 20)
         log("INFO", f"External library directory: {self.config.paths.lib}")
-        if self.config.concurrency.processes:
-            log("INFO", f"Max processes to use: {self.config.concurrency.processes}")
-        if self.config.concurrency.batch_size:
-            log("INFO", f"Task batch size: {self.config.concurrency.batch_size}")
+        self._print_concurrency_info()
         log("INFO", "-" * 20)
         log("INFO", f"Manifest asset directory: {self.manifest_asset_dir}")
         log("INFO", f"Downloaded assets directory: {self.downloaded_assets_dir}")
@@ -77,6 +97,10 @@ class Environment:
         log("INFO", f"Log root directory: {self.config.paths.log}")
         log("INFO", "-" * 20)
         log("INFO", f"Disable file indexing: {self.args.no_index}")
+        log("INFO", f"Disable manifest cache: {self.args.no_manifest_cache}")
+        log("INFO", f"Prefetch only: {self.args.prefetch_only}")
+        if self.args.diff_base:
+            log("INFO", f"Export the changes since version: {self.args.diff_base}")
         log("INFO", "Suppressed warnings:")
         for task in self.config.asset_tasks:
             if not task.suppress_warnings:
@@ -101,10 +125,28 @@ class Environment:
             log("DEBUG", "Making directory for exported audio...")
             os.makedirs(self.config.audio_task.export_dir, exist_ok=True)
 
+    def worker_pool(self) -> ContextManager[WorkerPool]:
+        """Get a context manager starting the worker pool to share across the whole run."""
+        return worker_pool(
+            self.config.paths.log,
+            max_workers=self.config.concurrency.processes,
+            max_tasks_per_worker=self.config.concurrency.max_tasks_per_worker,
+            memory_budget=self.config.concurrency.memory_budget,
+            memory_floor=self.config.concurrency.memory_floor,
+            initializer=set_run_context,
+            initargs=(self.run_context,),
+        )
+
     def prepare_logging(self) -> None:
         """Prepare logging factory."""
         init_log(self.config.paths.log)
 
+    def export_index(self) -> None:
+        """Store the file index, the task timings and the quarantine to their files."""
+        self.index.update_index_files(self.init_time)
+        self.timings.export()
+        self.quarantine.export()
+
     def cleanup(self) -> None:
         """Perform cleanup tasks."""
         log_group_start("Clean Up")
@@ -120,6 +162,7 @@ def init_env(args: CliArgs, config: Config) -> Environment:
     log_group_start("Environment initialization")
 
     env = Environment(args, config)
+    set_run_context(env.run_context)
     log("INFO", "Creating directories...")
     env.init_dirs()
     log("INFO", "Initializing logging...")
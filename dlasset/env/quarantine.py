@@ -0,0 +1,92 @@
+"""Implementations for the quarantine of the entries failed to export."""
+import json
+import os.path
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Sequence, TypedDict
+
+from dlasset.config import AssetSubTask, AssetTask
+from dlasset.enums import Locale
+from dlasset.utils import export_json
+
+if TYPE_CHECKING:
+    from dlasset.manifest import ManifestEntryBase
+
+__all__ = ("Quarantine",)
+
+
+class QuarantineEntry(TypedDict):
+    """Entry of the quarantine file."""
+
+    hash: str
+    dependencies: list[str]
+    # key = subtask title; value = error message
+    errors: dict[str, str]
+
+
+@dataclass
+class Quarantine:
+    """
+    Entries failed to export even after retries.
+
+    Quarantined entries are always exported in the next run regardless of the file index,
+    and released once they are exported successfully.
+    """
+
+    index_dir: str
+
+    # key = task name; value = (key = locale; value = (key = main entry name; value = quarantine entry))
+    _data: dict[str, dict[str, dict[str, QuarantineEntry]]] = field(init=False)
+
+    def __post_init__(self) -> None:
+        self._data = {}
+
+        if not os.path.exists(self.file_path):
+            return
+
+        with open(self.file_path, "r", encoding="utf-8") as f:
+            self._data = json.load(f)
+
+    def __len__(self) -> int:
+        return sum(len(entries) for locales in self._data.values() for entries in locales.values())
+
+    @property
+    def file_path(self) -> str:
+        """Path of the quarantine file."""
+        return os.path.join(self.index_dir, "quarantine.json")
+
+    def is_quarantined(self, task: AssetTask, locale: Locale, entry: "ManifestEntryBase") -> bool:
+        """Check if the main ``entry`` of ``task`` is quarantined."""
+        return entry.name in self._data.get(task.name, {}).get(locale.value, {})
+
+    def get_entry_names(self, task: AssetTask, locale: Locale) -> set[str]:
+        """Get the names of the main entries of ``task`` quarantined in ``locale``."""
+        return set(self._data.get(task.name, {}).get(locale.value, {}))
+
+    def add(
+            self, task: AssetTask, sub_task: AssetSubTask, locale: Locale,
+            entries: Sequence["ManifestEntryBase"], error: BaseException
+    ) -> None:
+        """Quarantine ``entries`` of ``locale`` which failed to export in ``sub_task`` of ``task``."""
+        main_entry = entries[0]
+
+        quarantine_entry = self._data.setdefault(task.name, {}).setdefault(locale.value, {}).setdefault(
+            main_entry.name,
+            {"hash": main_entry.hash, "dependencies": [entry.name for entry in entries[1:]], "errors": {}}
+        )
+        quarantine_entry["errors"][sub_task.title] = f"{error.__class__.__name__}: {error}"
+
+    def release(self, task: AssetTask, locale: Locale, entry: "ManifestEntryBase") -> None:
+        """Release the main ``entry`` of ``task`` from the quarantine."""
+        entries = self._data.get(task.name, {}).get(locale.value, {})
+        entries.pop(entry.name, None)
+
+    def export(self) -> None:
+        """Store the quarantined entries to its file."""
+        # Drop empty tasks and locales
+        self._data = {
+            task_name: {locale: entries for locale, entries in locales.items() if entries}
+            for task_name, locales in self._data.items()
+            if any(locales.values())
+        }
+
+        export_json(self.file_path, self._data)
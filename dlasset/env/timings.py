@@ -0,0 +1,66 @@
+"""Implementations for the task timings of the previous runs."""
+import json
+import os.path
+from dataclasses import dataclass, field
+from typing import Optional
+
+from dlasset.utils import export_json
+
+__all__ = ("TaskTimings",)
+
+
+@dataclass
+class TaskTimings:
+    """
+    Time spent on each exporting task in the previous runs.
+
+    Used for estimating the time needed of a task.
+    """
+
+    index_dir: str
+
+    # key = task key; value = (task cost in bytes, seconds spent)
+    _data: dict[str, tuple[int, float]] = field(init=False)
+
+    def __post_init__(self) -> None:
+        self._data = {}
+
+        if not os.path.exists(self.file_path):
+            return
+
+        with open(self.file_path, "r", encoding="utf-8") as f:
+            self._data = {key: (cost, duration) for key, (cost, duration) in json.load(f).items()}
+
+    @property
+    def file_path(self) -> str:
+        """Path of the timings file."""
+        return os.path.join(self.index_dir, "timings.json")
+
+    @property
+    def seconds_per_byte(self) -> Optional[float]:
+        """
+        Get the average seconds spent for each byte of the task cost in the previous runs.
+
+        Returns ``None`` if there's no timing data.
+        """
+        total_cost = sum(cost for cost, _ in self._data.values())
+
+        if not total_cost:
+            return None
+
+        return sum(duration for _, duration in self._data.values()) / total_cost
+
+    def get_duration(self, key: str) -> Optional[float]:
+        """Get the seconds spent on the task of ``key`` in the previous run. Returns ``None`` if not recorded."""
+        if key not in self._data:
+            return None
+
+        return self._data[key][1]
+
+    def record(self, key: str, cost: int, duration: float) -> None:
+        """Record that the task of ``key`` having ``cost`` bytes took ``duration`` seconds."""
+        self._data[key] = (cost, duration)
+
+    def export(self) -> None:
+        """Store the timings to its file."""
+        export_json(self.file_path, self._data, separators=(",", ":"))
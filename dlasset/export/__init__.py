@@ -1,7 +1,7 @@
 """Implementations for exporting Unity assets."""
 from .audio import export_audio
-from .main import export_asset
+from .main import export_asset, export_unity_asset
 from .model import ExportInfo
 from .result import ExportResult
-from .task import export_by_task
+from .task import export_by_tasks, prefetch_by_tasks
 from .types import *  # noqa
@@ -6,12 +6,13 @@ import shutil
 # The usage of `subprocess` is safe
 import subprocess  # nosec
 import sys
+import time
 from collections import namedtuple
 from typing import TYPE_CHECKING
 
 from dlasset.config import AssetAudioTask
-from dlasset.env import Environment
-from dlasset.log import log, log_group_end, log_group_start, log_periodic
+from dlasset.env import Environment, get_run_context
+from dlasset.log import log, log_periodic
 from dlasset.manage import get_asset_paths
 from dlasset.utils import concurrent_run, concurrent_run_no_return
 
@@ -24,10 +25,11 @@ AudioDownloadResult = namedtuple("AudioDownloadResult", ["awb_path", "manifest_e
 
 
 def export_single_awb_subsong(
-        env: Environment, executable_path: str, download_result: AudioDownloadResult,
-        subsong_idx: int, has_name: bool
+        executable_path: str, download_result: AudioDownloadResult, subsong_idx: int, has_name: bool
 ) -> None:
     """Export a subsong of an audio."""
+    env = get_run_context()
+
     if not env.config.audio_task:
         log("ERROR", "Attempt to export audio but audio task is not defined.")
         sys.exit(1)
@@ -70,17 +72,17 @@ def export_awb_subsongs(env: Environment, download_result: AudioDownloadResult)
     concurrent_run_no_return(
         export_single_awb_subsong,
         [
-            [env, executable_path, download_result, subsong_idx, has_name]
+            [executable_path, download_result, subsong_idx, has_name]
             for subsong_idx in range(subsong_count)
         ],
         env.config.paths.log
     )
 
 
-def download_audio_to_temp(
-        env: Environment, audio_entry: "ManifestRawEntry"
-) -> AudioDownloadResult:
+def download_audio_to_temp(audio_entry: "ManifestRawEntry") -> AudioDownloadResult:
     """Download the audio assets of ``audio_entry`` to the temp direcotry."""
+    env = get_run_context()
+
     log_periodic("INFO", "Downloading audio assets...", period=3)
 
     # Downloads the asset of ``audio_entry``, the return is useless here
@@ -91,14 +93,20 @@ def download_audio_to_temp(
 
     # Ensure the necessary directory exists
     os.makedirs(os.path.dirname(target_asset_path), exist_ok=True)
-    shutil.move(original_asset_path, target_asset_path)
+    # Copied instead of moved, so the cached asset stays in place for the other entries sharing its hash
+    # and for the index of the downloaded assets of each process
+    shutil.copyfile(original_asset_path, target_asset_path)
 
     return AudioDownloadResult(manifest_entry=audio_entry, awb_path=target_asset_path)
 
 
 def export_audio(env: Environment, manifest: "Manifest", ___: AssetAudioTask) -> None:
-    """Export audio assets."""
-    log_group_start("Audio exporting")
+    """
+    Export audio assets.
+
+    This doesn't start a log group, so it can run along with the other exporting tasks.
+    """
+    start = time.time()
 
     audio_entries: list["ManifestRawEntry"] = [
         audio_entry
@@ -114,8 +122,8 @@ def export_audio(env: Environment, manifest: "Manifest", ___: AssetAudioTask) ->
 
     # Download all audio first to ensure `acb` and `awb` files exist at the same time for later processing
     for result in concurrent_run(
-            download_audio_to_temp, [[env, audio_entry] for audio_entry in audio_entries], env.config.paths.log,
-            key_of_call=lambda _, entry: entry.name
+            download_audio_to_temp, [[audio_entry] for audio_entry in audio_entries], env.config.paths.log,
+            key_of_call=lambda entry: entry.name
     ).values():
         # Skips pending-process for non-awb files
         if not result.awb_path.endswith(".awb"):
@@ -132,4 +140,4 @@ def export_audio(env: Environment, manifest: "Manifest", ___: AssetAudioTask) ->
 
         export_awb_subsongs(env, result)
 
-    log_group_end()
+    log("INFO", f"Audio exporting completed in {time.time() - start:.3f} secs")
@@ -5,11 +5,12 @@ from dlasset.config import AssetSubTask, ExportType
 from dlasset.enums import WarningType
 from dlasset.log import log
 from dlasset.manage import get_asset
+from dlasset.model import UnityAsset
 from .lookup import EXPORT_FUNCTIONS, TYPES_TO_INCLUDE
 from .model import ExportInfo
 from .result import ExportResult
 
-__all__ = ("export_asset",)
+__all__ = ("export_asset", "export_unity_asset")
 
 
 def log_asset_export_debug_info(asset_paths: tuple[str, ...], export_type: ExportType, export_dir: str) -> None:
@@ -33,9 +34,25 @@ def export_asset(
 
     Returns ``None`` if nothing exportable or exported.
     """
-    asset = get_asset(asset_paths)
+    return export_unity_asset(
+        get_asset(asset_paths), export_type, export_dir,
+        sub_task=sub_task, suppress_warnings=suppress_warnings
+    )
+
+
+def export_unity_asset(
+        asset: UnityAsset,
+        export_type: ExportType,
+        export_dir: str, *,
+        sub_task: Optional[AssetSubTask] = None,
+        suppress_warnings: Sequence[WarningType] = ()
+) -> ExportResult:
+    """
+    Export the loaded ``asset`` with the given criteria to ``export_dir`` and get the exported data.
 
-    log_asset_export_debug_info(asset_paths, export_type, export_dir)
+    A loaded asset can be exported multiple times with different criteria without loading it again.
+    """
+    log_asset_export_debug_info(asset.asset_paths, export_type, export_dir)
 
     log("DEBUG", f"Getting objects to export from {asset.asset_count} assets ({asset.name})...")
 
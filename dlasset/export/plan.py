@@ -0,0 +1,147 @@
+"""Implementations for planning the asset exporting tasks."""
+from dataclasses import dataclass, field
+from typing import Generator, Optional, Sequence, TYPE_CHECKING
+
+from dlasset.config import AssetSubTask, AssetTask
+from dlasset.enums import Locale
+from dlasset.env import Environment
+from dlasset.log import log
+from .schedule import ScheduleKey, get_schedule_key
+
+if TYPE_CHECKING:
+    from dlasset.manifest import Manifest, ManifestDiff, ManifestEntry, ManifestEntryBase
+
+__all__ = ("ExportJob", "ExportPlanItem", "TaskMatch", "match_task", "plan_export")
+
+ExportJob = tuple[AssetTask, AssetSubTask]
+
+
+@dataclass
+class ExportPlanItem:
+    """Exporting jobs to perform on the same entries, so the asset is loaded once for all of them."""
+
+    locale: Locale
+    entries: Sequence["ManifestEntryBase"]
+
+    jobs: list[ExportJob] = field(default_factory=list)
+
+    @property
+    def key(self) -> ScheduleKey:
+        """Get the schedule key of this item."""
+        return get_schedule_key(self.locale, self.entries)
+
+    @property
+    def tasks(self) -> set[AssetTask]:
+        """Get the tasks having any job in this item."""
+        return {task for task, _ in self.jobs}
+
+
+@dataclass
+class TaskMatch:
+    """Entries matching the asset regex of a task in a locale, shared by the subtasks of the task."""
+
+    locale: Locale
+    entries: tuple["ManifestEntry", ...]
+    is_updated: bool
+
+    item: Optional[ExportPlanItem] = None
+
+
+def _get_candidates(
+        env: Environment, manifest: "Manifest", task: AssetTask, diff: Optional["ManifestDiff"]
+) -> Generator[tuple[Locale, tuple["ManifestEntry", ...]], None, None]:
+    """Get the entries of ``task`` which could be updated."""
+    # Other locales are only needed if any subtask is multi-locale
+    is_master_only = not any(sub_task.is_multi_locale for sub_task in task.tasks)
+
+    if not diff or env.args.no_index:
+        return manifest.get_entry_with_regex(task.asset_regex, is_master_only=is_master_only)
+
+    # Only the changed or quarantined entries could be updated
+    return manifest.get_entry_with_regex_in_names(
+        task.asset_regex,
+        lambda locale: diff.get_updated_names(locale) | env.quarantine.get_entry_names(task, locale),
+        is_master_only=is_master_only
+    )
+
+
+def _is_updated(
+        env: Environment, task: AssetTask, locale: Locale, entries: Sequence["ManifestEntryBase"],
+        diff: Optional["ManifestDiff"]
+) -> bool:
+    if env.quarantine.is_quarantined(task, locale, entries[0]):
+        return True
+
+    if diff and not env.args.no_index:
+        # Changes of the dependencies are included in the change of the main entry
+        return diff.is_entry_updated(locale, entries[0])
+
+    return any(env.index.is_file_updated(locale, entry) for entry in entries)
+
+
+def match_task(
+        env: Environment, manifest: "Manifest", task: AssetTask, diff: Optional["ManifestDiff"] = None
+) -> list[TaskMatch]:
+    """
+    Get the entries matching ``task`` with their dependencies, and whether they are updated.
+
+    This is computed once for all subtasks of ``task``, as they share the same asset regex.
+    """
+    return [
+        TaskMatch(locale=locale, entries=entries, is_updated=_is_updated(env, task, locale, entries, diff))
+        for locale, entries in _get_candidates(env, manifest, task, diff)
+    ]
+
+
+def plan_export(
+        env: Environment, manifest: "Manifest", tasks: Sequence[AssetTask], diff: Optional["ManifestDiff"] = None
+) -> list[ExportPlanItem]:
+    """
+    Plan the exporting of ``tasks`` by merging the subtasks matching the same entries into a single item.
+
+    A subtask is included only if the entries are updated, or quarantined by its task.
+
+    If ``diff`` is given, the entries are updated if changed in ``diff`` instead of the file index,
+    and only the changed entries are looked up.
+    """
+    items: dict[ScheduleKey, ExportPlanItem] = {}
+
+    for task in tasks:
+        matches = match_task(env, manifest, task, diff)
+
+        for sub_task in task.tasks:
+            matched_count = 0
+            planned_count = 0
+
+            for match in matches:
+                if not sub_task.is_multi_locale and not match.locale.is_master:
+                    continue
+
+                matched_count += 1
+
+                if not match.is_updated:
+                    continue
+
+                planned_count += 1
+                if not (item := match.item):
+                    key = get_schedule_key(match.locale, match.entries)
+                    if not (item := items.get(key)):
+                        item = items[key] = ExportPlanItem(locale=match.locale, entries=match.entries)
+                    # Subtasks of the same task share the same item
+                    match.item = item
+
+                item.jobs.append((task, sub_task))
+
+            log(
+                "INFO",
+                f"{task.title} // {sub_task.title}: {matched_count} "
+                f"{'changed ' if diff and not env.args.no_index else ''}assets matching the criteria. "
+                f"{planned_count} assets updated{' (force update)' if env.args.no_index else ''}."
+            )
+
+    log(
+        "INFO",
+        f"{sum(len(item.jobs) for item in items.values())} exporting jobs merged into {len(items)} assets to load."
+    )
+
+    return list(items.values())
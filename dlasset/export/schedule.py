@@ -0,0 +1,134 @@
+"""Implementations for scheduling the asset exporting tasks by their estimated cost."""
+from dataclasses import InitVar, dataclass, field
+from typing import Optional, Sequence, TYPE_CHECKING
+
+from dlasset.enums import Locale
+from dlasset.env import TaskTimings
+from dlasset.log import log
+from dlasset.utils import export_json
+
+if TYPE_CHECKING:
+    from dlasset.manifest import ManifestEntryBase
+    from .plan import ExportPlanItem
+
+__all__ = ("ExportSchedule", "ScheduleKey", "get_affinity_key", "get_schedule_key")
+
+# Assumed exporting speed if no timing data is available
+DEFAULT_SECONDS_PER_BYTE = 1 / (10 * 1024 * 1024)
+
+ScheduleKey = tuple[Locale, str]  # Locale and the main entry name
+
+
+def get_schedule_key(locale: Locale, entries: Sequence["ManifestEntryBase"]) -> ScheduleKey:
+    """Get the key of the exporting task on ``entries`` of ``locale``."""
+    return locale, entries[0].name
+
+
+def get_affinity_key(entries: Sequence["ManifestEntryBase"]) -> Optional[frozenset[str]]:
+    """
+    Get the key to route the exporting task on ``entries`` to the worker which has loaded the same dependencies.
+
+    Returns ``None`` if the main entry doesn't have any dependencies.
+    """
+    dependency_hashes = frozenset(entry.hash for entry in entries[1:])
+
+    return dependency_hashes or None
+
+
+def get_task_cost(entries: Sequence["ManifestEntryBase"]) -> int:
+    """Get the estimated cost of exporting ``entries``, which is the total size in bytes including dependencies."""
+    return sum(entry.size for entry in entries)
+
+
+@dataclass
+class _ScheduledTask:
+    """A scheduled exporting task."""
+
+    item: "ExportPlanItem"
+    cost: int
+    predicted: float
+
+    actual: float = field(init=False, default=-1)
+
+
+@dataclass
+class ExportSchedule:
+    """
+    Schedule of the exporting tasks.
+
+    Tasks are ordered by their estimated duration, longest first,
+    so the long tasks don't end up at the tail of the run while other workers are idle.
+
+    The duration of a task is its duration in the previous run if recorded,
+    otherwise estimated from the size of its entries including dependencies.
+    """
+
+    timings: TaskTimings
+    items: InitVar[Sequence["ExportPlanItem"]]
+
+    _tasks: dict[ScheduleKey, _ScheduledTask] = field(init=False)
+
+    def __post_init__(self, items: Sequence["ExportPlanItem"]) -> None:
+        seconds_per_byte = self.timings.seconds_per_byte or DEFAULT_SECONDS_PER_BYTE
+
+        self._tasks = {}
+        for item in items:
+            key = item.key
+            cost = get_task_cost(item.entries)
+
+            predicted = self.timings.get_duration(self._get_timing_key(key))
+            if predicted is None:
+                predicted = cost * seconds_per_byte
+
+            self._tasks[key] = _ScheduledTask(item=item, cost=cost, predicted=predicted)
+
+    @staticmethod
+    def _get_timing_key(key: ScheduleKey) -> str:
+        locale, name = key
+        return f"{locale.value}|{name}"
+
+    def get_item(self, key: ScheduleKey) -> "ExportPlanItem":
+        """Get the planned item of the task of ``key``."""
+        return self._tasks[key].item
+
+    @property
+    def ordered(self) -> list["ExportPlanItem"]:
+        """Get the planned item of each task, ordered by the predicted duration descending."""
+        return [task.item for task in sorted(self._tasks.values(), key=lambda task: task.predicted, reverse=True)]
+
+    def on_timing(self, key: ScheduleKey, duration: float) -> None:
+        """Record the actual ``duration`` of the task of ``key``."""
+        task = self._tasks[key]
+        task.actual = duration
+
+        self.timings.record(self._get_timing_key(key), task.cost, duration)
+
+    def report(self, report_path: str) -> None:
+        """Log the summary of the predicted and actual durations and export the details to ``report_path``."""
+        completed = [task for task in self._tasks.values() if task.actual >= 0]
+        if not completed:
+            return
+
+        total_predicted = sum(task.predicted for task in completed)
+        total_actual = sum(task.actual for task in completed)
+        mean_abs_error = sum(abs(task.predicted - task.actual) for task in completed) / len(completed)
+
+        log(
+            "INFO",
+            f"Worker time of {len(completed)} tasks: {total_actual:.3f} secs "
+            f"(predicted {total_predicted:.3f} secs, mean absolute error {mean_abs_error:.3f} secs)"
+        )
+
+        export_json(report_path, {
+            "tasks": [
+                {
+                    "locale": task.item.locale.value,
+                    "name": task.item.entries[0].name,
+                    "jobs": [f"{job_task.title} // {job_sub_task.title}" for job_task, job_sub_task in task.item.jobs],
+                    "cost": task.cost,
+                    "predicted": task.predicted,
+                    "actual": task.actual,
+                }
+                for task in sorted(completed, key=lambda task: task.actual, reverse=True)
+            ]
+        })
@@ -1,80 +1,188 @@
-"""Implementations for performing an asset exporting task."""
-from collections import defaultdict
-from typing import Any, DefaultDict, Sequence, TYPE_CHECKING
+"""Implementations for performing the asset exporting tasks."""
+import sys
+from dataclasses import InitVar, dataclass, field
+from typing import Any, Optional, Sequence, TYPE_CHECKING
 
-from dlasset.config import AssetSubTask, AssetTask
+from dlasset.config import AssetTask
 from dlasset.enums import Locale
-from dlasset.env import Environment
+from dlasset.env import Environment, get_run_context
 from dlasset.log import log, log_group_end, log_group_start
-from dlasset.manage import get_asset_paths
-from dlasset.utils import concurrent_run
-from .main import export_asset
+from dlasset.manage import get_asset, get_asset_paths, prefetch_assets
+from dlasset.utils import concurrent_run_iter
+from .main import export_unity_asset
+from .plan import ExportJob, ExportPlanItem, plan_export
+from .schedule import ExportSchedule, ScheduleKey, get_affinity_key, get_schedule_key
 
 if TYPE_CHECKING:
-    from dlasset.manifest import Manifest, ManifestEntryBase
+    from dlasset.manifest import Manifest, ManifestDiff, ManifestEntryBase
     from dlasset.export import ExportResult
 
-__all__ = ("export_by_task",)
-
-SingleTaskExportResult = DefaultDict[Locale, DefaultDict[AssetSubTask, list["ExportResult"]]]
+__all__ = ("export_by_tasks", "prefetch_by_tasks")
 
 
 def export_from_manifest(
-        env: Environment, locale: Locale, entries: Sequence["ManifestEntryBase"],
-        task: AssetTask, sub_task: AssetSubTask,
+        locale: Locale, entries: Sequence["ManifestEntryBase"], jobs: Sequence[ExportJob],
         *_: list[Any]
         # For allowing but ignoring additional args,
         # which might be needed for carrying more information in lazy call
-) -> "ExportResult":
-    """Export the asset of ``entry`` according to ``task``."""
-    asset_paths = get_asset_paths(env, entries)
+) -> list["ExportResult"]:
+    """Load the asset of ``entries`` once and export it according to each of ``jobs``."""
+    env = get_run_context()
+
+    asset = get_asset(get_asset_paths(env, entries))
+    export_dir = env.config.paths.export_asset_dir_of_locale(locale)
+
+    return [
+        export_unity_asset(
+            asset, sub_task.type, export_dir,
+            sub_task=sub_task, suppress_warnings=task.suppress_warnings
+        )
+        for task, sub_task in jobs
+    ]
+
+
+def quarantine_failed_entries(
+        env: Environment, schedule: ExportSchedule, failed: set[ScheduleKey], key: ScheduleKey, error: BaseException
+) -> None:
+    """Quarantine the entries of the failed task of ``key`` for each of its jobs."""
+    failed.add(key)
+
+    item = schedule.get_item(key)
+    for task, sub_task in item.jobs:
+        env.quarantine.add(task, sub_task, item.locale, item.entries, error)
+
+
+@dataclass
+class _TaskProgress:
+    """Planned items of each task not yet completed."""
+
+    plan: InitVar[Sequence[ExportPlanItem]]
+
+    _pending: dict[AssetTask, set[ScheduleKey]] = field(init=False)
+
+    def __post_init__(self, plan: Sequence[ExportPlanItem]) -> None:
+        self._pending = {}
+        for item in plan:
+            for task in item.tasks:
+                self._pending.setdefault(task, set()).add(item.key)
+
+    def complete(self, item: ExportPlanItem) -> list[AssetTask]:
+        """Mark ``item`` as completed and get the tasks which all of its items are completed."""
+        completed = []
+
+        for task in item.tasks:
+            pending = self._pending[task]
+            pending.discard(item.key)
+
+            if not pending:
+                completed.append(task)
+
+        return completed
+
+
+def commit_plan_item(env: Environment, item: ExportPlanItem, failed: set[ScheduleKey]) -> None:
+    """Update the index and release the quarantine of ``item`` if it is exported successfully."""
+    # Failed entries are not updated, so they will be exported again in the next run
+    if item.key in failed:
+        return
+
+    for task in item.tasks:
+        env.quarantine.release(task, item.locale, item.entries[0])
+
+    for entry in item.entries:
+        env.index.update_entry(item.locale, entry)
 
-    return export_asset(
-        asset_paths, sub_task.type, env.config.paths.export_asset_dir_of_locale(locale),
-        sub_task=sub_task, suppress_warnings=task.suppress_warnings
+
+def export_by_tasks(
+        env: Environment, manifest: "Manifest", tasks: Sequence[AssetTask], diff: Optional["ManifestDiff"] = None
+) -> None:
+    """
+    Export the assets according to ``tasks``.
+
+    If ``diff`` is given, only the entries changed in it are exported, instead of the ones updated in the file index.
+
+    Subtasks matching the same entries are performed together,
+    so each asset is loaded once no matter how many subtasks it matches.
+
+    The items of all tasks are run in a single stream, so the workers are kept busy across the tasks.
+    The index is stored once all items of a task are completed.
+
+    Items still failing after all retries are quarantined, so they are exported again in the next run
+    even if the index of the entries they share with the successful items is updated.
+    Exits the program after all items are completed if any item failed, unless the tasks are error tolerant.
+    """
+    # pylint: disable=too-many-locals
+    failed: set[ScheduleKey] = set()
+
+    log_group_start("Asset exporting")
+
+    log("INFO", "Planning the exporting tasks...")
+    plan = plan_export(env, manifest, tasks, diff)
+    schedule = ExportSchedule(env.timings, plan)
+    progress = _TaskProgress(plan)
+
+    def complete_item(item: ExportPlanItem) -> None:
+        # MUST update outside the concurrent run
+        # Otherwise, the index will not update because it's in a separated memory space
+        commit_plan_item(env, item, failed)
+
+        for task in progress.complete(item):
+            log("INFO", f"All assets of {task.title} are processed.")
+            env.export_index()
+
+    def on_error(key: ScheduleKey, error: BaseException) -> None:
+        quarantine_failed_entries(env, schedule, failed, key, error)
+        complete_item(schedule.get_item(key))
+
+    # Assets are downloaded in threads ahead of the workers,
+    # so a task is submitted to the workers once its assets are downloaded
+    args_list = (
+        [item.locale, item.entries, item.jobs]
+        for item in prefetch_assets(env, schedule.ordered, lambda item: item.entries)
     )
 
+    for key, export_results in concurrent_run_iter(
+            export_from_manifest, args_list, env.config.paths.log,
+            # This carryies the planned item via concurrent result key
+            key_of_call=lambda *args: get_schedule_key(args[0], args[1]),
+            max_workers=env.config.concurrency.processes,
+            max_in_flight=env.config.concurrency.batch_size,
+            on_timing=schedule.on_timing,
+            # Tasks sharing the same dependencies go to the same worker to reuse the loaded dependencies
+            affinity_of_call=lambda *args: get_affinity_key(args[1]),
+            retry=env.config.concurrency.retry,
+            on_error=on_error,
+    ):
+        item = schedule.get_item(key)
 
-def export_by_task(env: Environment, manifest: "Manifest", task: AssetTask) -> None:
-    """Export the assets according to ``task``."""
-    processed_entries = []
-    export_results: SingleTaskExportResult = defaultdict(lambda: defaultdict(list))
+        # Results are in the same order as the jobs
+        for (task, sub_task), export_result in zip(item.jobs, export_results):
+            env.index.add_export_result(item.locale, task, sub_task, export_result)
 
-    for sub_task in task.tasks:
-        log_group_start(f"{task.title} // {sub_task.title}")
+        complete_item(item)
 
-        log("INFO", "Getting asset entry from the manifest...")
-        asset_entries = list(
-            manifest.get_entry_with_regex(task.asset_regex, is_master_only=not sub_task.is_multi_locale)
-        )
-        args_list = [
-            [env, locale, entries, task, sub_task, idx] for idx, (locale, entries) in enumerate(asset_entries)
-            if any(env.index.is_file_updated(locale, entry) for entry in entries)
-        ]
-
-        log(
-            "INFO",
-            f"{len(asset_entries)} assets matching the criteria. "
-            f"{len(args_list)} assets updated{' (force update)' if env.args.no_index else ''}."
-        )
+    schedule.report(env.schedule_report_path)
+
+    if failed:
+        log("ERROR", f"{len(failed)} assets failed to export and are quarantined.")
+
+        if not env.config.concurrency.error_tolerant:
+            env.export_index()
+            sys.exit(1)
+
+    log_group_end()
+
+
+def prefetch_by_tasks(
+        env: Environment, manifest: "Manifest", tasks: Sequence[AssetTask], diff: Optional["ManifestDiff"] = None
+) -> None:
+    """Download the assets to export according to ``tasks`` without exporting them."""
+    log_group_start("Asset prefetching")
+
+    log("INFO", "Planning the exporting tasks...")
+    plan = plan_export(env, manifest, tasks, diff)
+
+    for _ in prefetch_assets(env, plan, lambda item: item.entries):
+        pass
 
-        for (locale, _), export_result in concurrent_run(
-                export_from_manifest, args_list, env.config.paths.log,
-                # This carryies `locale` via concurrent result key
-                key_of_call=lambda *args: (args[1], args[5]),
-                max_workers=env.config.concurrency.processes,
-                task_batch_size=env.config.concurrency.batch_size,
-        ).items():
-            export_results[locale][sub_task].append(export_result)
-
-        processed_entries.extend(asset_entries)
-
-        log_group_end()
-
-    # MUST update outside the concurrent run
-    # Otherwise, the index will not update because it's in a separated memory space
-    # ---------------------------------------------------------------------------------------
-    # Update only if a task is completed, because subtasks are performed on the same asset(s)
-    for locale, entries in processed_entries:
-        for entry in entries:
-            env.index.update_entry(locale, task, entry, export_results[locale])
+    log_group_end()
@@ -1,7 +1,7 @@
 """Main functions for logging."""
 import os
 import time
-from typing import Any, Optional, cast
+from typing import Any, Optional, Union, cast
 
 from .const import COLOR_RESET, LOGGER_CONSOLE, LOGGER_ERROR, LOGGER_FILE, LOG_LEVEL_COLOR, LOG_LEVEL_NUM, LogLevel
 
@@ -14,8 +14,12 @@ _GROUP_CURRENT_NAME: Optional[str] = None
 _PERIOD_LAST_LOG: float = time.time()
 
 
-def log(level: LogLevel, message: Any, *, exc_info: bool = False) -> None:
-    """Log ``message`` at ``level``."""
+def log(level: LogLevel, message: Any, *, exc_info: Union[bool, BaseException] = False) -> None:
+    """
+    Log ``message`` at ``level``.
+
+    ``exc_info`` could be an exception to log its traceback outside of the ``except`` block.
+    """
     log_level = LOG_LEVEL_NUM[level]
 
     LOGGER_CONSOLE.log(log_level, "%s%s%s", LOG_LEVEL_COLOR[level], message, COLOR_RESET, exc_info=exc_info)
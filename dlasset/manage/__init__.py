@@ -1,2 +1,5 @@
 """Implementations for managing the assets."""
-from .main import get_asset, get_asset_paths
+from .cache import CacheEvictionReport, evict_assets, record_live_hashes
+from .cache_index import CachedAssetIndex, get_cached_asset_index, load_cached_asset_index
+from .main import ensure_asset, get_asset, get_asset_paths, get_download_stats
+from .prefetch import prefetch_assets
@@ -0,0 +1,214 @@
+"""Implementations for evicting the downloaded assets no longer referenced by the manifests."""
+import os
+from dataclasses import dataclass, field
+from typing import Optional, TYPE_CHECKING
+
+from dlasset.env import RunContext
+from dlasset.log import log, log_group_end, log_group_start
+from dlasset.utils import format_bytes
+
+if TYPE_CHECKING:
+    from dlasset.manifest import Manifest
+
+__all__ = ("CachedAsset", "CacheEvictionReport", "evict_assets", "record_live_hashes")
+
+LIVE_HASHES_FILE_NAME = "live-hashes.txt"
+
+PART_FILE_SUFFIX = ".part"
+
+LOCK_FILE_SUFFIX = ".lock"
+
+
+def record_live_hashes(env: RunContext, manifest: "Manifest") -> None:
+    """
+    Record the hashes of the assets referenced by ``manifest`` next to the manifest assets of the current version.
+
+    The cache eviction keeps the assets referenced by the recently recorded versions.
+    """
+    with open(os.path.join(env.manifest_asset_dir, LIVE_HASHES_FILE_NAME), "w", encoding="utf-8") as f:
+        f.write("\n".join(sorted(manifest.hashes)))
+
+
+def get_recent_versions(downloaded_dir: str, count: int) -> list[tuple[str, str]]:
+    """
+    Get the version codes and the live hashes file paths of the ``count`` most recently recorded versions.
+
+    The most recent version comes first.
+    """
+    manifest_dir = os.path.join(downloaded_dir, "manifest")
+    if not os.path.isdir(manifest_dir):
+        return []
+
+    versions = []
+    for version_code in os.listdir(manifest_dir):
+        live_hashes_path = os.path.join(manifest_dir, version_code, LIVE_HASHES_FILE_NAME)
+        if os.path.isfile(live_hashes_path):
+            versions.append((version_code, live_hashes_path))
+
+    versions.sort(key=lambda version: os.path.getmtime(version[1]), reverse=True)
+
+    return versions[:count]
+
+
+def load_live_hashes(live_hashes_path: str) -> set[str]:
+    """Load the hashes recorded in ``live_hashes_path``."""
+    with open(live_hashes_path, encoding="utf-8") as f:
+        return {line for line in f.read().splitlines() if line}
+
+
+@dataclass
+class CachedAsset:
+    """A file in the downloaded asset directory."""
+
+    path: str
+    hash: str
+    size: int
+    # Modification time is updated each time the asset is used
+    last_used: float
+
+
+def scan_cached_assets(downloaded_dir: str) -> list[CachedAsset]:
+    """
+    Get the files in the downloaded asset directory, including the partially downloaded ones.
+
+    Lock files are excluded because they are held by the running downloads.
+    """
+    assets_dir = os.path.join(downloaded_dir, "assets")
+    if not os.path.isdir(assets_dir):
+        return []
+
+    cached_assets = []
+    with os.scandir(assets_dir) as hash_dirs:
+        for hash_dir in hash_dirs:
+            if not hash_dir.is_dir():
+                continue
+
+            with os.scandir(hash_dir.path) as files:
+                for file in files:
+                    if not file.is_file() or file.name.endswith(LOCK_FILE_SUFFIX):
+                        continue
+
+                    stat = file.stat()
+                    cached_assets.append(CachedAsset(
+                        path=file.path,
+                        hash=file.name.removesuffix(PART_FILE_SUFFIX),
+                        size=stat.st_size,
+                        last_used=stat.st_mtime,
+                    ))
+
+    return cached_assets
+
+
+@dataclass
+class CacheEvictionReport:
+    """Result of a cache eviction."""
+
+    versions_kept: list[str]
+    max_size: Optional[int]
+    dry_run: bool
+
+    cached: list[CachedAsset] = field(default_factory=list)
+    live: list[CachedAsset] = field(default_factory=list)
+    evicted: list[CachedAsset] = field(default_factory=list)
+
+    @property
+    def cached_size(self) -> int:
+        """Total size of the cached assets before the eviction in bytes."""
+        return sum(asset.size for asset in self.cached)
+
+    @property
+    def live_size(self) -> int:
+        """Total size of the cached assets referenced by the kept versions in bytes."""
+        return sum(asset.size for asset in self.live)
+
+    @property
+    def evicted_size(self) -> int:
+        """Total size of the evicted assets in bytes."""
+        return sum(asset.size for asset in self.evicted)
+
+    def print(self) -> None:
+        """Print the report."""
+        log("INFO", f"Versions kept: {', '.join(self.versions_kept)}")
+        log("INFO", f"Cached: {len(self.cached)} files ({format_bytes(self.cached_size)})")
+        log("INFO", f"Live: {len(self.live)} files ({format_bytes(self.live_size)})")
+
+        if self.dry_run:
+            log("INFO", f"Reclaimable: {len(self.evicted)} files ({format_bytes(self.evicted_size)}) - dry run, "
+                        f"nothing evicted")
+        else:
+            log("INFO", f"Evicted: {len(self.evicted)} files ({format_bytes(self.evicted_size)})")
+
+        remaining_size = self.cached_size - self.evicted_size
+        if self.max_size is not None and remaining_size > self.max_size:
+            log("WARNING", f"Cache size after eviction ({format_bytes(remaining_size)}) still exceeds "
+                           f"the cap ({format_bytes(self.max_size)}) because the live assets are never evicted")
+
+
+def _select_evicted(report: CacheEvictionReport, dead: list[CachedAsset]) -> list[CachedAsset]:
+    """Select the assets to evict from the ``dead`` assets not referenced by the kept versions."""
+    if report.max_size is None:
+        return dead
+
+    # Evict the least recently used assets first, until the cache fits in the cap
+    evicted = []
+    size = report.cached_size
+    for asset in sorted(dead, key=lambda cached_asset: cached_asset.last_used):
+        if size <= report.max_size:
+            break
+
+        evicted.append(asset)
+        size -= asset.size
+
+    return evicted
+
+
+def evict_assets(
+        downloaded_dir: str, *, keep_versions: int = 1, max_size: Optional[int] = None, dry_run: bool = False
+) -> CacheEvictionReport:
+    """
+    Evict the assets in ``downloaded_dir`` not referenced by the ``keep_versions`` most recently used manifests.
+
+    If ``max_size`` in bytes is given, only the least recently used unreferenced assets are evicted
+    until the total size of the cache fits in ``max_size``. Otherwise, all unreferenced assets are evicted.
+
+    If ``dry_run`` is ``True``, nothing is evicted and the report shows what would be evicted.
+
+    This must not run along with a run of a version not yet recorded,
+    because the assets of that version are not referenced by any recorded version.
+
+    Raises :class:`ValueError` if no version has recorded its live hashes,
+    so the cache is never wiped because of a missing record.
+    """
+    versions = get_recent_versions(downloaded_dir, keep_versions)
+    if not versions:
+        raise ValueError(f"No manifest in {downloaded_dir} has recorded its live hashes, run a download first")
+
+    log_group_start("Cache eviction")
+
+    live_hashes: set[str] = set()
+    for _, live_hashes_path in versions:
+        live_hashes.update(load_live_hashes(live_hashes_path))
+
+    report = CacheEvictionReport(
+        versions_kept=[version_code for version_code, _ in versions], max_size=max_size, dry_run=dry_run
+    )
+
+    dead: list[CachedAsset] = []
+    for asset in scan_cached_assets(downloaded_dir):
+        report.cached.append(asset)
+        (report.live if asset.hash in live_hashes else dead).append(asset)
+
+    report.evicted = _select_evicted(report, dead)
+
+    if not dry_run:
+        for asset in report.evicted:
+            os.remove(asset.path)
+
+        for hash_dir in {os.path.dirname(asset.path) for asset in report.evicted}:
+            if not os.listdir(hash_dir):
+                os.rmdir(hash_dir)
+
+    report.print()
+    log_group_end()
+
+    return report
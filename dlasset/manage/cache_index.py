@@ -0,0 +1,135 @@
+"""Index of the assets present in the downloaded asset directory."""
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional, TYPE_CHECKING
+
+from dlasset.env import RunContext
+from dlasset.log import log
+from dlasset.utils import format_bytes
+from .cache import PART_FILE_SUFFIX, scan_cached_assets
+
+if TYPE_CHECKING:
+    from dlasset.manifest import ManifestEntryBase
+
+__all__ = ("CachedAssetIndex", "get_cached_asset_index", "load_cached_asset_index")
+
+# Seconds before the last use of a cached asset is updated again on disk
+TOUCH_INTERVAL = 3600
+
+
+@dataclass
+class CachedAssetIndex:
+    """
+    Sizes and last uses of the assets in ``downloaded_dir``, scanned once.
+
+    Presence checks use this instead of checking the file system for each entry.
+    The index is updated as the assets are downloaded by the current process.
+    The assets downloaded by the other processes are found by the file system checks on download.
+
+    Cached assets must not be moved or removed while the index is in use,
+    because an asset used within ``TOUCH_INTERVAL`` is not checked on the file system again.
+    """
+
+    downloaded_dir: str
+
+    # key = asset hash; value = size and last use of the asset
+    _assets: dict[str, tuple[int, float]] = field(init=False)
+
+    def __post_init__(self) -> None:
+        self._assets = {
+            asset.hash: (asset.size, asset.last_used)
+            for asset in scan_cached_assets(self.downloaded_dir)
+            if not asset.path.endswith(PART_FILE_SUFFIX)
+        }
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Sent to the worker processes while the download threads could be updating it
+        return {"downloaded_dir": self.downloaded_dir, "_assets": self._assets.copy()}
+
+    def __len__(self) -> int:
+        return len(self._assets)
+
+    @property
+    def total_size(self) -> int:
+        """Total size of the indexed assets in bytes."""
+        return sum(size for size, _ in self._assets.values())
+
+    def is_downloaded(self, entry: "ManifestEntryBase") -> bool:
+        """Check if the asset of ``entry`` is completely downloaded."""
+        if not (asset := self._assets.get(entry.hash)):
+            return False
+
+        # Size is checked for the same reason as ``is_asset_downloaded()``
+        return asset[0] == entry.size
+
+    def mark_downloaded(self, entry: "ManifestEntryBase") -> None:
+        """Mark the asset of ``entry`` as downloaded just now."""
+        self._assets[entry.hash] = (entry.size, time.time())
+
+    def mark_used(self, env: RunContext, entry: "ManifestEntryBase") -> bool:
+        """
+        Mark the downloaded asset of ``entry`` as used just now for the size-capped cache eviction.
+
+        The last use on disk is updated at most once per ``TOUCH_INTERVAL``, so most uses don't touch the disk.
+
+        Returns ``False`` and removes the asset from the index if it is removed from the disk after the scan.
+        """
+        size, last_used = self._assets[entry.hash]
+
+        now = time.time()
+        if now - last_used < TOUCH_INTERVAL:
+            return True
+
+        try:
+            os.utime(entry.get_asset_path(env), (now, now))
+        except FileNotFoundError:
+            self._assets.pop(entry.hash, None)
+            return False
+
+        self._assets[entry.hash] = (size, now)
+        return True
+
+
+_INDEX: Optional[CachedAssetIndex] = None
+
+
+def load_cached_asset_index(env: RunContext) -> CachedAssetIndex:
+    """
+    Scan the downloaded asset directory and use the result as the index of the current process.
+
+    The index is also attached to ``env``, so the worker processes started with it get the index
+    instead of scanning again.
+    """
+    global _INDEX  # pylint: disable=global-statement
+
+    start = time.monotonic()
+    _INDEX = env.asset_index = CachedAssetIndex(env.config.paths.downloaded)
+
+    log(
+        "INFO",
+        f"Indexed {len(_INDEX)} downloaded assets ({format_bytes(_INDEX.total_size)}) "
+        f"in {time.monotonic() - start:.3f} secs"
+    )
+
+    return _INDEX
+
+
+def get_cached_asset_index(env: RunContext) -> CachedAssetIndex:
+    """
+    Get the index of the downloaded assets of the current process.
+
+    The index attached to ``env`` by the main process is used if any. Otherwise, the index is loaded on the first call.
+    """
+    global _INDEX  # pylint: disable=global-statement
+
+    downloaded_dir = env.config.paths.downloaded
+
+    if _INDEX and _INDEX.downloaded_dir == downloaded_dir:
+        return _INDEX
+
+    if env.asset_index and env.asset_index.downloaded_dir == downloaded_dir:
+        _INDEX = env.asset_index
+        return _INDEX
+
+    return load_cached_asset_index(env)
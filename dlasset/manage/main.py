@@ -1,47 +1,134 @@
 """Main implementations for managing the assets."""
 import os.path
-from functools import lru_cache
+import threading
+from collections import Counter
 from typing import Sequence, TYPE_CHECKING
 
-from dlasset.env import Environment
+from dlasset.env import RunContext
 from dlasset.model import UnityAsset
-from dlasset.utils import http_get
+from dlasset.utils import WorkerStats, file_lock, http_download, register_worker_stats
+from .cache_index import get_cached_asset_index
 from .utils import get_asset_url
 
 if TYPE_CHECKING:
     from dlasset.manifest import ManifestEntryBase
 
-__all__ = ("get_asset_paths", "get_asset")
+__all__ = ("get_asset_paths", "get_asset", "ensure_asset", "get_download_stats")
 
+# key = outcome of ensuring an asset; value = count
+_DOWNLOAD_STATS: Counter[str] = Counter()
 
-def download_asset(asset_hash_dir: str, asset_target_path: str, entry: "ManifestEntryBase") -> None:
+_DOWNLOAD_STATS_LOCK = threading.Lock()
+
+
+def _count_download(outcome: str) -> None:
+    with _DOWNLOAD_STATS_LOCK:
+        _DOWNLOAD_STATS[outcome] += 1
+
+
+def get_download_stats() -> WorkerStats:
+    """
+    Get the count of the assets ensured by the current process for each outcome.
+
+    - ``downloaded``: downloaded by the current process
+    - ``cached``: already downloaded
+    - ``deduplicated``: downloaded by another process or thread while waiting for it
+    """
+    with _DOWNLOAD_STATS_LOCK:
+        return {outcome: _DOWNLOAD_STATS[outcome] for outcome in ("downloaded", "cached", "deduplicated")}
+
+
+register_worker_stats("Asset downloads", get_download_stats)
+
+
+def _reset_download_stats_after_fork() -> None:
+    """
+    Reset the download statistics inherited by a forked process.
+
+    The lock could be held by a download thread of the parent, which doesn't exist in the forked process.
+    """
+    global _DOWNLOAD_STATS_LOCK  # pylint: disable=global-statement
+    _DOWNLOAD_STATS_LOCK = threading.Lock()
+    _DOWNLOAD_STATS.clear()
+
+
+os.register_at_fork(after_in_child=_reset_download_stats_after_fork)
+
+
+def download_asset(
+        env: RunContext, asset_hash_dir: str, asset_target_path: str, entry: "ManifestEntryBase"
+) -> None:
     """Download the asset of manifest ``entry`` and store it to ``asset_target_path``."""
-    response = http_get(get_asset_url(entry))
+    os.makedirs(asset_hash_dir, exist_ok=True)
 
+    http_download(get_asset_url(env, entry), asset_target_path, expected_size=entry.size)
+
+
+def is_asset_downloaded(asset_path: str, entry: "ManifestEntryBase") -> bool:
+    """Check if the asset of ``entry`` is completely downloaded to ``asset_path``."""
+    # Files downloaded before the downloads became atomic could be truncated
+    return os.path.exists(asset_path) and os.path.getsize(asset_path) == entry.size
+
+
+def ensure_asset(env: RunContext, entry: "ManifestEntryBase") -> bool:
+    """
+    Download the asset of ``entry`` if not exists or its size mismatches. Returns ``True`` if downloaded.
+
+    Assets are stored by their hash, so the entries sharing the same hash share the same file.
+    The presence of the asset is checked against the index of the downloaded assets first,
+    then against the file system for the assets downloaded by the other processes since the index is loaded.
+    Only one process or thread downloads an asset at a time. The others wait for it and use its download.
+    """
+    index = get_cached_asset_index(env)
+
+    if index.is_downloaded(entry) and index.mark_used(env, entry):
+        _count_download("cached")
+        return False
+
+    asset_target_path = entry.get_asset_path(env)
+
+    if is_asset_downloaded(asset_target_path, entry):
+        index.mark_downloaded(entry)
+        _count_download("cached")
+        return False
+
+    asset_hash_dir = entry.get_actual_asset_dir(env)
     os.makedirs(asset_hash_dir, exist_ok=True)
-    with open(asset_target_path, "wb+") as f:
-        f.write(response.content)
+
+    with file_lock(f"{asset_target_path}.lock") as acquired_without_waiting:
+        # The asset could be downloaded by another process or thread while checking or waiting for the lock
+        if is_asset_downloaded(asset_target_path, entry):
+            index.mark_downloaded(entry)
+            _count_download("cached" if acquired_without_waiting else "deduplicated")
+            return False
+
+        download_asset(env, asset_hash_dir, asset_target_path, entry)
+        index.mark_downloaded(entry)
+
+    _count_download("downloaded")
+    return True
 
 
-def get_asset_paths(env: Environment, entries: Sequence["ManifestEntryBase"]) -> tuple[str, ...]:
+def get_asset_paths(env: RunContext, entries: Sequence["ManifestEntryBase"]) -> tuple[str, ...]:
     """
     Get a list of asset paths of ``entries``.
 
-    This automatically download the asset in ``entries`` if not exists.
+    This automatically download the asset in ``entries`` if not downloaded.
     """
     asset_paths: list[str] = []
     for entry in entries:
-        asset_target_path = entry.get_asset_path(env)
+        ensure_asset(env, entry)
 
-        if not os.path.exists(asset_target_path):
-            download_asset(entry.get_actual_asset_dir(env), asset_target_path, entry)
-
-        asset_paths.append(asset_target_path)
+        asset_paths.append(entry.get_asset_path(env))
 
     return tuple(asset_paths)
 
 
-@lru_cache(maxsize=100)
-def get_asset(asset_paths: tuple[str]) -> UnityAsset:
-    """Get the unity asset model at ``asset_paths``."""
+def get_asset(asset_paths: tuple[str, ...]) -> UnityAsset:
+    """
+    Get the unity asset model at ``asset_paths``.
+
+    The model is not cached, as each asset is exported once per run.
+    The bundles shared by different assets are cached by :func:`dlasset.model.unity.asset.load_bundle` instead.
+    """
     return UnityAsset(asset_paths)
@@ -0,0 +1,236 @@
+"""Implementations for downloading the assets ahead of exporting them."""
+import heapq
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Generic, Generator, Iterable, Optional, Sequence, TYPE_CHECKING, TypeVar
+
+from dlasset.env import Environment
+from dlasset.log import log, log_periodic
+from dlasset.utils import format_bytes, get_http_stats
+from .cache_index import CachedAssetIndex, get_cached_asset_index
+from .main import ensure_asset
+
+if TYPE_CHECKING:
+    from dlasset.manifest import ManifestEntryBase
+
+__all__ = ("prefetch_assets",)
+
+T = TypeVar("T")
+
+# Count of the ready items held back for the earlier items still downloading
+READY_LOOK_AHEAD = 32
+
+
+@dataclass
+class _PrefetchDownloads(Generic[T]):
+    """Downloads of the assets of the prefetching items."""
+
+    env: Environment
+    executor: ThreadPoolExecutor
+    get_entries: Callable[[T], Sequence["ManifestEntryBase"]]
+
+    total_size: int = field(init=False, default=0)
+    # Assets to download, planned from the index of the downloaded assets
+    planned_count: int = field(init=False, default=0)
+    planned_size: int = field(init=False, default=0)
+    # Count of the entries of all items, including the entries sharing the same asset
+    reference_count: int = field(init=False, default=0)
+    completed_count: int = field(init=False, default=0)
+    completed_size: int = field(init=False, default=0)
+    # Assets actually downloaded, excluding the assets already on disk
+    downloaded_count: int = field(init=False, default=0)
+    downloaded_size: int = field(init=False, default=0)
+    failed_count: int = field(init=False, default=0)
+
+    _start: float = field(init=False, default_factory=time.monotonic)
+
+    _index: CachedAssetIndex = field(init=False)
+
+    _items: list[T] = field(init=False, default_factory=list)
+    # Count of the downloads not yet completed of each item
+    _remaining: list[int] = field(init=False, default_factory=list)
+    # key = asset path
+    _downloads: dict[str, Future[bool]] = field(init=False, default_factory=dict)
+    # key = download; value = the downloading entry and the indexes of the items waiting for it
+    _waiting: dict[Future[bool], tuple["ManifestEntryBase", list[int]]] = field(init=False, default_factory=dict)
+    # Heap of the indexes of the items ready but not yielded yet
+    _ready: list[int] = field(init=False, default_factory=list)
+    # Index of the earliest item not yielded yet
+    _next_idx: int = field(init=False, default=0)
+    _yielded: list[bool] = field(init=False, default_factory=list)
+
+    def __post_init__(self) -> None:
+        self._index = get_cached_asset_index(self.env)
+
+    def __len__(self) -> int:
+        return len(self._downloads)
+
+    @property
+    def item_count(self) -> int:
+        """Count of the prefetching items."""
+        return len(self._items)
+
+    def add(self, item: T) -> None:
+        """Start downloading the assets of ``item`` which are not downloading yet."""
+        idx = len(self._items)
+        self._items.append(item)
+
+        item_downloads = set()
+        for entry in self.get_entries(item):
+            self.reference_count += 1
+
+            asset_path = entry.get_asset_path(self.env)
+            if asset_path not in self._downloads:
+                download = self.executor.submit(ensure_asset, self.env, entry)
+                self._downloads[asset_path] = download
+                self._waiting[download] = (entry, [])
+                self.total_size += entry.size
+
+                if not self._index.is_downloaded(entry):
+                    self.planned_count += 1
+                    self.planned_size += entry.size
+
+            item_downloads.add(self._downloads[asset_path])
+
+        for download in item_downloads:
+            self._waiting[download][1].append(idx)
+        self._remaining.append(len(item_downloads))
+        self._yielded.append(False)
+
+        if not item_downloads:
+            heapq.heappush(self._ready, idx)
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds elapsed since the prefetching started."""
+        return time.monotonic() - self._start
+
+    @property
+    def throughput(self) -> str:
+        """Get the summary of the download throughput."""
+        elapsed = self.elapsed
+        if not elapsed:
+            return "-"
+
+        return f"{format_bytes(int(self.downloaded_size / elapsed))}/s, {self.downloaded_count / elapsed:.1f} files/s"
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Get the estimated seconds to complete the remaining downloads. Returns ``None`` if unknown."""
+        if not self.downloaded_size:
+            return None
+
+        return max(self.planned_size - self.downloaded_size, 0) / (self.downloaded_size / self.elapsed)
+
+    def _log_progress(self) -> None:
+        eta = f"{self.eta:.0f} secs" if self.eta is not None else "-"
+
+        log_periodic(
+            "INFO",
+            f"Prefetched {self.completed_count} / {len(self)} assets "
+            f"({format_bytes(self.completed_size)} / {format_bytes(self.total_size)}; "
+            f"{self.throughput}; ETA {eta})",
+            period=5
+        )
+
+    def _pop_ready(self, *, flush: bool = False) -> Generator[T, None, None]:
+        """
+        Yield the ready items in the given order.
+
+        A ready item is held while any earlier item is still downloading,
+        unless ``READY_LOOK_AHEAD`` items are already held or ``flush`` is ``True``.
+        """
+        while self._ready and (flush or self._ready[0] == self._next_idx or len(self._ready) > READY_LOOK_AHEAD):
+            idx = heapq.heappop(self._ready)
+            self._yielded[idx] = True
+
+            while self._next_idx < len(self._yielded) and self._yielded[self._next_idx]:
+                self._next_idx += 1
+
+            yield self._items[idx]
+
+    def iter_ready(self) -> Generator[T, None, None]:
+        """Yield each item once all of its downloads are completed, preferring the given order."""
+        yield from self._pop_ready()
+
+        for download in as_completed(self._waiting):
+            entry, waiting = self._waiting[download]
+
+            self.completed_count += 1
+            self.completed_size += entry.size
+
+            if exception := download.exception():
+                self.failed_count += 1
+                log("WARNING", f"Failed to prefetch {entry.name} ({exception.__class__.__name__}: {exception})")
+            elif download.result():
+                self.downloaded_count += 1
+                self.downloaded_size += entry.size
+
+            self._log_progress()
+
+            for idx in waiting:
+                self._remaining[idx] -= 1
+
+                if not self._remaining[idx]:
+                    heapq.heappush(self._ready, idx)
+
+            yield from self._pop_ready()
+
+        yield from self._pop_ready(flush=True)
+
+
+def prefetch_assets(
+        env: Environment, items: Iterable[T], get_entries: Callable[[T], Sequence["ManifestEntryBase"]]
+) -> Generator[T, None, None]:
+    """
+    Download the assets of ``items`` in background threads and yield each item once its assets are on disk.
+
+    The entries of an item are obtained from ``get_entries``.
+    An item is yielded as soon as all of its entries, including the dependencies, are downloaded,
+    so the exporting of the item can start while the other assets are still downloading.
+    Items are yielded in the given order, so the order of the scheduled tasks is kept.
+    A ready item is only yielded before the earlier items still downloading
+    if ``READY_LOOK_AHEAD`` ready items are already held back, so a slow download doesn't hold all items.
+
+    Each asset is downloaded once even if it is shared by multiple items.
+
+    If an asset fails to download, the item is still yielded,
+    so the exporting task downloads it again and handles the error.
+    """
+    executor = ThreadPoolExecutor(env.config.concurrency.download_threads, thread_name_prefix="Download")
+    downloads = _PrefetchDownloads(env, executor, get_entries)
+
+    for item in items:
+        downloads.add(item)
+
+    log(
+        "INFO",
+        f"Prefetching {len(downloads)} assets ({format_bytes(downloads.total_size)}) "
+        f"of {downloads.item_count} items. "
+        f"{downloads.planned_count} assets ({format_bytes(downloads.planned_size)}) to download, "
+        f"{len(downloads) - downloads.planned_count} assets "
+        f"({format_bytes(downloads.total_size - downloads.planned_size)}) already downloaded. "
+        f"{downloads.reference_count - len(downloads)} duplicated references to the shared assets are skipped."
+    )
+
+    try:
+        yield from downloads.iter_ready()
+    finally:
+        # Only cancels the downloads if the caller stops consuming the items
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    log(
+        "INFO",
+        f"Prefetched {downloads.downloaded_count} assets ({format_bytes(downloads.downloaded_size)}) "
+        f"in {downloads.elapsed:.3f} secs ({downloads.throughput}). "
+        f"{downloads.completed_count - downloads.downloaded_count - downloads.failed_count} assets "
+        f"were already downloaded. {downloads.failed_count} assets failed to download."
+    )
+
+    http_stats = get_http_stats()
+    log(
+        "INFO",
+        f"HTTP: {http_stats['requests']} requests over {http_stats['connections']} connections "
+        f"({http_stats['reused']} reused)"
+    )
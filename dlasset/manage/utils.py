@@ -1,7 +1,7 @@
 """Utils functions for managing the assets."""
 from typing import TYPE_CHECKING
 
-from dlasset.const import CDN_BASE_URL
+from dlasset.env import RunContext
 
 if TYPE_CHECKING:
     from dlasset.manifest import ManifestEntryBase
@@ -9,6 +9,6 @@ if TYPE_CHECKING:
 __all__ = ("get_asset_url",)
 
 
-def get_asset_url(entry: "ManifestEntryBase") -> str:
+def get_asset_url(env: RunContext, entry: "ManifestEntryBase") -> str:
     """Get the URL of the manifest ``entry``."""
-    return f"{CDN_BASE_URL}/assetbundles/Android/{entry.hash_dir}/{entry.hash}"
+    return f"{env.config.network.cdn_base_url}/assetbundles/Android/{entry.hash_dir}/{entry.hash}"
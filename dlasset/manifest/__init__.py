@@ -1,5 +1,7 @@
 """Implementations related to the manifest assets."""
+from .cache import load_cached_manifest, load_cached_manifest_of_version, store_manifest_cache
 from .decrypt import decrypt_manifest_all_locale
+from .diff import ManifestDiff, ManifestEntryChange, diff_manifests
 from .download import download_manifest_all_locale
 from .export import export_manifest_all_locale
 from .model import Manifest, ManifestEntry, ManifestEntryBase, ManifestLocale, ManifestRawEntry
@@ -0,0 +1,110 @@
+"""Implementations for caching the parsed manifests of a version."""
+import hashlib
+import os
+# The cache is only written and read locally by this program
+import pickle  # nosec
+import time
+from typing import Any, Optional
+
+from dlasset.const import MANIFEST_NAMES
+from dlasset.enums import Locale
+from dlasset.env import RunContext
+from dlasset.log import log
+from .model import Manifest
+
+__all__ = ("load_cached_manifest", "load_cached_manifest_of_version", "store_manifest_cache")
+
+MANIFEST_CACHE_FILE_NAME = "manifest.pickle"
+
+# Bump this if the structure of the cached data changes
+MANIFEST_CACHE_FORMAT = 3
+
+
+def get_manifest_dir_of_version(downloaded_dir: str, version_code: str) -> str:
+    """Get the directory of the manifest assets of ``version_code``."""
+    return os.path.join(downloaded_dir, "manifest", version_code)
+
+
+def get_manifest_asset_hashes(manifest_dir: str) -> Optional[dict[Locale, str]]:
+    """
+    Get the SHA-256 of the manifest asset of each locale in ``manifest_dir``.
+
+    Returns ``None`` if any of them is not downloaded.
+    """
+    hashes = {}
+
+    for locale in Locale:
+        path = os.path.join(manifest_dir, MANIFEST_NAMES[locale])
+        if not os.path.exists(path):
+            return None
+
+        with open(path, "rb") as f:
+            hashes[locale] = hashlib.sha256(f.read()).hexdigest()
+
+    return hashes
+
+
+def store_manifest_cache(env: RunContext, manifest: Manifest) -> None:
+    """
+    Store the parsed ``manifest`` of the current version.
+
+    The cache is keyed by the version code and the hashes of the manifest assets it is parsed from.
+    """
+    cache = {
+        "format": MANIFEST_CACHE_FORMAT,
+        "versionCode": env.args.version_code,
+        "hashes": get_manifest_asset_hashes(env.manifest_asset_dir),
+        "manifest": manifest,
+    }
+
+    cache_path = os.path.join(env.manifest_asset_dir, MANIFEST_CACHE_FILE_NAME)
+    with open(f"{cache_path}.part", "wb") as f:
+        pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(f"{cache_path}.part", cache_path)
+
+
+def _is_cache_valid(manifest_dir: str, version_code: str, cache: dict[str, Any]) -> bool:
+    return (
+        cache.get("format") == MANIFEST_CACHE_FORMAT
+        and cache.get("versionCode") == version_code
+        and cache.get("hashes") is not None
+        and cache.get("hashes") == get_manifest_asset_hashes(manifest_dir)
+    )
+
+
+def load_cached_manifest_of_version(downloaded_dir: str, version_code: str) -> Optional[Manifest]:
+    """
+    Load the parsed manifest of ``version_code`` cached in ``downloaded_dir``.
+
+    Returns ``None`` if there's no cache, or the cache doesn't match the version code
+    or the manifest assets downloaded, so the manifest needs to be processed again.
+    """
+    manifest_dir = get_manifest_dir_of_version(downloaded_dir, version_code)
+    cache_path = os.path.join(manifest_dir, MANIFEST_CACHE_FILE_NAME)
+    if not os.path.exists(cache_path):
+        return None
+
+    start = time.monotonic()
+
+    try:
+        with open(cache_path, "rb") as f:
+            # The cache is written by this program, and validated against the manifest assets
+            cache = pickle.load(f)  # nosec
+    except (pickle.UnpicklingError, EOFError, AttributeError, ImportError) as ex:
+        log("WARNING", f"Failed to load the manifest cache at {cache_path} ({ex.__class__.__name__}: {ex})")
+        return None
+
+    if not isinstance(cache, dict) or not _is_cache_valid(manifest_dir, version_code, cache):
+        log("INFO", f"Manifest cache at {cache_path} is outdated")
+        return None
+
+    manifest = cache["manifest"]
+
+    log("INFO", f"Loaded the manifest cache at {cache_path} in {time.monotonic() - start:.3f} secs")
+
+    return manifest
+
+
+def load_cached_manifest(env: RunContext) -> Optional[Manifest]:
+    """Load the parsed manifest of the current version cached by a previous run. Returns ``None`` if unavailable."""
+    return load_cached_manifest_of_version(env.config.paths.downloaded, env.args.version_code)
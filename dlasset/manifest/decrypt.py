@@ -1,17 +1,39 @@
 """Implementations for decrypting the manifest assets."""
+import base64
 # The usage of `subprocess` is safe
 import subprocess  # nosec
 
 from dlasset.enums import Locale
-from dlasset.env import Environment
+from dlasset.env import Environment, RunContext, get_run_context
 from dlasset.log import log, log_group_end, log_group_start
-from dlasset.utils import concurrent_run_no_return
+from dlasset.utils import concurrent_run_no_return, decrypt_rijndael_cbc
 
-__all__ = ("decrypt_manifest_all_locale",)
+__all__ = ("decrypt_manifest_all_locale", "decrypt_manifest_of_locale_in_process")
 
+# Block size of the Rijndael cipher used by the manifest assets
+MANIFEST_BLOCK_SIZE = 32
+
+
+def decrypt_manifest_of_locale_in_process(env: RunContext, locale: Locale) -> bytes:
+    """
+    Decrypt the manifest asset of ``locale`` in the current process and return it without storing it.
+
+    The manifest assets are encrypted by Rijndael with 256-bit blocks in CBC mode without padding.
+    """
+    log("INFO", f"Decrypting manifest of {locale} in-process...")
+
+    iv = base64.b64decode(env.args.iv)
+    if len(iv) != MANIFEST_BLOCK_SIZE:
+        raise ValueError(f"IV to decrypt the manifest should be {MANIFEST_BLOCK_SIZE} bytes, got {len(iv)} bytes")
+
+    with open(env.manifest_asset_path_of_locale(locale), "rb") as f:
+        return decrypt_rijndael_cbc(f.read(), base64.b64decode(env.args.key), iv)
+
+
+def decrypt_manifest_of_locale(locale: Locale) -> None:
+    """Decrypt and store the manifest asset of ``locale`` using ``dotnet``."""
+    env = get_run_context()
 
-def decrypt_manifest_of_locale(env: Environment, locale: Locale) -> None:
-    """Decrypt and store the manifest asset of ``locale``."""
     log("INFO", f"Decrypting manifest of {locale}...")
 
     path_encrypted = env.manifest_asset_path_of_locale(locale)
@@ -33,7 +55,11 @@ def decrypt_manifest_of_locale(env: Environment, locale: Locale) -> None:
 
 
 def decrypt_manifest_all_locale(env: Environment) -> None:
-    """Decrypt and store the manifest asset of all locales."""
+    """
+    Decrypt and store the manifest asset of all locales using ``dotnet``.
+
+    This is only needed if the manifest assets are not decrypted in-process.
+    """
     log_group_start("Manifest decrypting")
-    concurrent_run_no_return(decrypt_manifest_of_locale, [[env, locale] for locale in Locale], env.config.paths.log)
+    concurrent_run_no_return(decrypt_manifest_of_locale, [[locale] for locale in Locale], env.config.paths.log)
     log_group_end()
@@ -0,0 +1,235 @@
+"""Implementations for comparing the manifests of two versions."""
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Literal, Optional
+
+from dlasset.enums import Locale
+from dlasset.log import log, log_group_end, log_group_start
+from dlasset.utils import export_json
+from .model import Manifest, ManifestEntryBase, ManifestLocale
+
+__all__ = ("ManifestChangeType", "ManifestEntryChange", "ManifestDiff", "diff_manifests")
+
+ManifestChangeType = Literal["added", "removed", "renamed", "changed", "dependency"]
+
+# Category name of the raw assets, which are not in any category
+RAW_ASSETS_CATEGORY = "(raw)"
+
+
+@dataclass
+class ManifestEntryChange:
+    """
+    Change of a manifest entry.
+
+    - ``added``: entry only in the new manifest
+    - ``removed``: entry only in the old manifest
+    - ``renamed``: entry only in the new manifest, having the same hash as a removed entry ``old_name``
+    - ``changed``: hash or dependencies of the entry changed
+    - ``dependency``: entry unchanged, but any of its dependencies changed, including the transitive ones
+    """
+
+    name: str
+    category: str
+    change_type: ManifestChangeType
+
+    old_hash: Optional[str] = None
+    new_hash: Optional[str] = None
+
+    old_name: Optional[str] = None
+    # Direct dependencies causing the ``dependency`` change
+    changed_dependencies: list[str] = field(default_factory=list)
+
+    def to_json(self) -> dict[str, Any]:
+        """Get the JSON representation of this change."""
+        json_obj: dict[str, Any] = {"name": self.name, "category": self.category, "type": self.change_type}
+
+        if self.old_hash:
+            json_obj["oldHash"] = self.old_hash
+        if self.new_hash:
+            json_obj["newHash"] = self.new_hash
+        if self.old_name:
+            json_obj["oldName"] = self.old_name
+        if self.changed_dependencies:
+            json_obj["changedDependencies"] = self.changed_dependencies
+
+        return json_obj
+
+
+@dataclass
+class ManifestDiff:
+    """Changes of the manifest entries of each locale from ``old_version`` to ``new_version``."""
+
+    old_version: str
+    new_version: str
+
+    changes: dict[Locale, list[ManifestEntryChange]]
+
+    # key = locale; value = names of the entries in the new manifest to export again
+    _updated_names: dict[Locale, set[str]] = field(init=False)
+
+    def __post_init__(self) -> None:
+        self._updated_names = {
+            locale: {change.name for change in changes if change.change_type != "removed"}
+            for locale, changes in self.changes.items()
+        }
+
+    def get_updated_names(self, locale: Locale) -> set[str]:
+        """Get the names of the entries of ``locale`` added or changed, including the dependency changes."""
+        return self._updated_names.get(locale, set())
+
+    def is_entry_updated(self, locale: Locale, entry: ManifestEntryBase) -> bool:
+        """Check if ``entry`` of ``locale`` is added or changed, including the dependency changes."""
+        return entry.name in self.get_updated_names(locale)
+
+    def to_json(self) -> dict[str, Any]:
+        """Get the JSON representation of this diff."""
+        return {
+            "oldVersion": self.old_version,
+            "newVersion": self.new_version,
+            # Using `locale.value` instead of `locale` for json exporting
+            "changes": {
+                locale.value: [change.to_json() for change in changes]
+                for locale, changes in self.changes.items()
+            },
+        }
+
+    def export(self, file_path: str) -> None:
+        """Store this diff to ``file_path``."""
+        export_json(file_path, self.to_json())
+
+    def print(self) -> None:
+        """Print the count of the changes of each locale and category."""
+        log_group_start(f"Manifest changes ({self.old_version} -> {self.new_version})")
+
+        for locale, changes in self.changes.items():
+            if not changes:
+                log("INFO", f"{locale}: No changes")
+                continue
+
+            log("INFO", f"{locale}: {len(changes)} changes")
+
+            counts: defaultdict[str, Counter[str]] = defaultdict(Counter)
+            for change in changes:
+                counts[change.category][change.change_type] += 1
+
+            for category, count_of_type in sorted(counts.items()):
+                log("INFO", f"- {category}: {', '.join(f'{count} {type_}' for type_, count in count_of_type.items())}")
+
+        log_group_end()
+
+
+def _get_entries_by_name(manifest_of_locale: ManifestLocale) -> dict[str, tuple[str, ManifestEntryBase]]:
+    """Get the category name and the entry of each entry name in ``manifest_of_locale``."""
+    entries: dict[str, tuple[str, ManifestEntryBase]] = {}
+
+    for category in manifest_of_locale.categories:
+        for entry in category.assets:
+            entries[entry.name] = (category.name, entry)
+
+    for raw_entry in manifest_of_locale.raw_assets:
+        entries[raw_entry.name] = (RAW_ASSETS_CATEGORY, raw_entry)
+
+    return entries
+
+
+def _get_dependency_changes(
+        new_entries: dict[str, tuple[str, ManifestEntryBase]], changed_names: set[str]
+) -> list[ManifestEntryChange]:
+    """
+    Get the changes of the entries in ``new_entries`` depending on any of ``changed_names``, directly or not.
+
+    The dependency graph is traversed in reverse from the changed entries, so each entry is visited once
+    even if the dependencies contain cycles.
+    """
+    # key = dependency name; value = names of the entries depending on it
+    dependents: defaultdict[str, list[str]] = defaultdict(list)
+    for name, (_, entry) in new_entries.items():
+        for dependency in entry.dependencies:
+            dependents[dependency].append(name)
+
+    affected = set(changed_names)
+    # key = entry name; value = direct dependencies affected
+    changed_dependencies: defaultdict[str, list[str]] = defaultdict(list)
+
+    pending = list(changed_names)
+    while pending:
+        dependency = pending.pop()
+
+        for dependent in dependents[dependency]:
+            if dependent in changed_names:
+                continue
+
+            changed_dependencies[dependent].append(dependency)
+
+            if dependent not in affected:
+                affected.add(dependent)
+                pending.append(dependent)
+
+    changes = []
+    for name in sorted(changed_dependencies):
+        category, entry = new_entries[name]
+        changes.append(ManifestEntryChange(
+            name=name, category=category, change_type="dependency", old_hash=entry.hash, new_hash=entry.hash,
+            changed_dependencies=sorted(changed_dependencies[name])
+        ))
+
+    return changes
+
+
+def _diff_manifest_of_locale(old: Optional[ManifestLocale], new: ManifestLocale) -> list[ManifestEntryChange]:
+    # Every entry is added if the locale is not in the old manifest
+    old_entries = _get_entries_by_name(old) if old else {}
+    new_entries = _get_entries_by_name(new)
+
+    changes: list[ManifestEntryChange] = []
+
+    # key = hash; value = names of the removed entries having it
+    removed_by_hash: defaultdict[str, list[str]] = defaultdict(list)
+    for name in sorted(old_entries.keys() - new_entries.keys()):
+        removed_by_hash[old_entries[name][1].hash].append(name)
+
+    for name in sorted(new_entries.keys() - old_entries.keys()):
+        category, entry = new_entries[name]
+
+        if removed_by_hash.get(entry.hash):
+            old_name = removed_by_hash[entry.hash].pop(0)
+            changes.append(ManifestEntryChange(
+                name=name, category=category, change_type="renamed",
+                old_hash=entry.hash, new_hash=entry.hash, old_name=old_name
+            ))
+        else:
+            changes.append(ManifestEntryChange(name=name, category=category, change_type="added", new_hash=entry.hash))
+
+    for old_names in removed_by_hash.values():
+        for name in old_names:
+            category, entry = old_entries[name]
+            changes.append(ManifestEntryChange(
+                name=name, category=category, change_type="removed", old_hash=entry.hash
+            ))
+
+    for name in sorted(old_entries.keys() & new_entries.keys()):
+        old_entry = old_entries[name][1]
+        category, new_entry = new_entries[name]
+
+        if old_entry.hash != new_entry.hash or sorted(old_entry.dependencies) != sorted(new_entry.dependencies):
+            changes.append(ManifestEntryChange(
+                name=name, category=category, change_type="changed", old_hash=old_entry.hash, new_hash=new_entry.hash
+            ))
+
+    changes.extend(_get_dependency_changes(
+        new_entries, {change.name for change in changes if change.change_type != "removed"}
+    ))
+
+    return changes
+
+
+def diff_manifests(old: Manifest, new: Manifest, old_version: str, new_version: str) -> ManifestDiff:
+    """Get the changes of the manifest entries from ``old`` of ``old_version`` to ``new`` of ``new_version``."""
+    return ManifestDiff(
+        old_version=old_version,
+        new_version=new_version,
+        changes={
+            locale: _diff_manifest_of_locale(old.manifests.get(locale), manifest_of_locale)
+            for locale, manifest_of_locale in new.manifests.items()
+        }
+    )
@@ -1,25 +1,27 @@
 """Implementations to download manifest assets."""
-from dlasset.const import CDN_BASE_URL, MANIFEST_NAMES
+from dlasset.const import MANIFEST_NAMES
 from dlasset.enums import Locale
-from dlasset.env import Environment
+from dlasset.env import Environment, get_run_context
 from dlasset.log import log, log_group_end, log_group_start
-from dlasset.utils import concurrent_run_no_return, http_get
+from dlasset.utils import concurrent_run_no_return, http_download
 
 __all__ = ("download_manifest_all_locale",)
 
 
-def download_manifest_of_locale(env: Environment, locale: Locale) -> None:
+def download_manifest_of_locale(locale: Locale) -> None:
     """
     Download and store the manifest asset of ``locale``.
 
     Downloaded asset needs decryption.
     """
+    env = get_run_context()
+
     log("INFO", f"Downloading manifest of {locale}...")
-    manifest_url = f"{CDN_BASE_URL}/manifests/Android/{env.args.version_code}/{MANIFEST_NAMES[locale]}"
+    manifest_url = (
+        f"{env.config.network.cdn_base_url}/manifests/Android/{env.args.version_code}/{MANIFEST_NAMES[locale]}"
+    )
 
-    response = http_get(manifest_url)
-    with open(env.manifest_asset_path_of_locale(locale), mode="wb+") as f:
-        f.write(response.content)
+    http_download(manifest_url, env.manifest_asset_path_of_locale(locale))
 
 
 def download_manifest_all_locale(env: Environment) -> None:
@@ -29,5 +31,5 @@ def download_manifest_all_locale(env: Environment) -> None:
     Downloaded asset needs decryption.
     """
     log_group_start("Manifest downloading")
-    concurrent_run_no_return(download_manifest_of_locale, [[env, locale] for locale in Locale], env.config.paths.log)
+    concurrent_run_no_return(download_manifest_of_locale, [[locale] for locale in Locale], env.config.paths.log)
     log_group_end()
@@ -3,31 +3,47 @@ import sys
 from typing import cast
 
 from dlasset.enums import Locale
-from dlasset.env import Environment
-from dlasset.export import MonoBehaviourTree, export_asset
+from dlasset.env import Environment, get_run_context
+from dlasset.export import export_asset, export_unity_asset
 from dlasset.log import log, log_group_end, log_group_start
+from dlasset.model import UnityAsset
 from dlasset.utils import concurrent_run
-from .model import Manifest
+from .decrypt import decrypt_manifest_of_locale_in_process
+from .model import Manifest, ManifestLocale
 
 __all__ = ("export_manifest_all_locale",)
 
 
-def export_manifest_of_locale(env: Environment, locale: Locale) -> MonoBehaviourTree:
-    """Export and store the manifest file of ``locale``."""
-    log("INFO", f"Exporting manifest of {locale}...")
+def export_manifest_of_locale(locale: Locale) -> ManifestLocale:
+    """
+    Export and store the manifest file of ``locale``, then return its model.
 
-    exported = export_asset(
-        (env.manifest_asset_decrypted_path(locale),),
-        "MonoBehaviour",
-        env.config.paths.export_asset_dir_of_locale(locale)
-    )
+    The model is built in the worker and returned instead of the exported tree,
+    so it is pickled by :meth:`ManifestEntryBase.to_columns`.
+
+    The manifest asset is decrypted in-process and loaded without storing the decrypted asset,
+    unless it is already decrypted by ``dotnet``.
+    """
+    env = get_run_context()
+    export_dir = env.config.paths.export_asset_dir_of_locale(locale)
+
+    if env.args.dotnet_decrypt:
+        log("INFO", f"Exporting manifest of {locale}...")
+        exported = export_asset((env.manifest_asset_decrypted_path(locale),), "MonoBehaviour", export_dir)
+    else:
+        asset = UnityAsset(
+            (env.manifest_asset_path_of_locale(locale),), decrypt_manifest_of_locale_in_process(env, locale)
+        )
+
+        log("INFO", f"Exporting manifest of {locale}...")
+        exported = export_unity_asset(asset, "MonoBehaviour", export_dir)
 
     if not exported.tree:
         log("ERROR", f"Manifest of {locale} not exported")
         sys.exit(1)
 
     # Manifest asset only contains one `MonoBehaviour`
-    return exported.tree[0]
+    return ManifestLocale(exported.tree[0])
 
 
 def export_manifest_all_locale(env: Environment) -> Manifest:
@@ -38,9 +54,9 @@ def export_manifest_all_locale(env: Environment) -> Manifest:
     """
     log_group_start("Manifest exporting")
     results = concurrent_run(
-        export_manifest_of_locale, [[env, locale] for locale in Locale], env.config.paths.log,
-        key_of_call=lambda _, locale: cast(Locale, locale)
+        export_manifest_of_locale, [[locale] for locale in Locale], env.config.paths.log,
+        key_of_call=lambda locale: cast(Locale, locale)
     )
     log_group_end()
 
-    return Manifest(results)
+    return Manifest(dict(results))
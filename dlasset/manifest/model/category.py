@@ -1,17 +1,30 @@
 """Manifest categorical model class."""
-from dataclasses import dataclass, field
+from dataclasses import InitVar, dataclass, field
+from typing import Any
 
-from dlasset.model import JsonModel
 from .entry import ManifestEntry
 
 
 @dataclass
-class ManifestCategory(JsonModel):
-    """Manifest category model."""
+class ManifestCategory:
+    """
+    Manifest category model.
+
+    The entries are pickled by :meth:`ManifestEntryBase.to_columns`.
+    """
+
+    json_obj: InitVar[dict[Any, Any]]
 
     name: str = field(init=False)
     assets: tuple[ManifestEntry, ...] = field(init=False)
 
-    def __post_init__(self) -> None:
-        self.name = self.json_obj["name"]
-        self.assets = tuple(ManifestEntry(entry) for entry in self.json_obj["assets"])
+    def __post_init__(self, json_obj: dict[Any, Any]) -> None:
+        self.name = json_obj["name"]
+        self.assets = tuple(ManifestEntry(entry) for entry in json_obj["assets"])
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {"name": self.name, "assets": ManifestEntry.to_columns(self.assets)}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.name = state["name"]
+        self.assets = ManifestEntry.from_columns(state["assets"])
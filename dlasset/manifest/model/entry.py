@@ -1,59 +1,124 @@
 """Manifest entry model classes."""
 import os
+import sys
 from abc import ABC
-from dataclasses import dataclass, field
+from typing import Any, Sequence, Type, TypeVar
 
-from dlasset.env import Environment
-from dlasset.model import JsonModel
+from dlasset.env import RunContext
 
 __all__ = ("ManifestEntry", "ManifestRawEntry", "ManifestEntryBase",)
 
+T = TypeVar("T", bound="ManifestEntryBase")
 
-@dataclass
-class ManifestEntryBase(JsonModel, ABC):
-    """Manifest entry model base."""
+# Columns of the entry attributes, in the order of ``ManifestEntryBase.COLUMNS``
+EntryColumns = tuple[tuple[Any, ...], ...]
 
-    name: str = field(init=False)
-    hash: str = field(init=False)
-    size: int = field(init=False)
-    group: int = field(init=False)
 
-    dependencies: list[str] = field(init=False)
+class ManifestEntryBase(ABC):
+    """
+    Manifest entry model base.
 
-    hash_dir: str = field(init=False)
+    Entries are the bulk of the manifest, so they are kept compact.
+    The json object is not kept, strings are interned to be shared across locales,
+    and the attributes are stored in slots.
+    """
 
-    def __post_init__(self) -> None:
-        self.name = self.json_obj["name"]
-        self.hash = self.json_obj["hash"]
-        self.size = self.json_obj["size"]
-        self.group = self.json_obj["group"]
+    __slots__ = ("name", "hash", "size", "group", "dependencies", "hash_dir")
 
-        self.dependencies = self.json_obj.get("dependencies", [])
+    # Attributes stored by ``to_columns()``
+    COLUMNS: tuple[str, ...] = __slots__
+    # Columns of strings and of tuples of strings, which are interned by ``from_columns()``
+    STRING_COLUMNS: tuple[str, ...] = ("name", "hash", "hash_dir")
+    STRING_TUPLE_COLUMNS: tuple[str, ...] = ("dependencies",)
 
-        self.hash_dir = self.hash[:2]
+    name: str
+    hash: str
+    size: int
+    group: int
 
-    def get_actual_asset_dir(self, env: Environment) -> str:
+    dependencies: tuple[str, ...]
+
+    hash_dir: str
+
+    def __init__(self, json_obj: dict[Any, Any]) -> None:
+        self.name = sys.intern(json_obj["name"])
+        self.hash = sys.intern(json_obj["hash"])
+        self.size = json_obj["size"]
+        self.group = json_obj["group"]
+
+        self.dependencies = tuple(map(sys.intern, json_obj.get("dependencies", ())))
+
+        self.hash_dir = sys.intern(self.hash[:2])
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(name={self.name!r}, hash={self.hash!r})"
+
+    @classmethod
+    def to_columns(cls, entries: Sequence["ManifestEntryBase"]) -> EntryColumns:
+        """
+        Get the attributes of ``entries`` as a column for each attribute.
+
+        Columns are much smaller and faster to pickle than the entries,
+        so the models containing entries are pickled as columns.
+        """
+        return tuple(tuple(getattr(entry, column) for entry in entries) for column in cls.COLUMNS)
+
+    @classmethod
+    def from_columns(cls: Type[T], columns: EntryColumns) -> tuple[T, ...]:
+        """
+        Get the entries from the ``columns`` returned by ``to_columns()``.
+
+        The strings are interned again, because the ones unpickled separately are not shared.
+        """
+        columns = tuple(
+            tuple(map(sys.intern, column)) if name in cls.STRING_COLUMNS
+            else tuple(tuple(map(sys.intern, strings)) for strings in column) if name in cls.STRING_TUPLE_COLUMNS
+            else column
+            for name, column in zip(cls.COLUMNS, columns)
+        )
+
+        entries = []
+        for values in zip(*columns):
+            entry = cls.__new__(cls)
+            entry._restore(values)
+            entries.append(entry)
+
+        return tuple(entries)
+
+    def _restore(self, values: tuple[Any, ...]) -> None:
+        """Restore the attributes from ``values`` in the order of ``COLUMNS``."""
+        self.name, self.hash, self.size, self.group, self.dependencies, self.hash_dir = values
+
+    def get_actual_asset_dir(self, env: RunContext) -> str:
         """Get the directory where the downloaded asset is located."""
         return os.path.join(env.downloaded_assets_dir, self.hash_dir)
 
-    def get_asset_path(self, env: Environment) -> str:
+    def get_asset_path(self, env: RunContext) -> str:
         """Get the complete path of the downloader asset."""
         asset_hash_dir = self.get_actual_asset_dir(env)
         return os.path.join(asset_hash_dir, self.hash)
 
 
-@dataclass
 class ManifestEntry(ManifestEntryBase):
     """Manifest entry model."""
 
-    assets: list[str] = field(init=False)
+    __slots__ = ("assets",)
 
-    def __post_init__(self) -> None:
-        super().__post_init__()
+    COLUMNS = ManifestEntryBase.COLUMNS + __slots__
+    STRING_TUPLE_COLUMNS = ManifestEntryBase.STRING_TUPLE_COLUMNS + ("assets",)
 
-        self.assets = self.json_obj["assets"]
+    assets: tuple[str, ...]
+
+    def __init__(self, json_obj: dict[Any, Any]) -> None:
+        super().__init__(json_obj)
+
+        self.assets = tuple(map(sys.intern, json_obj["assets"]))
+
+    def _restore(self, values: tuple[Any, ...]) -> None:
+        self.name, self.hash, self.size, self.group, self.dependencies, self.hash_dir, self.assets = values
 
 
-@dataclass
 class ManifestRawEntry(ManifestEntryBase):
     """Manifest entry model for raw assets."""
+
+    __slots__ = ()
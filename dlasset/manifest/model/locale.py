@@ -1,28 +1,131 @@
 """Manifest model class of a locale."""
-from dataclasses import dataclass, field
-from typing import Generator
+from dataclasses import InitVar, dataclass, field
+from typing import Any, Generator, TypeVar, cast
 
-from dlasset.model import JsonModel
 from .category import ManifestCategory
-from .entry import ManifestEntry, ManifestRawEntry
+from .entry import ManifestEntry, ManifestEntryBase, ManifestRawEntry
+
+T = TypeVar("T", bound=ManifestEntryBase)
+
+# Dependencies deeper than this are walked in place instead of being resolved recursively
+MAX_DEPENDENCY_DEPTH = 50
 
 
 @dataclass
-class ManifestLocale(JsonModel):
-    """Manifest model of a locale."""
+class ManifestLocale:
+    """
+    Manifest model of a locale.
+
+    The raw entries are pickled by :meth:`ManifestEntryBase.to_columns`.
+    The entries by name and the dependency closures are built again after unpickling instead.
+    """
+
+    json_obj: InitVar[dict[Any, Any]]
 
     categories: tuple[ManifestCategory, ...] = field(init=False)
     raw_assets: tuple[ManifestRawEntry, ...] = field(init=False)
 
     entry_by_name: dict[str, ManifestEntry] = field(init=False)
 
-    def __post_init__(self) -> None:
-        self.categories = tuple(ManifestCategory(category) for category in self.json_obj["categories"])
-        self.raw_assets = tuple(ManifestRawEntry(asset) for asset in self.json_obj["rawAssets"])
+    # key = type and name of the parent entry; value = parent entry and its dependencies
+    _dependency_closures: dict[tuple[type, str], tuple[ManifestEntryBase, ...]] = field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self, json_obj: dict[Any, Any]) -> None:
+        self.categories = tuple(ManifestCategory(category) for category in json_obj["categories"])
+        self.raw_assets = tuple(ManifestRawEntry(asset) for asset in json_obj["rawAssets"])
+
+        self._init_lookups()
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {"categories": self.categories, "raw_assets": ManifestRawEntry.to_columns(self.raw_assets)}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.categories = state["categories"]
+        self.raw_assets = ManifestRawEntry.from_columns(state["raw_assets"])
 
+        self._init_lookups()
+
+    def _init_lookups(self) -> None:
         self.entry_by_name = {entry.name: entry for entry in self.entries_across_category}
 
+        self._dependency_closures = {}
+
     @property
     def entries_across_category(self) -> Generator[ManifestEntry, None, None]:
         """Get a generator yielding the manifest entries across categories."""
         return (asset for category in self.categories for asset in category.assets)
+
+    def _get_dependency_closure(
+            self, parent_entry: ManifestEntryBase, resolving: set[str]
+    ) -> tuple[ManifestEntryBase, ...]:
+        """
+        Get ``parent_entry`` and all entries reachable from its dependencies.
+
+        The closures of the dependencies are resolved and stored first, then merged into the closure of the parent.
+        ``resolving`` contains the entries being resolved in the call stack.
+        Dependencies in ``resolving`` are cyclic, so they are walked in place instead of being resolved again.
+        """
+        if not parent_entry.dependencies:
+            return (parent_entry,)
+
+        key = (type(parent_entry), parent_entry.name)
+        if closure := self._dependency_closures.get(key):
+            return closure
+
+        resolving.add(parent_entry.name)
+
+        closure = self._merge_dependency_closures(parent_entry, resolving)
+
+        resolving.discard(parent_entry.name)
+
+        self._dependency_closures[key] = closure
+
+        return closure
+
+    def _merge_dependency_closures(
+            self, parent_entry: ManifestEntryBase, resolving: set[str]
+    ) -> tuple[ManifestEntryBase, ...]:
+        dependencies = parent_entry.dependencies
+
+        if len(dependencies) == 1 and dependencies[0] not in resolving and len(resolving) <= MAX_DEPENDENCY_DEPTH:
+            # Most entries have a single dependency, which is shared with the other entries
+            dependency_closure = self._get_dependency_closure(self.entry_by_name[dependencies[0]], resolving)
+            if all(entry is not parent_entry for entry in dependency_closure):
+                return parent_entry, *dependency_closure
+
+        entries: list[ManifestEntryBase] = [parent_entry]
+        visited = {parent_entry.name}
+
+        # Reversed, so the dependencies are popped in their order
+        pending = list(reversed(parent_entry.dependencies))
+        while pending:
+            name = pending.pop()
+            if name in visited:
+                continue
+
+            dependency_entry = self.entry_by_name[name]
+
+            if name in resolving or len(resolving) > MAX_DEPENDENCY_DEPTH:
+                visited.add(name)
+                entries.append(dependency_entry)
+                pending.extend(reversed(dependency_entry.dependencies))
+                continue
+
+            for entry in self._get_dependency_closure(dependency_entry, resolving):
+                if entry.name not in visited:
+                    visited.add(entry.name)
+                    entries.append(entry)
+
+        return tuple(entries)
+
+    def get_entries_including_dependencies(self, parent_entry: T) -> tuple[T, ...]:
+        """
+        Get ``parent_entry`` and its dependencies, including the transitive ones, attached at its tail.
+
+        Each dependency appears once, even if it is shared by multiple dependencies or cyclic.
+
+        The result of each entry, including its dependencies, is computed once, then reused.
+        """
+        return cast("tuple[T, ...]", self._get_dependency_closure(parent_entry, set()))
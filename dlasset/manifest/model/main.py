@@ -1,7 +1,6 @@
 """Manifest model class."""
-import re
-from dataclasses import dataclass, field
-from typing import Callable, Generator, Iterable, Pattern, TypeVar, cast
+from dataclasses import InitVar, dataclass, field
+from typing import Callable, Generator, Iterable, Pattern, TypeVar, Union
 
 from dlasset.enums import Locale
 from dlasset.export import MonoBehaviourTree
@@ -15,29 +14,47 @@ T = TypeVar("T", bound=ManifestEntryBase)
 
 @dataclass
 class Manifest:
-    """Manifest of all locales."""
+    """
+    Manifest of all locales.
 
-    data: dict[Locale, MonoBehaviourTree]
+    The parsed manifest ``data`` is not kept, so it can be released once the model is built.
+    ``data`` of a locale can also be its model built elsewhere, such as in a worker process.
+    """
+
+    data: InitVar[dict[Locale, Union[MonoBehaviourTree, ManifestLocale]]]
 
     manifests: dict[Locale, ManifestLocale] = field(init=False)
 
-    def __post_init__(self) -> None:
-        self.manifests = {locale: ManifestLocale(manifest) for locale, manifest in self.data.items()}
+    def __post_init__(self, data: dict[Locale, Union[MonoBehaviourTree, ManifestLocale]]) -> None:
+        self.manifests = {
+            locale: manifest if isinstance(manifest, ManifestLocale) else ManifestLocale(manifest)
+            for locale, manifest in data.items()
+        }
+
+    @property
+    def hashes(self) -> set[str]:
+        """Get the hashes of all entries across locales, including the raw assets."""
+        return {
+            entry.hash
+            for manifest_of_locale in self.manifests.values()
+            for entries in (manifest_of_locale.entries_across_category, manifest_of_locale.raw_assets)
+            for entry in entries
+        }
 
     def get_entries_including_dependencies(
             self, locale: Locale, parent_entry: T
-    ) -> list[T]:
-        """Get ``parent_entry`` and its dependencies attached at the tail of the returned entry list."""
-        ret = [parent_entry]
-        for dependency in parent_entry.dependencies:
-            dependency_entry = self.manifests[locale].entry_by_name[dependency]
-            ret.extend(self.get_entries_including_dependencies(locale, cast(T, dependency_entry)))
-        return ret
+    ) -> tuple[T, ...]:
+        """
+        Get ``parent_entry`` and its dependencies attached at the tail of the returned entries.
+
+        Each dependency appears once, even if shared by multiple dependencies or cyclic.
+        """
+        return self.manifests[locale].get_entries_including_dependencies(parent_entry)
 
     def get_manifest_entries_of_locale(
             self, regex: Pattern, get_entries: Callable[[ManifestLocale], Iterable[T]], *,
             is_master_only: bool
-    ) -> Generator[tuple[Locale, list[T]], None, None]:
+    ) -> Generator[tuple[Locale, tuple[T, ...]], None, None]:
         """
         Get a generator yielding locale and the entry with its name matching ``regex`` from ``entries``.
 
@@ -50,7 +67,29 @@ class Manifest:
                 continue
 
             for entry in get_entries(manifest_of_locale):
-                if not re.match(regex, entry.name):
+                if not regex.match(entry.name):
+                    continue
+
+                yield locale, self.get_entries_including_dependencies(locale, entry)
+
+    def get_entry_with_regex_in_names(
+            self, regex: Pattern, get_names: Callable[[Locale], Iterable[str]], *,
+            is_master_only: bool
+    ) -> Generator[tuple[Locale, tuple[ManifestEntry, ...]], None, None]:
+        """
+        Get a generator yielding the manifest entry with its name in ``get_names`` of its locale matching ``regex``.
+
+        Only the given names are looked up, so this is proportional to the count of the names
+        instead of the count of all entries.
+
+        Resolves asset dependecy.
+        """
+        for locale, manifest_of_locale in self.manifests.items():
+            if is_master_only and not locale.is_master:
+                continue
+
+            for name in sorted(get_names(locale)):
+                if not (entry := manifest_of_locale.entry_by_name.get(name)) or not regex.match(entry.name):
                     continue
 
                 yield locale, self.get_entries_including_dependencies(locale, entry)
@@ -58,7 +97,7 @@ class Manifest:
     def get_entry_with_regex(
             self, regex: Pattern, *,
             is_master_only: bool
-    ) -> Generator[tuple[Locale, list[ManifestEntry]], None, None]:
+    ) -> Generator[tuple[Locale, tuple[ManifestEntry, ...]], None, None]:
         """
         Get a generator yielding the manifest entry with its name matching ``regex``.
 
@@ -72,7 +111,7 @@ class Manifest:
     def get_raw_entry_with_regex(
             self, regex: Pattern, *,
             is_master_only: bool
-    ) -> Generator[tuple[Locale, list[ManifestRawEntry]], None, None]:
+    ) -> Generator[tuple[Locale, tuple[ManifestRawEntry, ...]], None, None]:
         """
         Get a generator yielding the manifest entry with its name matching ``regex``.
 
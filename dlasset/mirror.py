@@ -0,0 +1,139 @@
+"""Local mirror serving the downloaded files in the same layout as the CDN."""
+import os
+import re
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+
+from dlasset.log import log
+
+__all__ = ("MirrorRequestHandler", "create_mirror_server", "serve_mirror")
+
+# CDN path -> path relative to the downloaded directory
+_ROUTES: tuple[tuple[re.Pattern[str], str], ...] = (
+    (re.compile(r"^/manifests/Android/(?P<version>[\w-]+)/(?P<name>[\w.-]+)$"), "manifest/{version}/{name}"),
+    (re.compile(r"^/assetbundles/Android/(?P<hash_dir>\w+)/(?P<hash>\w+)$"), "assets/{hash_dir}/{hash}"),
+)
+
+_RANGE_REGEX = re.compile(r"^bytes=(\d+)-(\d*)$")
+
+_COPY_CHUNK_SIZE = 64 * 1024
+
+
+class MirrorRequestHandler(BaseHTTPRequestHandler):
+    """
+    Request handler serving the files in ``downloaded_dir`` in the same layout as the CDN.
+
+    - ``/manifests/Android/{version}/{name}`` serves ``{downloaded_dir}/manifest/{version}/{name}``
+    - ``/assetbundles/Android/{hash_dir}/{hash}`` serves ``{downloaded_dir}/assets/{hash_dir}/{hash}``
+
+    Single ``Range`` requests are supported, so interrupted downloads from the mirror resume as from the CDN.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def __init__(self, *args: Any, downloaded_dir: str, **kwargs: Any) -> None:
+        self.downloaded_dir = downloaded_dir
+        super().__init__(*args, **kwargs)
+
+    def _get_file_path(self) -> Optional[str]:
+        """Get the path of the file requested. Returns ``None`` if the request path is not in the CDN layout."""
+        path = self.path.split("?", 1)[0]
+
+        for regex, file_path_format in _ROUTES:
+            if not (match := regex.match(path)):
+                continue
+
+            # Segments matched by the routes never contain a path separator or consist of dots only
+            if any(segment.strip(".") == "" for segment in match.groupdict().values()):
+                return None
+
+            return os.path.join(self.downloaded_dir, *file_path_format.format(**match.groupdict()).split("/"))
+
+        return None
+
+    def _get_range(self, size: int) -> Optional[tuple[int, int]]:
+        """
+        Get the inclusive byte range to send of a file of ``size`` bytes.
+
+        Returns ``None`` if the request doesn't have a supported ``Range`` header, so the whole file is sent.
+        Raises :class:`ValueError` if the range is not satisfiable.
+        """
+        if not (range_header := self.headers.get("Range")) or not (match := _RANGE_REGEX.match(range_header)):
+            return None
+
+        start = int(match.group(1))
+        end = min(int(match.group(2)), size - 1) if match.group(2) else size - 1
+
+        if start >= size or start > end:
+            raise ValueError(f"Range {range_header} not satisfiable for a file of {size} bytes")
+
+        return start, end
+
+    def _send_file(self, *, send_body: bool) -> None:
+        file_path = self._get_file_path()
+        if not file_path or not os.path.isfile(file_path):
+            self.send_error(404)
+            return
+
+        size = os.path.getsize(file_path)
+
+        try:
+            byte_range = self._get_range(size)
+        except ValueError:
+            self.send_response(416)
+            self.send_header("Content-Range", f"bytes */{size}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        start, end = byte_range or (0, size - 1)
+
+        if byte_range:
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+
+        if not send_body:
+            return
+
+        with open(file_path, "rb") as f:
+            f.seek(start)
+            remaining = end - start + 1
+            while remaining > 0 and (chunk := f.read(min(_COPY_CHUNK_SIZE, remaining))):
+                self.wfile.write(chunk)
+                remaining -= len(chunk)
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """Send the file requested."""
+        self._send_file(send_body=True)
+
+    def do_HEAD(self) -> None:  # pylint: disable=invalid-name
+        """Send the headers of the file requested."""
+        self._send_file(send_body=False)
+
+    def log_message(self, format: str, *args: Any) -> None:  # pylint: disable=redefined-builtin
+        """Log the requests at debug level, so serving the assets doesn't flood the console."""
+        log("DEBUG", f"{self.address_string()} - {format % args}")
+
+
+def create_mirror_server(downloaded_dir: str, host: str, port: int) -> ThreadingHTTPServer:
+    """Create a server mirroring the CDN using the files in ``downloaded_dir``. Use port ``0`` for any free port."""
+    return ThreadingHTTPServer((host, port), partial(MirrorRequestHandler, downloaded_dir=downloaded_dir))
+
+
+def serve_mirror(downloaded_dir: str, host: str, port: int) -> None:
+    """Serve the files in ``downloaded_dir`` as a CDN mirror on ``host:port`` until interrupted."""
+    with create_mirror_server(downloaded_dir, host, port) as server:
+        log("INFO", f"Mirroring {downloaded_dir} on http://{host}:{server.server_port}")
+        log("INFO", f"Set `network.cdnBaseUrl` in the config to http://{host}:{server.server_port} to use it")
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            log("INFO", "Mirror stopped")
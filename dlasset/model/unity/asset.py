@@ -1,6 +1,7 @@
 """Unity asset model."""
 import os
-from dataclasses import dataclass, field
+from dataclasses import InitVar, dataclass, field
+from functools import lru_cache
 from typing import Optional, TYPE_CHECKING
 
 import UnityPy
@@ -8,6 +9,7 @@ from UnityPy.classes import Object
 from UnityPy.environment import Environment
 
 from dlasset.log import log_periodic
+from dlasset.utils import register_worker_stats
 from .obj import ObjectInfo
 
 if TYPE_CHECKING:
@@ -16,19 +18,45 @@ if TYPE_CHECKING:
 __all__ = ("UnityAsset",)
 
 
+@lru_cache(maxsize=50)
+def load_bundle(asset_path: str) -> Environment:
+    """
+    Load the asset bundle at ``asset_path``.
+
+    Loaded bundles are cached, so the dependency bundles shared by different assets are only loaded once.
+    """
+    return UnityPy.load(asset_path)
+
+
+def _get_bundle_cache_stats() -> dict[str, int]:
+    cache_info = load_bundle.cache_info()
+    return {"hits": cache_info.hits, "misses": cache_info.misses}
+
+
+register_worker_stats("Bundle cache", _get_bundle_cache_stats)
+
+
 @dataclass
 class UnityAsset:
-    """Unity asset model."""
+    """
+    Unity asset model.
+
+    If ``data`` is given, the asset is loaded from it instead of the file at the only path in ``asset_paths``.
+    """
 
-    asset_paths: tuple[str]
+    asset_paths: tuple[str, ...]
+    data: InitVar[Optional[bytes]] = None
 
     _assets: list[Environment] = field(init=False)
 
     _obj_cache: dict[int, Object] = field(init=False)
     _obj_read: dict[int, bool] = field(init=False)
 
-    def __post_init__(self) -> None:
-        self._assets = [UnityPy.load(asset_path) for asset_path in self.asset_paths]
+    def __post_init__(self, data: Optional[bytes]) -> None:
+        if data is not None:
+            self._assets = [UnityPy.load(data)]
+        else:
+            self._assets = [load_bundle(asset_path) for asset_path in self.asset_paths]
 
         self._obj_cache = {}
         for asset in self._assets:
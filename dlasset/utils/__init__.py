@@ -1,5 +1,13 @@
 """Various utility functions."""
-from .execution import concurrent_run, concurrent_run_no_return, time_exec
+from .crypto import decrypt_rijndael_cbc
+from .execution import (
+    RetryPolicy, concurrent_run, concurrent_run_iter, concurrent_run_no_return, time_exec, worker_pool,
+)
 from .export import export_json
 from .image import crop_image, merge_y_cb_cr_a
-from .net import http_get
+from .lock import file_lock
+from .misc import format_bytes
+from .net import (
+    HttpClientSettings, IncompleteDownloadError, configure_http_client, get_http_stats, http_download,
+)
+from .pool import BrokenWorkerError, TaskFuture, WorkerPool, WorkerStats, register_worker_stats
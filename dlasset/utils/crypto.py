@@ -0,0 +1,200 @@
+"""
+Pure-Python Rijndael decryption.
+
+AES only covers the 128-bit block size of Rijndael, so it can't be used for the 256-bit blocks of the manifest assets.
+
+CBC decryption of each block is independent of the decryption of the other blocks.
+Therefore, instead of decrypting the blocks one by one, the state bytes at the same position of every block are
+gathered into a byte stream, and each step of a round is applied to the whole streams at once by
+:meth:`bytes.translate` and the XOR of big integers. This keeps the per-byte work out of the interpreter loop.
+"""
+__all__ = ("decrypt_rijndael_cbc",)
+
+# key = block size in bytes; value = offsets of each row for ShiftRows
+_SHIFTS = {16: (0, 1, 2, 3), 24: (0, 1, 2, 3), 32: (0, 1, 3, 4)}
+
+# Coefficients of InvMixColumns, row ``r`` of the matrix is this rotated by ``r``
+_INV_MIX_COEFFICIENTS = (14, 11, 13, 9)
+
+
+def _mul(a: int, b: int) -> int:
+    """Multiply ``a`` and ``b`` in GF(2^8)."""
+    product = 0
+    while b:
+        if b & 1:
+            product ^= a
+        a = ((a << 1) ^ 0x11B) if a & 0x80 else (a << 1)
+        b >>= 1
+
+    return product
+
+
+def _rotate_byte(x: int, shift: int) -> int:
+    """Rotate the bits of byte ``x`` to the left by ``shift``."""
+    return ((x << shift) | (x >> (8 - shift))) & 0xFF
+
+
+def _make_sbox() -> bytes:
+    sbox = bytearray(256)
+    for x in range(256):
+        # Multiplicative inverse, 0 is mapped to 0
+        inv = next((y for y in range(1, 256) if _mul(x, y) == 1), 0)
+        # Affine transformation
+        sbox[x] = 0x63
+        for shift in range(5):
+            sbox[x] ^= _rotate_byte(inv, shift)
+
+    return bytes(sbox)
+
+
+_SBOX = _make_sbox()
+
+_INV_SBOX = bytes(_SBOX.index(x) for x in range(256))
+
+# Tables of InvSubBytes followed by the multiplication of InvMixColumns
+# ``_INV_MIX_TABLES[r][i]`` maps a byte of row ``i`` to its term in the output byte of row ``r``
+_INV_MIX_TABLES = tuple(
+    tuple(bytes(_mul(_INV_MIX_COEFFICIENTS[(i - r) % 4], _INV_SBOX[x]) for x in range(256)) for i in range(4))
+    for r in range(4)
+)
+
+
+def _expand_key(key: bytes, block_size: int) -> list[list[bytes]]:
+    """
+    Get the round keys of ``key`` for ``block_size``.
+
+    Each round key is a list of rows. Each row has a byte for each column of the state.
+    """
+    key_words = len(key) // 4
+    columns = block_size // 4
+    rounds = max(key_words, columns) + 6
+
+    words = [list(key[idx:idx + 4]) for idx in range(0, len(key), 4)]
+
+    rcon = 1
+    for idx in range(key_words, columns * (rounds + 1)):
+        temp = list(words[-1])
+
+        if idx % key_words == 0:
+            temp = [_SBOX[b] for b in temp[1:] + temp[:1]]
+            temp[0] ^= rcon
+            rcon = _mul(rcon, 2)
+        elif key_words > 6 and idx % key_words == 4:
+            temp = [_SBOX[b] for b in temp]
+
+        words.append([a ^ b for a, b in zip(words[idx - key_words], temp)])
+
+    return [
+        [bytes(words[round_ * columns + col][row] for col in range(columns)) for row in range(4)]
+        for round_ in range(rounds + 1)
+    ]
+
+
+def _inv_mix_column(column: list[int]) -> list[int]:
+    """Apply InvMixColumns to the bytes of a ``column``."""
+    mixed = []
+    for r in range(4):
+        mixed_byte = 0
+        for i in range(4):
+            mixed_byte ^= _mul(_INV_MIX_COEFFICIENTS[(i - r) % 4], column[i])
+
+        mixed.append(mixed_byte)
+
+    return mixed
+
+
+def _inv_mix_columns(round_key: list[bytes]) -> list[bytes]:
+    """Apply InvMixColumns to ``round_key``, so it can be used by the rounds of the equivalent inverse cipher."""
+    mixed_columns = [_inv_mix_column([row[col] for row in round_key]) for col in range(len(round_key[0]))]
+
+    return [bytes(column[r] for column in mixed_columns) for r in range(4)]
+
+
+def _xor(a: bytes, b: bytes) -> bytes:
+    return (int.from_bytes(a, "little") ^ int.from_bytes(b, "little")).to_bytes(len(a), "little")
+
+
+def _spread_row_key(row_key: bytes, block_count: int) -> bytes:
+    """Repeat each byte of ``row_key`` for each block, matching the layout of a row of the state."""
+    return b"".join(bytes((key_byte,)) * block_count for key_byte in row_key)
+
+
+def _inv_shift_row(row: bytes, shift: int, block_count: int) -> bytes:
+    """Shift the columns of ``row`` to the right by ``shift``."""
+    split = len(row) - shift * block_count
+
+    return row[split:] + row[:split]
+
+
+def _inv_round(state: list[bytes], round_key: list[bytes], shifts: tuple[int, ...], block_count: int) -> list[bytes]:
+    """
+    Apply a round of the equivalent inverse cipher to ``state``.
+
+    InvSubBytes and InvMixColumns of a round are a single lookup for each term of the output bytes.
+    """
+    shifted = [_inv_shift_row(state[row], shifts[row], block_count) for row in range(4)]
+
+    new_state = []
+    for row in range(4):
+        acc = int.from_bytes(_spread_row_key(round_key[row], block_count), "little")
+        for i in range(4):
+            acc ^= int.from_bytes(shifted[i].translate(_INV_MIX_TABLES[row][i]), "little")
+
+        new_state.append(acc.to_bytes(len(state[row]), "little"))
+
+    return new_state
+
+
+def _decrypt_blocks(data: bytes, round_keys: list[list[bytes]], block_size: int) -> bytes:
+    """Decrypt each block of ``data`` with ``round_keys``, without chaining the blocks."""
+    block_count = len(data) // block_size
+    columns = block_size // 4
+    shifts = _SHIFTS[block_size]
+    rounds = len(round_keys) - 1
+
+    # Row ``r`` of the state is the byte streams at row ``r`` of each column, concatenated in the column order
+    state = [
+        _xor(
+            b"".join(data[col * 4 + row::block_size] for col in range(columns)),
+            _spread_row_key(round_keys[rounds][row], block_count)
+        )
+        for row in range(4)
+    ]
+
+    for round_ in range(rounds - 1, 0, -1):
+        state = _inv_round(state, _inv_mix_columns(round_keys[round_]), shifts, block_count)
+
+    decrypted = bytearray(len(data))
+    for row in range(4):
+        state_row = _xor(
+            _inv_shift_row(state[row], shifts[row], block_count).translate(_INV_SBOX),
+            _spread_row_key(round_keys[0][row], block_count)
+        )
+
+        for col in range(columns):
+            decrypted[col * 4 + row::block_size] = state_row[col * block_count:(col + 1) * block_count]
+
+    return bytes(decrypted)
+
+
+def decrypt_rijndael_cbc(data: bytes, key: bytes, iv: bytes) -> bytes:
+    """
+    Decrypt ``data`` encrypted by Rijndael in CBC mode without padding.
+
+    The block size is the length of ``iv``, which can be 16, 24 or 32 bytes.
+    ``key`` can be 16, 24 or 32 bytes long.
+
+    Raises :class:`ValueError` if any of the lengths is invalid.
+    """
+    block_size = len(iv)
+    if block_size not in _SHIFTS:
+        raise ValueError(f"Invalid IV length: {block_size}")
+    if len(key) not in (16, 24, 32):
+        raise ValueError(f"Invalid key length: {len(key)}")
+    if len(data) % block_size:
+        raise ValueError(f"Data length {len(data)} is not a multiple of the block size {block_size}")
+    if not data:
+        return b""
+
+    # CBC: each decrypted block is XOR-ed with the previous encrypted block
+    return _xor(_decrypt_blocks(data, _expand_key(key, block_size), block_size), iv + data[:-block_size])
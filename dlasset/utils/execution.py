@@ -1,28 +1,254 @@
 """Utility functions related to execution."""
+import heapq
+import itertools
 import sys
 import time
-from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import FIRST_COMPLETED, wait
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from functools import wraps
-from typing import Any, Callable, Hashable, Optional, Sequence, TypeVar, Union
+from typing import Any, Callable, Generator, Hashable, Iterable, Iterator, Optional, Sequence, TypeVar, Union
 
 from dlasset.log import init_log, log
-from .misc import split_chunks
+from .pool import TaskFuture, WorkerPool
 
-__all__ = ("concurrent_run", "concurrent_run_no_return", "time_exec")
+__all__ = (
+    "RetryPolicy", "concurrent_run", "concurrent_run_iter", "concurrent_run_no_return", "time_exec", "worker_pool"
+)
 
 K = TypeVar("K", bound=Union[Hashable, None])
 R = TypeVar("R")
 
 
-def on_concurrency_start(log_dir: str) -> None:
+_WORKER_POOL: Optional[WorkerPool] = None
+
+
+def on_concurrency_start(
+        log_dir: str, initializer: Optional[Callable[..., None]] = None, initargs: Sequence[Any] = ()
+) -> None:
     """Function to call on each concurrency start."""
+    global _WORKER_POOL  # pylint: disable=global-statement
+    # Forked workers inherit the pool of the parent, which is not usable in the worker
+    _WORKER_POOL = None
+
     # Each process has a brand new logging factory
     init_log(log_dir)
 
+    if initializer:
+        initializer(*initargs)
+
+
+@contextmanager
+def worker_pool(
+        log_dir: str, *,
+        max_workers: Optional[int] = None,
+        max_tasks_per_worker: Optional[int] = None,
+        memory_budget: Optional[int] = None,
+        memory_floor: Optional[int] = None,
+        initializer: Optional[Callable[..., None]] = None,
+        initargs: Sequence[Any] = (),
+) -> Generator[WorkerPool, None, None]:
+    """
+    Start a worker pool shared by every :func:`concurrent_run` call inside the ``with`` block.
+
+    Workers are recycled after processing ``max_tasks_per_worker`` tasks
+    or once its memory usage exceeds ``memory_budget`` bytes.
+    New tasks are held while the available memory is below ``memory_floor`` bytes.
+
+    ``initializer`` is called with ``initargs`` once in each worker on start,
+    so the data shared by all tasks is sent to a worker once instead of with every task.
+    """
+    # pylint: disable=too-many-arguments
+    global _WORKER_POOL  # pylint: disable=global-statement
+    if _WORKER_POOL:
+        raise RuntimeError("Worker pool has already started")
+
+    pool = WorkerPool(
+        max_workers, initializer=on_concurrency_start, initargs=(log_dir, initializer, initargs),
+        max_tasks_per_worker=max_tasks_per_worker, memory_budget=memory_budget, memory_floor=memory_floor
+    )
+    _WORKER_POOL = pool
+
+    try:
+        yield pool
+    except BaseException:
+        pool.shutdown(cancel_pending=True)
+        raise
+    else:
+        pool.shutdown()
+    finally:
+        _WORKER_POOL = None
+        pool.log_stats()
+
+
+@dataclass
+class RetryPolicy:
+    """Policy of retrying the failed concurrent tasks."""
+
+    max_retries: int = 0
+    backoff: float = 1  # Seconds to wait before the 1st retry, doubled on each subsequent retry
+
+    def get_delay(self, attempt: int) -> float:
+        """Get the seconds to wait before the retry after ``attempt``-th failed attempt (0-based)."""
+        return self.backoff * 2 ** attempt
+
+
+@dataclass
+class _InFlightTasks:
+    """Tasks submitted to a pool but not yet yielded, including the failed tasks waiting for retry."""
+
+    pool: WorkerPool
+    fn: Callable[..., Any]
+    affinity_of_call: Optional[Callable[..., Hashable]]
+    retry: RetryPolicy
+
+    # key = future; value = (args, attempt)
+    _futures: dict[TaskFuture, tuple[Sequence[Any], int]] = field(init=False, default_factory=dict)
+    # Heap of (time to retry, sequence, args, attempt)
+    _retries: list[tuple[float, int, Sequence[Any], int]] = field(init=False, default_factory=list)
+    _retry_seq: Iterator[int] = field(init=False, default_factory=itertools.count)
+
+    def __len__(self) -> int:
+        return len(self._futures) + len(self._retries)
+
+    def submit(self, args: Sequence[Any], attempt: int = 0) -> None:
+        """Submit a task with ``args``."""
+        affinity = self.affinity_of_call(*args) if self.affinity_of_call else None
+        self._futures[self.pool.submit(self.fn, *args, affinity=affinity)] = (args, attempt)
+
+    def retry_later(self, args: Sequence[Any], attempt: int) -> bool:
+        """Schedule a retry for the task with ``args`` failed at ``attempt``. Returns ``False`` if not retrying."""
+        if attempt >= self.retry.max_retries:
+            return False
+
+        heapq.heappush(
+            self._retries,
+            (time.monotonic() + self.retry.get_delay(attempt), next(self._retry_seq), args, attempt + 1)
+        )
+        return True
+
+    def wait_completed(self) -> list[tuple[TaskFuture, Sequence[Any], int]]:
+        """Wait until any task completes, then return the completed tasks with their args and attempt."""
+        while self._retries and self._retries[0][0] <= time.monotonic():
+            _, _, args, attempt = heapq.heappop(self._retries)
+            self.submit(args, attempt)
+
+        timeout = max(self._retries[0][0] - time.monotonic(), 0) if self._retries else None
+
+        if self._futures:
+            wait(self._futures, timeout=timeout, return_when=FIRST_COMPLETED)
+        elif timeout:
+            time.sleep(timeout)
+
+        completed = [future for future in self._futures if future.done()]
+
+        return [(future, *self._futures.pop(future)) for future in completed]
+
+    def cancel(self) -> None:
+        """Cancel all tasks not yet started."""
+        for future in self._futures:
+            future.cancel()
+
+        self._retries.clear()
+
+
+def _exit_on_errors(exceptions: list[BaseException], task_count: int) -> None:
+    """Log the summary and exit the program if there are any ``exceptions``."""
+    if not (error_count := len(exceptions)):
+        return
+
+    log("ERROR", f"{error_count} of {task_count} concurrent tasks have error.")
+    log("ERROR", "-" * 20)
+    for exception in exceptions:
+        log("ERROR", f"{exception.__class__.__name__}: {exception}")
+    sys.exit(1)
+
+
+def concurrent_run_iter(
+        fn: Callable[..., R],  # type: ignore
+        args_list: Iterable[Sequence[Any]],
+        log_dir: str, *,
+        key_of_call: Callable[..., K],  # type: ignore
+        max_workers: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        on_timing: Optional[Callable[[K, float], None]] = None,
+        affinity_of_call: Optional[Callable[..., Hashable]] = None,
+        retry: Optional[RetryPolicy] = None,
+        on_error: Optional[Callable[[K, BaseException], None]] = None,
+) -> Generator[tuple[K, R], None, None]:
+    """
+    Run ``fn`` concurrently with different set of ``args`` and yield the results as they complete.
+
+    Yields a ``tuple`` of the key obtained from ``key_of_call`` and the result.
+    The order of the yielded results is not guaranteed.
+
+    At most ``max_in_flight`` tasks are submitted but not yet yielded at the same time.
+    ``args_list`` is consumed lazily, so it can be a generator.
+    Defaults to 4 times of the worker count.
+
+    Uses the pool started by :func:`worker_pool` if any, otherwise a pool is started for this call only.
+    ``max_workers`` is ignored if the shared pool is used.
+
+    If ``affinity_of_call`` is given, tasks having the same affinity key obtained from it
+    are preferably run on the same worker. Check :class:`WorkerPool` for details.
+
+    If ``on_timing`` is given, it is called with the key and the seconds spent in the worker of each successful task.
+
+    Failed tasks are retried according to ``retry``. Errors are logged as soon as they occur.
+    If a task still fails after all retries, ``on_error`` is called with its key and the exception if given.
+    Otherwise, exits the program after all tasks are completed.
+    """
+    # pylint: disable=too-many-arguments,too-many-locals
+    pool = _WORKER_POOL or WorkerPool(max_workers, initializer=on_concurrency_start, initargs=(log_dir,))
+    max_in_flight = max_in_flight or pool.max_workers * 4
+    retry = retry or RetryPolicy()
+
+    args_iter = iter(args_list)
+    tasks = _InFlightTasks(pool=pool, fn=fn, affinity_of_call=affinity_of_call, retry=retry)
+    exceptions: list[BaseException] = []
+    task_count = 0
+
+    try:
+        while True:
+            for args in itertools.islice(args_iter, max_in_flight - len(tasks)):
+                tasks.submit(args)
+                task_count += 1
+
+            if not tasks:
+                break
+
+            for future, args, attempt in tasks.wait_completed():
+                if not (exception := future.exception()):
+                    key = key_of_call(*args)
+                    if on_timing and future.duration is not None:
+                        on_timing(key, future.duration)
+
+                    yield key, future.result()
+                elif tasks.retry_later(args, attempt):
+                    log(
+                        "WARNING",
+                        f"Task failed ({exception.__class__.__name__}: {exception}), "
+                        f"retrying in {retry.get_delay(attempt):.1f} secs ({attempt + 1} / {retry.max_retries})"
+                    )
+                else:
+                    log("ERROR", exception, exc_info=exception)
+                    if on_error:
+                        on_error(key_of_call(*args), exception)
+                    else:
+                        exceptions.append(exception)
+    finally:
+        # Only happens if the caller stops consuming the results
+        tasks.cancel()
+
+        if pool is not _WORKER_POOL:
+            pool.shutdown(cancel_pending=True)
+
+    _exit_on_errors(exceptions, task_count)
+
 
 def concurrent_run(
         fn: Callable[..., R],  # type: ignore
-        args_list: Sequence[Sequence[Any]],
+        args_list: Iterable[Sequence[Any]],
         log_dir: str, *,
         key_of_call: Callable[..., K],  # type: ignore
         max_workers: Optional[int] = None,
@@ -31,59 +257,21 @@ def concurrent_run(
     """
     Run ``fn`` concurrently with different set of ``args``.
 
-    If ``key_of_call`` is not ``None``, a ``dict`` where
-    key is obtained from ``key_of_call`` and the value as the result will be returned.
+    Returns a ``dict`` where key is obtained from ``key_of_call`` and the value as the result.
 
-    Lowering ``task_batch_size`` reduces peak memory usage, but also reduces concurrency utilization.
+    ``task_batch_size`` is the maximum count of the tasks in flight.
+    Check :func:`concurrent_run_iter` for the details.
     """
-    # Most of the local variables comes from the function arguments
-    # pylint: disable=too-many-locals
-    results: dict[K, R] = {}
-
-    def on_done(
-            key_of_call: Callable[..., K],  # type: ignore
-            args: Sequence[Any]
-    ) -> Callable[[Future], None]:
-        def inner(future: Future) -> None:
-            try:
-                results[key_of_call(*args)] = future.result()
-            except Exception as ex:
-                log("ERROR", ex, exc_info=True)
-                raise ex
-
-        return inner
-
-    # Memory in an executor will only release after the executor has shutdown (exiting the `with` statement)
-    # Therefore splitting args list (tasks) into chunks
-    for args_chunk in split_chunks(args_list, task_batch_size or 1000):
-        with ProcessPoolExecutor(
-                max_workers=max_workers,
-                initargs=(log_dir,),
-                initializer=on_concurrency_start
-        ) as executor:
-            futures: list[Future] = []
-            for args in args_chunk:
-                future = executor.submit(fn, *args)
-
-                if key_of_call:
-                    future.add_done_callback(on_done(key_of_call, args))
-
-                futures.append(future)
-
-        exceptions = [future.exception() for future in futures if future.exception()]
-        if error_count := len(exceptions):
-            log("ERROR", f"{error_count} of {len(futures)} concurrent tasks have error.")
-            log("ERROR", "-" * 20)
-            for exception in exceptions:
-                log("ERROR", f"{exception.__class__.__name__}: {exception}")
-            sys.exit(1)
-
-    return results
+    # pylint: disable=too-many-arguments
+    return dict(concurrent_run_iter(
+        fn, args_list, log_dir,
+        key_of_call=key_of_call, max_workers=max_workers, max_in_flight=task_batch_size
+    ))
 
 
 def concurrent_run_no_return(
         fn: Callable[..., R],
-        args_list: Sequence[Sequence[Any]],
+        args_list: Iterable[Sequence[Any]],
         log_dir: str, *,
         max_workers: Optional[int] = None,
         task_batch_size: Optional[int] = None,
@@ -0,0 +1,146 @@
+"""Lock shared across the processes using a lock file."""
+import os
+import socket
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Generator, Optional
+
+import psutil
+
+from dlasset.log import log
+
+__all__ = ("file_lock",)
+
+
+def _read_lock(lock_path: str) -> Optional[str]:
+    """Get the token of the holder of the lock at ``lock_path``. Returns ``None`` if the lock is released."""
+    try:
+        with open(lock_path, "r", encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _make_token() -> str:
+    """Make a token identifying the holder of a lock, which is unique across the hosts sharing the lock."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex}"
+
+
+def _is_holder_dead(token: str) -> bool:
+    """
+    Check if the holder process of the lock held with ``token`` no longer exists.
+
+    Only the holders on the current host can be checked.
+    This is always ``False`` for the holders on the other hosts, such as the ones sharing a network file system.
+    """
+    # Empty if the holder hasn't written its token yet
+    if token.count(":") != 2:
+        return False
+
+    host, pid, _ = token.split(":")
+
+    return host == socket.gethostname() and not psutil.pid_exists(int(pid))
+
+
+def _is_lock_stale(lock_path: str, token: str, stale_after: float) -> bool:
+    """
+    Check if the lock at ``lock_path`` held with ``token`` is stale.
+
+    A lock is stale if its holder process on the current host no longer exists,
+    or it is not refreshed for ``stale_after`` seconds.
+    """
+    try:
+        return time.time() - os.path.getmtime(lock_path) > stale_after or _is_holder_dead(token)
+    except FileNotFoundError:
+        # Lock released
+        return False
+
+
+def _break_stale_lock(lock_path: str, token: str) -> None:
+    """
+    Remove the stale lock at ``lock_path`` held with ``token``.
+
+    The lock is renamed to a unique path first, so only one of the processes breaking the same lock succeeds.
+    If the renamed lock is not the stale one, because it was broken and acquired again in the meantime,
+    it is put back.
+    """
+    broken_path = f"{lock_path}.{uuid.uuid4().hex}.stale"
+
+    try:
+        os.rename(lock_path, broken_path)
+    except FileNotFoundError:
+        # Broken by another process, or released
+        return
+
+    if _read_lock(broken_path) != token:
+        try:
+            # Unlike renaming, linking fails instead of replacing the lock if it is acquired again in the meantime
+            os.link(broken_path, lock_path)
+        except FileExistsError:
+            log("WARNING", f"Lock at {lock_path} was taken over by multiple processes")
+
+    os.remove(broken_path)
+
+
+def _refresh_lock(lock_path: str, token: str, interval: float, released: threading.Event) -> None:
+    """Refresh the modification time of the lock at ``lock_path`` every ``interval`` seconds until ``released``."""
+    while not released.wait(interval):
+        if _read_lock(lock_path) != token:
+            log("WARNING", f"Lock at {lock_path} is no longer held by this holder")
+            return
+
+        try:
+            os.utime(lock_path)
+        except FileNotFoundError:
+            return
+
+
+@contextmanager
+def file_lock(lock_path: str, *, poll_interval: float = 0.1, stale_after: float = 60) -> Generator[bool, None, None]:
+    """
+    Hold the lock at ``lock_path`` in the ``with`` block. The lock is exclusive across the processes and threads.
+
+    Yields ``True`` if the lock is acquired without waiting, or ``False`` if waited for another holder to release it.
+
+    The lock is refreshed in a background thread while held.
+    A lock is considered stale and taken over if its holder process on the current host no longer exists,
+    or it is not refreshed for ``stale_after`` seconds.
+    """
+    waited = False
+    token = _make_token()
+
+    while True:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            waited = True
+
+            holder_token = _read_lock(lock_path)
+            if holder_token is not None and _is_lock_stale(lock_path, holder_token, stale_after):
+                _break_stale_lock(lock_path, holder_token)
+                continue
+
+            time.sleep(poll_interval)
+            continue
+
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(token)
+        break
+
+    released = threading.Event()
+    refresher = threading.Thread(
+        target=_refresh_lock, args=(lock_path, token, stale_after / 4, released), name="LockRefresh", daemon=True
+    )
+    refresher.start()
+
+    try:
+        yield not waited
+    finally:
+        released.set()
+        refresher.join()
+
+        # Only remove the lock if it is still held by this holder
+        if _read_lock(lock_path) == token:
+            os.remove(lock_path)
@@ -1,10 +1,14 @@
 """Miscellaneous utility functions."""
-from typing import Any, Generator, Sequence
 
-__all__ = ("split_chunks",)
+__all__ = ("format_bytes",)
 
 
-def split_chunks(seq: Sequence[Any], size: int) -> Generator[Sequence[Any], None, None]:
-    """Yields items in ``seq`` in chunks of ``size``."""
-    for i in range(0, len(seq), size):
-        yield seq[i:i + size]
+def format_bytes(size: float) -> str:
+    """Format ``size`` in bytes to a human-readable string."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}"
+
+        size /= 1024
+
+    return f"{size:.1f} TB"
@@ -1,12 +1,230 @@
 """Utility functions for handling HTTP requests."""
-from requests import Response, Session
+import itertools
+import os
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+from requests import ConnectionError, Response, Session  # pylint: disable=redefined-builtin
 from requests.adapters import HTTPAdapter
+from requests.exceptions import ChunkedEncodingError
+from urllib3.util.retry import Retry
+
+from dlasset.log import log
+from .pool import WorkerStats, register_worker_stats
+
+__all__ = (
+    "HttpClientSettings", "IncompleteDownloadError",
+    "configure_http_client", "get_http_stats", "http_download",
+)
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
+class IncompleteDownloadError(IOError):
+    """Raised if the size of the downloaded content doesn't match the expected size."""
+
+
+@dataclass
+class HttpClientSettings:
+    """Settings of the HTTP client."""
+
+    pool_size: int = 10  # Maximum count of the connections kept alive for a host
+    connect_timeout: float = 10
+    read_timeout: float = 60
+    max_retries: int = 5
+    backoff: float = 0.5  # Seconds to wait before the 2nd retry, doubled on each subsequent retry
+
+
+_SETTINGS = HttpClientSettings()
+
+_SESSION: Optional[Session] = None
+
+_SESSION_LOCK = threading.Lock()
+
+_RESUMED_COUNT = 0
+
+
+def configure_http_client(settings: HttpClientSettings) -> None:
+    """Use ``settings`` for the HTTP client of the current process."""
+    global _SETTINGS, _SESSION  # pylint: disable=global-statement
+    _SETTINGS = settings
+    # Recreate the session on the next request to apply the settings
+    _SESSION = None
+
+
+def _get_session() -> Session:
+    """
+    Get the HTTP session of the current process.
+
+    The session keeps its connections alive, so the requests to the same host reuse the connections.
+    """
+    global _SESSION  # pylint: disable=global-statement
+    with _SESSION_LOCK:
+        if _SESSION:
+            return _SESSION
+
+        retry = Retry(
+            total=_SETTINGS.max_retries,
+            backoff_factor=_SETTINGS.backoff,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+            respect_retry_after_header=True,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=_SETTINGS.pool_size, pool_maxsize=_SETTINGS.pool_size, max_retries=retry
+        )
+
+        session = Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        _SESSION = session
+
+        return session
+
+
+def _reset_after_fork() -> None:
+    """
+    Reset the HTTP client state inherited by a forked process.
+
+    The connections can't be shared across processes, and the lock could be held by a thread of the parent,
+    which doesn't exist in the forked process.
+    """
+    global _SESSION, _SESSION_LOCK, _RESUMED_COUNT  # pylint: disable=global-statement
+    _SESSION = None
+    _SESSION_LOCK = threading.Lock()
+    # Forked process starts counting from zero
+    _RESUMED_COUNT = 0
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _count_resumed() -> None:
+    global _RESUMED_COUNT  # pylint: disable=global-statement
+    with _SESSION_LOCK:
+        _RESUMED_COUNT += 1
+
+
+def get_http_stats() -> WorkerStats:
+    """
+    Get the statistics of the HTTP client of the current process.
+
+    This includes the count of the requests sent, the connections opened,
+    the requests sent over a reused connection, and the downloads resumed from a partial file.
+    """
+    if not _SESSION:
+        return {"requests": 0, "connections": 0, "reused": 0, "resumed": 0}
+
+    requests = 0
+    connections = 0
+    # The same adapter is mounted for both HTTP and HTTPS
+    for adapter in set(_SESSION.adapters.values()):
+        pools = adapter.poolmanager.pools  # type: ignore
+        for key in pools.keys():
+            pool = pools[key]
+            requests += pool.num_requests
+            connections += pool.num_connections
+
+    return {
+        "requests": requests, "connections": connections, "reused": requests - connections, "resumed": _RESUMED_COUNT
+    }
+
+
+register_worker_stats("HTTP", get_http_stats)
+
+
+def _get_range_start(response: Response) -> Optional[int]:
+    """Get the start of the range in ``Content-Range`` of ``response``. Returns ``None`` if not available."""
+    # Format: bytes <start>-<end>/<total>
+    content_range = response.headers.get("Content-Range", "")
+    if not content_range.startswith("bytes ") or "-" not in content_range:
+        return None
+
+    try:
+        return int(content_range[len("bytes "):].split("-", 1)[0])
+    except ValueError:
+        return None
+
+
+def _download_part(url: str, part_path: str) -> bool:
+    """
+    Download the content on ``url`` to ``part_path``.
+
+    If ``part_path`` contains partial content, the download resumes from its end if the server supports it,
+    otherwise the content is downloaded from the start.
+
+    Returns ``True`` if the download is resumed.
+    """
+    offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+
+    # Content must not be encoded, so the offset is the same as the content on the server
+    headers = {"Accept-Encoding": "identity"}
+    if offset:
+        headers["Range"] = f"bytes={offset}-"
+
+    with _get_session().get(
+            url, headers=headers, timeout=(_SETTINGS.connect_timeout, _SETTINGS.read_timeout), stream=True
+    ) as response:
+        if offset and response.status_code == 416:
+            # Range not satisfiable, the partial content is invalid
+            os.remove(part_path)
+            return _download_part(url, part_path)
+
+        if offset and response.status_code == 206 and _get_range_start(response) != offset:
+            # Content not starting at the end of the partial content can't be appended to it
+            os.remove(part_path)
+            return _download_part(url, part_path)
+
+        response.raise_for_status()
+
+        resumed = bool(offset) and response.status_code == 206
+
+        with open(part_path, "ab" if resumed else "wb") as f:
+            for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
+
+    return resumed
+
+
+def http_download(url: str, file_path: str, *, expected_size: Optional[int] = None) -> int:
+    """
+    Download the content on ``url`` to ``file_path`` and return the size of the content in bytes.
+
+    The content is streamed to a partial file in chunks, then moved to ``file_path`` atomically once completed,
+    so ``file_path`` never contains partial content.
+
+    If the connection drops in the middle, the download resumes from the end of the partial file
+    using ``Range`` requests, or restarts if the server doesn't support it.
+    The partial file is kept if the download still fails, so the next download of ``file_path`` resumes it.
+    Therefore, the downloads to the same ``file_path`` must not run at the same time.
+
+    Raises :class:`IncompleteDownloadError` if the size of the content doesn't match ``expected_size``.
+    """
+    part_path = f"{file_path}.part"
+
+    for attempt in itertools.count():
+        try:
+            if _download_part(url, part_path):
+                _count_resumed()
+        except (ConnectionError, ChunkedEncodingError) as ex:
+            if attempt >= _SETTINGS.max_retries:
+                raise
+
+            log("WARNING", f"Download of {url} interrupted ({ex.__class__.__name__}), resuming...")
+            continue
+
+        size = os.path.getsize(part_path)
+        if expected_size is None or size == expected_size:
+            break
+
+        if size > expected_size or attempt >= _SETTINGS.max_retries:
+            os.remove(part_path)
+            raise IncompleteDownloadError(f"Downloaded {size} bytes from {url}, expected {expected_size} bytes")
 
-__all__ = ("http_get",)
+        log("WARNING", f"Download of {url} ended early ({size} / {expected_size} bytes), resuming...")
 
+    os.replace(part_path, file_path)
 
-def http_get(url: str) -> Response:
-    """Get the content on ``url``."""
-    session = Session()
-    session.mount(url, HTTPAdapter(max_retries=5))
-    return session.get(url)
+    return size
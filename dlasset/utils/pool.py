@@ -0,0 +1,571 @@
+"""Long-lived worker process pool."""
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from multiprocessing.connection import Connection, wait
+from multiprocessing.process import BaseProcess
+from typing import Any, Callable, Hashable, Optional
+
+import psutil
+
+from dlasset.log import log
+from .misc import format_bytes
+
+__all__ = ("WorkerPool", "WorkerStats", "TaskFuture", "BrokenWorkerError", "register_worker_stats")
+
+WorkerStats = dict[str, int]
+
+_WORKER_STATS_PROVIDERS: dict[str, Callable[[], WorkerStats]] = {}
+
+
+def register_worker_stats(name: str, provider: Callable[[], WorkerStats]) -> None:
+    """
+    Register ``provider`` of the statistics named ``name`` of a worker.
+
+    The statistics are reported to the pool after each task,
+    and the last reported statistics of each worker are logged in :meth:`WorkerPool.log_stats`.
+
+    This should be called on module import, so it's registered in the workers regardless of the start method.
+    """
+    _WORKER_STATS_PROVIDERS[name] = provider
+
+
+class BrokenWorkerError(RuntimeError):
+    """Raised on the future of a task if its worker died unexpectedly while running it."""
+
+
+class TaskFuture(Future):
+    """Future of a task submitted to :class:`WorkerPool`."""
+
+    def __init__(self) -> None:
+        super().__init__()
+
+        self.duration: Optional[float] = None  # Seconds spent by the worker on the task
+        self.worker_id: Optional[int] = None
+
+
+class _RemoteTraceback(Exception):
+    """Carries the formatted traceback of an exception raised in a worker."""
+
+    def __init__(self, tb: str) -> None:
+        super().__init__(tb)
+        self.tb = tb
+
+    def __str__(self) -> str:
+        return self.tb
+
+
+@dataclass
+class _TaskMessage:
+    """Message sent from the pool to a worker to run a task."""
+
+    task_id: int
+    fn: Callable[..., Any]
+    args: tuple[Any, ...]
+
+
+@dataclass
+class _DoneMessage:
+    """Message sent from a worker to the pool once a task is done."""
+
+    task_id: int
+    result: Any = None
+    exception: Optional[BaseException] = None
+    traceback: str = ""
+    duration: float = 0
+    retire_reason: Optional[str] = None
+    stats: dict[str, WorkerStats] = field(default_factory=dict)
+
+
+@dataclass
+class _WorkItem:
+    """A submitted task waiting in the pool."""
+
+    task_id: int
+    fn: Callable[..., Any]
+    args: tuple[Any, ...]
+    future: TaskFuture
+    affinity: Optional[Hashable]
+
+
+@dataclass
+class _WorkerSummary:
+    """Summary of a worker."""
+
+    tasks_done: int = 0
+    peak_rss: int = 0
+    stats: dict[str, WorkerStats] = field(default_factory=dict)
+
+
+@dataclass
+class _WorkerHandle:
+    """Parent-side handle of a single worker process."""
+
+    worker_id: int
+    process: BaseProcess
+    task_conn: Connection
+    result_conn: Connection
+    ps: psutil.Process
+
+    current: Optional[_WorkItem] = None
+    retiring: bool = False
+    stop_sent: bool = False
+
+    summary: _WorkerSummary = field(default_factory=_WorkerSummary)
+
+
+@dataclass
+class _PoolStats:
+    """Statistics of a worker pool."""
+
+    spawned: int = 0
+    tasks_done: int = 0
+    recycled: dict[str, int] = field(default_factory=dict)
+    died: int = 0
+    affinity_hits: int = 0
+    affinity_steals: int = 0
+
+    # Summary of every worker that ever existed
+    workers: dict[int, _WorkerSummary] = field(default_factory=dict)
+
+
+def _worker_main(
+        task_conn: Connection, result_conn: Connection,
+        initializer: Optional[Callable[..., None]], initargs: tuple[Any, ...],
+        max_tasks: Optional[int]
+) -> None:
+    """Main loop of a worker process."""
+    if initializer:
+        initializer(*initargs)
+
+    tasks_done = 0
+
+    while message := task_conn.recv():
+        start = time.perf_counter()
+        try:
+            done = _DoneMessage(task_id=message.task_id, result=message.fn(*message.args))
+        except Exception as ex:  # pylint: disable=broad-except
+            done = _DoneMessage(task_id=message.task_id, exception=ex, traceback=traceback.format_exc())
+        done.duration = time.perf_counter() - start
+        done.stats = {name: provider() for name, provider in _WORKER_STATS_PROVIDERS.items()}
+
+        tasks_done += 1
+        if max_tasks and tasks_done >= max_tasks:
+            done.retire_reason = "task count"
+
+        try:
+            result_conn.send(done)
+        except Exception as ex:  # pylint: disable=broad-except
+            # Result is not picklable, report the error instead
+            result_conn.send(_DoneMessage(
+                task_id=message.task_id, exception=RuntimeError(f"Failed to send the task result: {ex}"),
+                traceback=traceback.format_exc(), duration=done.duration, retire_reason=done.retire_reason
+            ))
+
+        if done.retire_reason:
+            break
+
+
+class WorkerPool:
+    """
+    Long-lived process pool which recycles its workers individually.
+
+    A worker retires after it has processed ``max_tasks_per_worker`` tasks,
+    or after its current task once its RSS exceeds ``memory_budget`` bytes.
+    A replacement is spawned right away,
+    so the memory a worker accumulated is released without tearing down the whole pool.
+
+    The RSS of each worker is sampled every ``sample_interval`` seconds.
+    If the available memory of the machine is below ``memory_floor`` bytes,
+    new tasks are not dispatched until it recovers, unless no task is running.
+
+    ``initializer`` is called with ``initargs`` once in every worker when it starts.
+
+    Tasks submitted with the same ``affinity`` key are preferably routed to the same worker,
+    so the resources cached in a worker for a key can be reused.
+    A task is still dispatched to another idle worker if there's no other task for it,
+    so routing never leaves a worker idle.
+    """
+
+    def __init__(
+            self, max_workers: Optional[int] = None, *,
+            initializer: Optional[Callable[..., None]] = None, initargs: tuple[Any, ...] = (),
+            max_tasks_per_worker: Optional[int] = None, memory_budget: Optional[int] = None,
+            memory_floor: Optional[int] = None, sample_interval: float = 0.5,
+    ) -> None:
+        # pylint: disable=too-many-arguments
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._initializer = initializer
+        self._initargs = initargs
+        self._max_tasks_per_worker = max_tasks_per_worker
+        self._memory_budget = memory_budget
+        self._memory_floor = memory_floor
+        self._sample_interval = sample_interval
+
+        self._ctx = multiprocessing.get_context()
+        self._lock = threading.RLock()
+        self._task_ids = itertools.count()
+        self._worker_ids = itertools.count()
+
+        self._pending: deque[_WorkItem] = deque()
+        self._workers: dict[int, _WorkerHandle] = {}
+        self._affinity: dict[Hashable, int] = {}  # key = affinity key; value = worker ID
+        self._stats = _PoolStats()
+        self._shutdown = False
+        self._throttled = False
+
+        with self._lock:
+            for _ in range(self._max_workers):
+                self._spawn_worker()
+
+        self._collector = threading.Thread(target=self._collect_loop, name="worker-pool-collector", daemon=True)
+        self._collector.start()
+
+        self._supervisor_stop = threading.Event()
+        self._supervisor = threading.Thread(
+            target=self._supervise_loop, name="worker-pool-supervisor", daemon=True
+        )
+        self._supervisor.start()
+
+    @property
+    def max_workers(self) -> int:
+        """Number of the worker processes in this pool."""
+        return self._max_workers
+
+    def _spawn_worker(self) -> None:
+        task_conn_recv, task_conn_send = self._ctx.Pipe(duplex=False)
+        result_conn_recv, result_conn_send = self._ctx.Pipe(duplex=False)
+
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(
+                task_conn_recv, result_conn_send, self._initializer, self._initargs, self._max_tasks_per_worker
+            ),
+            daemon=True,
+        )
+        process.start()
+
+        # Parent doesn't use these ends
+        task_conn_recv.close()
+        result_conn_send.close()
+
+        worker_id = next(self._worker_ids)
+        handle = _WorkerHandle(
+            worker_id=worker_id, process=process, task_conn=task_conn_send, result_conn=result_conn_recv,
+            ps=psutil.Process(process.pid)
+        )
+        self._workers[worker_id] = handle
+        self._stats.workers[worker_id] = handle.summary
+        self._stats.spawned += 1
+
+    def _remove_worker(self, handle: _WorkerHandle) -> None:
+        handle.process.join()
+        handle.task_conn.close()
+        handle.result_conn.close()
+        del self._workers[handle.worker_id]
+
+        # Anything cached by the worker is gone
+        self._affinity = {key: worker_id for key, worker_id in self._affinity.items() if worker_id != handle.worker_id}
+
+    def _pop_pending_for(self, handle: _WorkerHandle) -> _WorkItem:
+        """
+        Pop the pending item to dispatch to the worker of ``handle``.
+
+        The items are checked in the order of submission. Picks the first item matching the condition below, in order:
+
+        - Having affinity to the worker.
+        - Having no affinity or its affinity is not bound to any worker yet. The affinity will be bound to the worker.
+        - Any item, which is stolen from the worker its affinity is bound to.
+        """
+        pick_idx = None
+        for idx, item in enumerate(self._pending):
+            if item.affinity is None:
+                if pick_idx is None:
+                    pick_idx = idx
+                continue
+
+            bound_worker = self._affinity.get(item.affinity)
+            if bound_worker == handle.worker_id:
+                self._stats.affinity_hits += 1
+                pick_idx = idx
+                break
+
+            if bound_worker is None and pick_idx is None:
+                pick_idx = idx
+
+        if pick_idx is None:
+            self._stats.affinity_steals += 1
+            pick_idx = 0
+
+        item = self._pending[pick_idx]
+        del self._pending[pick_idx]
+
+        if item.affinity is not None:
+            self._affinity.setdefault(item.affinity, handle.worker_id)
+
+        return item
+
+    def _stop_worker(self, handle: _WorkerHandle) -> None:
+        """Tell the worker of ``handle`` to exit. The worker exits after its current task."""
+        handle.retiring = True
+
+        if handle.stop_sent:
+            return
+
+        try:
+            handle.task_conn.send(None)
+        except OSError:
+            pass  # Worker is already exiting
+
+        handle.stop_sent = True
+
+    def _sample_memory(self) -> None:
+        with self._lock:
+            for handle in self._workers.values():
+                try:
+                    rss = handle.ps.memory_info().rss
+                except psutil.Error:
+                    continue  # Worker exited
+
+                handle.summary.peak_rss = max(handle.summary.peak_rss, rss)
+
+                if not self._memory_budget or rss <= self._memory_budget or handle.retiring:
+                    continue
+
+                log(
+                    "INFO",
+                    f"Worker #{handle.worker_id} uses {format_bytes(rss)}, "
+                    f"which exceeds the memory budget of {format_bytes(self._memory_budget)}. Recycling..."
+                )
+                self._stats.recycled["memory"] = self._stats.recycled.get("memory", 0) + 1
+                handle.retiring = True
+
+                if not handle.current:
+                    self._stop_worker(handle)
+
+    def _supervise_loop(self) -> None:
+        while not self._supervisor_stop.wait(self._sample_interval):
+            self._sample_memory()
+            self._dispatch()
+
+    def _is_memory_low(self) -> bool:
+        """Check if the new tasks should be held because the available memory is below the floor."""
+        if not self._memory_floor or not any(handle.current for handle in self._workers.values()):
+            return False
+
+        available = psutil.virtual_memory().available
+        throttled = available < self._memory_floor
+
+        if throttled != self._throttled:
+            if throttled:
+                log("WARNING", f"Available memory ({format_bytes(available)}) is low, holding new tasks...")
+            else:
+                log("INFO", f"Available memory ({format_bytes(available)}) recovered, resuming new tasks.")
+
+            self._throttled = throttled
+
+        return throttled
+
+    def _dispatch(self) -> None:
+        with self._lock:
+            if self._pending and self._is_memory_low():
+                return
+
+            for handle in self._workers.values():
+                if not self._pending:
+                    return
+
+                if handle.current or handle.retiring:
+                    continue
+
+                item = self._pop_pending_for(handle)
+                if not item.future.set_running_or_notify_cancel():
+                    continue
+
+                try:
+                    handle.task_conn.send(_TaskMessage(task_id=item.task_id, fn=item.fn, args=item.args))
+                except Exception as ex:  # pylint: disable=broad-except
+                    # Task is not picklable, the pipe is untouched as the message is pickled before sending
+                    item.future.set_exception(ex)
+                    continue
+
+                handle.current = item
+
+    def _on_done(self, handle: _WorkerHandle, message: _DoneMessage) -> None:
+        item = handle.current
+        handle.current = None
+        handle.summary.tasks_done += 1
+        handle.summary.stats = message.stats
+        self._stats.tasks_done += 1
+
+        if message.retire_reason:
+            # Worker exits by itself
+            handle.retiring = True
+            handle.stop_sent = True
+            self._stats.recycled[message.retire_reason] = self._stats.recycled.get(message.retire_reason, 0) + 1
+        elif handle.retiring:
+            self._stop_worker(handle)
+
+        if not item or item.task_id != message.task_id:
+            log("ERROR", f"Worker #{handle.worker_id} returned the result of an unknown task #{message.task_id}")
+            return
+
+        item.future.duration = message.duration
+        item.future.worker_id = handle.worker_id
+
+        if message.exception:
+            message.exception.__cause__ = _RemoteTraceback(message.traceback)
+            item.future.set_exception(message.exception)
+        else:
+            item.future.set_result(message.result)
+
+    def _on_worker_exit(self, handle: _WorkerHandle) -> None:
+        if not handle.retiring and not self._shutdown:
+            self._stats.died += 1
+            log("ERROR", f"Worker #{handle.worker_id} exited unexpectedly (exit code {handle.process.exitcode})")
+
+        if handle.current:
+            handle.current.future.set_exception(BrokenWorkerError(
+                f"Worker #{handle.worker_id} died while running the task "
+                f"(exit code {handle.process.exitcode})"
+            ))
+            handle.current = None
+
+        self._remove_worker(handle)
+
+        if not self._shutdown:
+            self._spawn_worker()
+
+    def _receive(self, handle: _WorkerHandle) -> bool:
+        """Receive and handle a message from the worker of ``handle``. Returns ``False`` if the pipe is closed."""
+        try:
+            message = handle.result_conn.recv()
+        except EOFError:
+            return False
+        except Exception as ex:  # pylint: disable=broad-except
+            # Result sent but failed to unpickle
+            message = _DoneMessage(
+                task_id=handle.current.task_id if handle.current else -1,
+                exception=RuntimeError(f"Failed to receive the task result: {ex}"),
+                traceback=traceback.format_exc()
+            )
+
+        self._on_done(handle, message)
+        return True
+
+    def _collect_once(self) -> None:
+        with self._lock:
+            handles = list(self._workers.values())
+
+        ready = wait(
+            [handle.result_conn for handle in handles] + [handle.process.sentinel for handle in handles],
+            timeout=0.5
+        )
+
+        with self._lock:
+            for handle in handles:
+                if handle.result_conn in ready:
+                    self._receive(handle)
+
+                if handle.process.sentinel in ready or not handle.process.is_alive():
+                    # Drain the result sent right before the worker exits
+                    while handle.result_conn.poll() and self._receive(handle):
+                        pass
+
+                    self._on_worker_exit(handle)
+
+        self._dispatch()
+
+    def _collect_loop(self) -> None:
+        while True:
+            with self._lock:
+                if self._shutdown and not self._workers:
+                    return
+
+            self._collect_once()
+
+    def submit(self, fn: Callable[..., Any], *args: Any, affinity: Optional[Hashable] = None) -> TaskFuture:
+        """
+        Submit ``fn`` to be called with ``args`` in a worker and get the future of its result.
+
+        ``affinity`` is the key to route the tasks to the same worker. Check the class documentation for details.
+
+        Raises :class:`RuntimeError` if the pool has been shut down.
+        """
+        future = TaskFuture()
+
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("Cannot submit a task to a pool that has been shut down")
+
+            self._pending.append(_WorkItem(
+                task_id=next(self._task_ids), fn=fn, args=args, future=future, affinity=affinity
+            ))
+
+        self._dispatch()
+
+        return future
+
+    def shutdown(self, *, cancel_pending: bool = False) -> None:
+        """
+        Wait for all submitted tasks to complete, then stop all workers.
+
+        Tasks not yet dispatched to a worker are cancelled instead if ``cancel_pending`` is ``True``.
+        """
+        if cancel_pending:
+            with self._lock:
+                while self._pending:
+                    self._pending.popleft().future.cancel()
+
+        while True:
+            with self._lock:
+                if not self._pending and not any(handle.current for handle in self._workers.values()):
+                    self._shutdown = True
+                    for handle in self._workers.values():
+                        self._stop_worker(handle)
+                    break
+
+            time.sleep(0.05)
+
+        self._supervisor_stop.set()
+        self._supervisor.join()
+        self._collector.join()
+
+    def log_stats(self) -> None:
+        """Log the statistics of this pool."""
+        stats = self._stats
+        recycled = ", ".join(f"{count} by {reason}" for reason, count in stats.recycled.items()) or "none"
+
+        log(
+            "INFO",
+            f"Worker pool: {stats.tasks_done} tasks completed by {stats.spawned} workers "
+            f"(recycled: {recycled}; died: {stats.died})"
+        )
+        if stats.affinity_hits or stats.affinity_steals:
+            log(
+                "INFO",
+                f"Worker pool: {stats.affinity_hits} tasks routed to the worker of their affinity, "
+                f"{stats.affinity_steals} tasks stolen by another worker"
+            )
+
+        totals: dict[str, Counter[str]] = {}
+        for summary in stats.workers.values():
+            for name, counts in summary.stats.items():
+                totals.setdefault(name, Counter()).update(counts)
+        for name, counts in totals.items():
+            counts_str = ", ".join(f"{count} {key}" for key, count in counts.items())
+            log("INFO", f"Worker pool: {name} of all workers: {counts_str}")
+
+        for worker_id, summary in sorted(stats.workers.items()):
+            stats_str = "".join(
+                f"; {name}: " + ", ".join(f"{count} {key}" for key, count in counts.items())
+                for name, counts in summary.stats.items()
+            )
+            peak_rss = format_bytes(summary.peak_rss)
+            log("INFO", f"Worker #{worker_id}: {summary.tasks_done} tasks (peak RSS {peak_rss}{stats_str})")
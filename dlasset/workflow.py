@@ -1,10 +1,19 @@
 """Workflows for processing the assets."""
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
 from .config import load_config
 from .env import Environment, get_cli_args, init_env
-from .export import export_audio, export_by_task
-from .manifest import Manifest, decrypt_manifest_all_locale, download_manifest_all_locale, export_manifest_all_locale
+from .export import export_audio, export_by_tasks, prefetch_by_tasks
+from .log import log
+from .manage import load_cached_asset_index, record_live_hashes
+from .manifest import (
+    Manifest, ManifestDiff, decrypt_manifest_all_locale, diff_manifests, download_manifest_all_locale,
+    export_manifest_all_locale, load_cached_manifest, load_cached_manifest_of_version, store_manifest_cache,
+)
 
-__all__ = ("initialize", "process_manifest", "export_assets")
+__all__ = ("initialize", "process_manifest", "diff_manifest", "export_assets", "prefetch_assets")
 
 
 def initialize() -> Environment:
@@ -15,28 +24,81 @@ def initialize() -> Environment:
     env = init_env(args, config)
     env.print_info()
 
+    # Loaded before starting the worker pool, so the workers get the index with the run context
+    load_cached_asset_index(env)
+
     return env
 
 
 def process_manifest(env: Environment) -> Manifest:
-    """Process manifest asset and return its model."""
-    download_manifest_all_locale(env)
-    decrypt_manifest_all_locale(env)
-    return export_manifest_all_locale(env)
+    """
+    Process manifest asset and return its model.
+
+    The manifest parsed by a previous run of the same version is used instead if available.
+    """
+    manifest = load_cached_manifest(env) if not env.args.no_manifest_cache else None
+
+    if not manifest:
+        download_manifest_all_locale(env)
+        if env.args.dotnet_decrypt:
+            decrypt_manifest_all_locale(env)
+        manifest = export_manifest_all_locale(env)
+
+        store_manifest_cache(env, manifest)
+
+    record_live_hashes(env, manifest)
+
+    return manifest
+
 
+def diff_manifest(env: Environment, manifest: Manifest) -> Optional[ManifestDiff]:
+    """
+    Get the changes of ``manifest`` since the version to compare with, and store the report of the changes.
 
-def export_assets(env: Environment, manifest: Manifest) -> None:
-    """Perform asset exporting tasks in the config."""
-    for asset_task in env.config.asset_tasks:
-        export_by_task(env, manifest, asset_task)
+    Returns ``None`` if no version to compare with is given.
+    """
+    if not (diff_base := env.args.diff_base):
+        return None
 
-        # Update index file per task
-        env.index.update_index_files(env.init_time)
+    base_manifest = load_cached_manifest_of_version(env.config.paths.downloaded, diff_base)
+    if not base_manifest:
+        log("ERROR", f"Manifest of {diff_base} to compare with is not cached")
+        sys.exit(1)
 
-    if env.config.audio_task:
-        export_audio(env, manifest, env.config.audio_task)
+    diff = diff_manifests(base_manifest, manifest, diff_base, env.args.version_code)
+    diff.print()
+    diff.export(env.manifest_diff_report_path)
 
-        # Update index file per task
-        env.index.update_index_files(env.init_time)
+    return diff
 
+
+def export_assets(env: Environment, manifest: Manifest, diff: Optional[ManifestDiff] = None) -> None:
+    """
+    Perform asset exporting tasks in the config.
+
+    If ``diff`` is given, only the assets changed in it are exported.
+    """
+    # Audio doesn't depend on the other assets, so it is exported along with them sharing the same worker pool
+    with ThreadPoolExecutor(1, thread_name_prefix="Audio") as executor:
+        audio_export = (
+            executor.submit(export_audio, env, manifest, env.config.audio_task)
+            if env.config.audio_task else None
+        )
+
+        export_by_tasks(env, manifest, env.config.asset_tasks, diff)
+
+        if audio_export:
+            log("INFO", "Waiting for the audio exporting to complete...")
+            audio_export.result()
+
+    env.export_index()
     env.cleanup()
+
+    if env.quarantine:
+        log("ERROR", f"{len(env.quarantine)} entries are quarantined. Check {env.quarantine.file_path} for details.")
+        sys.exit(1)
+
+
+def prefetch_assets(env: Environment, manifest: Manifest, diff: Optional[ManifestDiff] = None) -> None:
+    """Download the updated assets of the asset exporting tasks in the config without exporting them."""
+    prefetch_by_tasks(env, manifest, env.config.asset_tasks, diff)
@@ -1,13 +1,19 @@
 from dlasset.utils import time_exec
-from dlasset.workflow import export_assets, initialize, process_manifest
+from dlasset.workflow import diff_manifest, export_assets, initialize, prefetch_assets, process_manifest
 
 
 @time_exec("Assets downloading & preprocessing")
 def main():
     env = initialize()
-    manifest = process_manifest(env)
 
-    export_assets(env, manifest)
+    with env.worker_pool():
+        manifest = process_manifest(env)
+        diff = diff_manifest(env, manifest)
+
+        if env.args.prefetch_only:
+            prefetch_assets(env, manifest, diff)
+        else:
+            export_assets(env, manifest, diff)
 
 
 if __name__ == '__main__':
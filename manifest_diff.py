@@ -0,0 +1,42 @@
+import argparse
+import sys
+
+from dlasset.config import load_config
+from dlasset.log import log
+from dlasset.manifest import diff_manifests, load_cached_manifest_of_version
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reports the changes of the manifest entries between two versions.")
+
+    parser.add_argument("old", type=str,
+                        help="Manifest version code to compare from")
+    parser.add_argument("new", type=str,
+                        help="Manifest version code to compare to")
+    parser.add_argument("-c", "--config", type=str, required=True,
+                        help="Config file path to use. The manifests of both versions must be cached "
+                             "in the downloaded directory in it")
+    parser.add_argument("-o", "--output", type=str, default=None,
+                        help="Path to store the report of the changes in JSON")
+
+    args = parser.parse_args()
+
+    downloaded_dir = load_config(args.config).paths.downloaded
+
+    manifests = []
+    for version_code in (args.old, args.new):
+        if not (manifest := load_cached_manifest_of_version(downloaded_dir, version_code)):
+            log("ERROR", f"Manifest of {version_code} is not cached")
+            sys.exit(1)
+
+        manifests.append(manifest)
+
+    diff = diff_manifests(manifests[0], manifests[1], args.old, args.new)
+    diff.print()
+
+    if args.output:
+        diff.export(args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,23 @@
+import argparse
+
+from dlasset.config import load_config
+from dlasset.mirror import serve_mirror
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serves the downloaded assets as a local mirror of the CDN.")
+
+    parser.add_argument("-c", "--config", type=str, required=True,
+                        help="Config file path to use. The downloaded directory in it is served")
+    parser.add_argument("--host", type=str, default="127.0.0.1",
+                        help="Host to serve the mirror on")
+    parser.add_argument("--port", type=int, default=8000,
+                        help="Port to serve the mirror on")
+
+    args = parser.parse_args()
+
+    serve_mirror(load_config(args.config).paths.downloaded, args.host, args.port)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,220 @@
+import os
+import pickle
+import threading
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+import pytest
+
+from dlasset.manage import CachedAssetIndex, cache_index, evict_assets, get_cached_asset_index, load_cached_asset_index
+from dlasset.manage import ensure_asset, get_download_stats, main as manage_main
+from dlasset.manage.cache import LIVE_HASHES_FILE_NAME
+from dlasset.manage.cache_index import TOUCH_INTERVAL
+from dlasset.utils import file_lock
+
+
+def write_file(path, size, *, age=0):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"\0" * size)
+
+    if age:
+        os.utime(path, (time.time() - age, time.time() - age))
+
+
+def write_live_hashes(downloaded_dir, version_code, hashes, *, age=0):
+    write_file(os.path.join(downloaded_dir, "manifest", version_code, "assetbundle.manifest"), 1)
+
+    live_hashes_path = os.path.join(downloaded_dir, "manifest", version_code, LIVE_HASHES_FILE_NAME)
+    with open(live_hashes_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(hashes))
+
+    if age:
+        os.utime(live_hashes_path, (time.time() - age, time.time() - age))
+
+
+def asset_path(downloaded_dir, asset_hash):
+    return os.path.join(downloaded_dir, "assets", asset_hash[:2], asset_hash)
+
+
+@pytest.fixture
+def downloaded_dir(tmp_path):
+    write_live_hashes(tmp_path, "old", ["AAAA", "BBBB"], age=200)
+    write_live_hashes(tmp_path, "new", ["AAAA", "CCCC"], age=100)
+
+    write_file(asset_path(tmp_path, "AAAA"), 100)
+    write_file(asset_path(tmp_path, "BBBB"), 200, age=50)
+    write_file(asset_path(tmp_path, "CCCC"), 300)
+    write_file(asset_path(tmp_path, "DDDD"), 400, age=500)
+    write_file(asset_path(tmp_path, "EEEE"), 500, age=10)
+    write_file(f"{asset_path(tmp_path, 'FFFF')}.part", 50)
+    write_file(f"{asset_path(tmp_path, 'CCCC')}.lock", 0)
+
+    return str(tmp_path)
+
+
+def remaining_hashes(downloaded_dir):
+    return {
+        file_name
+        for hash_dir in os.listdir(os.path.join(downloaded_dir, "assets"))
+        for file_name in os.listdir(os.path.join(downloaded_dir, "assets", hash_dir))
+    }
+
+
+def test_evict_unreferenced(downloaded_dir):
+    report = evict_assets(downloaded_dir)
+
+    assert report.versions_kept == ["new"]
+    assert report.evicted_size == 200 + 400 + 500 + 50
+    assert remaining_hashes(downloaded_dir) == {"AAAA", "CCCC", "CCCC.lock"}
+    assert not os.path.exists(os.path.join(downloaded_dir, "assets", "DD"))
+
+
+def test_evict_keep_versions(downloaded_dir):
+    report = evict_assets(downloaded_dir, keep_versions=2)
+
+    assert report.versions_kept == ["new", "old"]
+    assert remaining_hashes(downloaded_dir) == {"AAAA", "BBBB", "CCCC", "CCCC.lock"}
+
+
+def test_evict_size_cap_least_recently_used_first(downloaded_dir):
+    # Total 1550 bytes, evicting DDDD (used 500s ago) and BBBB (used 50s ago) fits in the cap
+    report = evict_assets(downloaded_dir, max_size=1000)
+
+    assert [os.path.basename(asset.path) for asset in report.evicted] == ["DDDD", "BBBB"]
+    assert remaining_hashes(downloaded_dir) == {"AAAA", "CCCC", "CCCC.lock", "EEEE", "FFFF.part"}
+
+
+def test_evict_size_cap_never_evicts_live(downloaded_dir):
+    evict_assets(downloaded_dir, max_size=0)
+
+    assert remaining_hashes(downloaded_dir) == {"AAAA", "CCCC", "CCCC.lock"}
+
+
+def test_evict_dry_run(downloaded_dir):
+    before = remaining_hashes(downloaded_dir)
+
+    report = evict_assets(downloaded_dir, dry_run=True)
+
+    assert report.evicted_size == 200 + 400 + 500 + 50
+    assert remaining_hashes(downloaded_dir) == before
+
+
+def test_evict_without_live_hashes(tmp_path):
+    write_file(asset_path(tmp_path, "AAAA"), 100)
+
+    with pytest.raises(ValueError):
+        evict_assets(str(tmp_path))
+
+    assert remaining_hashes(tmp_path) == {"AAAA"}
+
+
+class StubEntry:
+    def __init__(self, downloaded_dir, asset_hash, size):
+        self.hash = asset_hash
+        self.size = size
+        self.path = asset_path(downloaded_dir, asset_hash)
+
+    def get_asset_path(self, _):
+        return self.path
+
+    def get_actual_asset_dir(self, _):
+        return os.path.dirname(self.path)
+
+
+def test_index_scan(downloaded_dir):
+    index = CachedAssetIndex(downloaded_dir)
+
+    assert len(index) == 5
+    assert index.is_downloaded(StubEntry(downloaded_dir, "AAAA", 100))
+    # Size mismatch
+    assert not index.is_downloaded(StubEntry(downloaded_dir, "BBBB", 201))
+    # Partially downloaded
+    assert not index.is_downloaded(StubEntry(downloaded_dir, "FFFF", 50))
+
+    entry = StubEntry(downloaded_dir, "FFFF", 50)
+    index.mark_downloaded(entry)
+    assert index.is_downloaded(entry)
+
+
+def test_index_mark_used(downloaded_dir):
+    entry = StubEntry(downloaded_dir, "DDDD", 400)
+    os.utime(entry.path, (0, 0))
+
+    index = CachedAssetIndex(downloaded_dir)
+    assert index.mark_used(None, entry)
+    assert time.time() - os.path.getmtime(entry.path) < TOUCH_INTERVAL
+
+    # Recently used, the disk is not touched
+    os.utime(entry.path, (0, 0))
+    assert index.mark_used(None, entry)
+    assert os.path.getmtime(entry.path) == 0
+
+
+def test_index_mark_used_removed(downloaded_dir):
+    entry = StubEntry(downloaded_dir, "DDDD", 400)
+    os.utime(entry.path, (0, 0))
+
+    index = CachedAssetIndex(downloaded_dir)
+    os.remove(entry.path)
+
+    assert not index.mark_used(None, entry)
+    assert not index.is_downloaded(entry)
+
+
+def test_index_sent_to_workers(downloaded_dir, monkeypatch):
+    monkeypatch.setattr(cache_index, "_INDEX", None)
+    env = SimpleNamespace(config=SimpleNamespace(paths=SimpleNamespace(downloaded=downloaded_dir)), asset_index=None)
+
+    index = load_cached_asset_index(env)
+    assert env.asset_index is index
+
+    # Worker process started with the run context of the main process
+    index.mark_downloaded(StubEntry(downloaded_dir, "GGGG", 10))
+    worker_env = pickle.loads(pickle.dumps(env))
+    monkeypatch.setattr(cache_index, "_INDEX", None)
+    monkeypatch.setattr(cache_index, "scan_cached_assets", lambda _: pytest.fail("Downloaded assets scanned again"))
+
+    worker_index = get_cached_asset_index(worker_env)
+    assert worker_index is worker_env.asset_index
+    assert len(worker_index) == 6
+    assert worker_index.is_downloaded(StubEntry(downloaded_dir, "GGGG", 10))
+
+
+@pytest.fixture
+def download_env(downloaded_dir, monkeypatch):
+    monkeypatch.setattr(cache_index, "_INDEX", None)
+    monkeypatch.setattr(manage_main, "_DOWNLOAD_STATS", Counter())
+
+    env = SimpleNamespace(config=SimpleNamespace(paths=SimpleNamespace(downloaded=downloaded_dir)), asset_index=None)
+    load_cached_asset_index(env)
+
+    return env
+
+
+def test_ensure_asset_downloaded_after_scan(download_env, downloaded_dir, monkeypatch):
+    entry = StubEntry(downloaded_dir, "GGGG", 10)
+    write_file(entry.path, 10)
+    monkeypatch.setattr(manage_main, "file_lock", lambda _: pytest.fail("Lock taken for a downloaded asset"))
+
+    assert not ensure_asset(download_env, entry)
+    assert get_download_stats()["cached"] == 1
+    assert get_cached_asset_index(download_env).is_downloaded(entry)
+
+
+def test_ensure_asset_deduplicated(download_env, downloaded_dir, monkeypatch):
+    entry = StubEntry(downloaded_dir, "GGGG", 10)
+    monkeypatch.setattr(manage_main, "download_asset", lambda *_: pytest.fail("Asset downloaded twice"))
+    os.makedirs(entry.get_actual_asset_dir(None))
+
+    with file_lock(f"{entry.path}.lock"):
+        # Another process is downloading the asset
+        ensuring = threading.Thread(target=ensure_asset, args=(download_env, entry))
+        ensuring.start()
+        time.sleep(0.3)
+        write_file(entry.path, 10)
+
+    ensuring.join()
+
+    assert get_download_stats()["deduplicated"] == 1
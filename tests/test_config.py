@@ -0,0 +1,21 @@
+from dlasset.config import Config
+
+PATHS = {
+    "downloaded": "downloaded", "lib": "lib", "export": "export", "index": "index", "log": "log",
+    "updated": "updated", "temp": "temp",
+}
+
+
+def make_config(concurrency=None, network=None):
+    return Config({"paths": PATHS, "concurrency": concurrency or {}, "network": network or {}, "assets": []})
+
+
+def test_pool_size_fits_download_threads():
+    assert make_config({"downloadThreads": 24}).network.http_client.pool_size == 24
+    assert make_config({"downloadThreads": 4}).network.http_client.pool_size == 10
+
+
+def test_pool_size_configured():
+    config = make_config({"downloadThreads": 24}, {"poolSize": 16})
+
+    assert config.network.http_client.pool_size == 16
@@ -0,0 +1,48 @@
+import pytest
+
+from dlasset.utils import decrypt_rijndael_cbc
+
+
+def test_decrypt_aes_128():
+    # FIPS-197 appendix C.1, a single block with a zero IV is the same as ECB
+    decrypted = decrypt_rijndael_cbc(
+        bytes.fromhex("69c4e0d86a7b0430d8cdb78070b4c55a"), bytes(range(16)), bytes(16)
+    )
+
+    assert decrypted == bytes.fromhex("00112233445566778899aabbccddeeff")
+
+
+def test_decrypt_aes_256():
+    # FIPS-197 appendix C.3
+    decrypted = decrypt_rijndael_cbc(
+        bytes.fromhex("8ea2b7ca516745bfeafc49904b496089"), bytes(range(32)), bytes(16)
+    )
+
+    assert decrypted == bytes.fromhex("00112233445566778899aabbccddeeff")
+
+
+def test_decrypt_rijndael_256_block():
+    # Decrypted by `lib/decrypt/Decrypt.dll`
+    decrypted = decrypt_rijndael_cbc(bytes(range(64)), bytes(range(32)), bytes(range(100, 132)))
+
+    assert decrypted == bytes.fromhex(
+        "b1de30e85e28d1364f0c9e1d9f4a5f3af5482e836aab74af21ef2dceb01c0293"
+        "051e213e3f42d3e776ed643cd4f8e04e8f09fc7f7c3f7d58259647a5cb223434"
+    )
+
+
+def test_decrypt_empty():
+    assert decrypt_rijndael_cbc(b"", bytes(32), bytes(32)) == b""
+
+
+@pytest.mark.parametrize(
+    "data,key,iv",
+    [
+        (bytes(33), bytes(32), bytes(32)),
+        (bytes(32), bytes(20), bytes(32)),
+        (bytes(32), bytes(32), bytes(20)),
+    ]
+)
+def test_decrypt_invalid_length(data, key, iv):
+    with pytest.raises(ValueError):
+        decrypt_rijndael_cbc(data, key, iv)
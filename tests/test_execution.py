@@ -0,0 +1,92 @@
+import os
+
+import pytest
+
+from dlasset.utils import RetryPolicy, concurrent_run_iter
+
+
+def fail_until(counter_path, succeed_at):
+    """Fail until this is called ``succeed_at`` times with ``counter_path``, counted across the processes."""
+    with open(counter_path, "a", encoding="utf-8") as f:
+        f.write(".")
+
+    with open(counter_path, encoding="utf-8") as f:
+        attempt = len(f.read())
+
+    if attempt < succeed_at:
+        raise ValueError(f"Attempt #{attempt} failed")
+
+    return attempt
+
+
+def identity(value):
+    return value
+
+
+def key_of_first(*args):
+    return args[0]
+
+
+def test_run_retry(tmp_path):
+    counter_path = str(tmp_path / "counter")
+
+    results = dict(concurrent_run_iter(
+        fail_until, [[counter_path, 3]], str(tmp_path),
+        key_of_call=key_of_first, max_workers=1, retry=RetryPolicy(max_retries=2, backoff=0.01)
+    ))
+
+    assert results == {counter_path: 3}
+
+
+def test_run_retry_exhausted_on_error(tmp_path):
+    counter_path = str(tmp_path / "counter")
+    errors = []
+
+    results = dict(concurrent_run_iter(
+        fail_until, [[counter_path, 10], [os.devnull, 0]], str(tmp_path),
+        key_of_call=key_of_first, max_workers=1, retry=RetryPolicy(max_retries=1, backoff=0.01),
+        on_error=lambda key, error: errors.append((key, error))
+    ))
+
+    # Failed task is reported to `on_error` only, so the other tasks complete
+    assert list(results) == [os.devnull]
+    assert [key for key, _ in errors] == [counter_path]
+    assert isinstance(errors[0][1], ValueError)
+    # 1 attempt + 1 retry
+    with open(counter_path, encoding="utf-8") as f:
+        assert len(f.read()) == 2
+
+
+def test_run_error_exits(tmp_path):
+    with pytest.raises(SystemExit):
+        list(concurrent_run_iter(
+            fail_until, [[str(tmp_path / "counter"), 10]], str(tmp_path), key_of_call=key_of_first, max_workers=1
+        ))
+
+
+def test_run_in_flight_bounded(tmp_path):
+    consumed = []
+
+    def args_list():
+        for idx in range(20):
+            consumed.append(idx)
+            yield [idx]
+
+    results = []
+    for key, result in concurrent_run_iter(
+            identity, args_list(), str(tmp_path), key_of_call=key_of_first, max_workers=2, max_in_flight=3
+    ):
+        # Tasks consumed but not yielded yet, including this one
+        assert len(consumed) - len(results) <= 3
+        results.append((key, result))
+
+    assert sorted(results) == [(idx, idx) for idx in range(20)]
+
+
+def test_run_affinity(tmp_path):
+    results = list(concurrent_run_iter(
+        identity, [[idx] for idx in range(6)], str(tmp_path),
+        key_of_call=key_of_first, max_workers=2, affinity_of_call=lambda idx: idx % 2
+    ))
+
+    assert sorted(results) == [(idx, idx) for idx in range(6)]
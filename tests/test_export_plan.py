@@ -0,0 +1,149 @@
+from types import SimpleNamespace
+
+import pytest
+
+from dlasset.config import AssetTask
+from dlasset.enums import Locale
+from dlasset.env import Quarantine
+from dlasset.env.index import FileIndex
+from dlasset.export.plan import match_task, plan_export
+from dlasset.manifest import Manifest, diff_manifests
+
+TASK_CHARA = AssetTask({
+    "name": "Character", "asset": "^chara/",
+    "tasks": [
+        {"name": "Sprite", "container": "sprite", "type": "Texture2D"},
+        {"name": "Texture", "container": "texture", "type": "Texture2D", "isMultiLocale": True},
+    ],
+})
+
+TASK_ALL = AssetTask({
+    "name": "All", "asset": "^(chara|images)/",
+    "tasks": [{"name": "Data", "container": "data", "type": "MonoBehaviour"}],
+})
+
+SPRITE, TEXTURE = TASK_CHARA.tasks
+(DATA,) = TASK_ALL.tasks
+
+
+def make_entry(name, asset_hash, dependencies=()):
+    return {
+        "name": name, "hash": asset_hash, "size": 1, "group": 0, "dependencies": list(dependencies), "assets": []
+    }
+
+
+def make_manifest(hash_of_b="B1"):
+    return Manifest({
+        Locale.JP: {
+            "categories": [{
+                "name": "Character",
+                "assets": [
+                    make_entry("chara/a", "A1", ["shader"]),
+                    make_entry("chara/b", hash_of_b),
+                    make_entry("images/c", "C1"),
+                    make_entry("shader", "S1"),
+                ]
+            }],
+            "rawAssets": [],
+        },
+        Locale.EN: {
+            "categories": [{"name": "Character", "assets": [make_entry("chara/a", "A2")]}],
+            "rawAssets": [],
+        },
+    })
+
+
+MANIFEST = make_manifest()
+
+
+@pytest.fixture
+def env(tmp_path):
+    index = FileIndex(
+        index_dir=str(tmp_path), version_code="test", enabled=True,
+        export_updated=False, export_updated_dir=str(tmp_path)
+    )
+
+    return SimpleNamespace(args=SimpleNamespace(no_index=False), index=index, quarantine=Quarantine(str(tmp_path)))
+
+
+def index_all(env, manifest):
+    for locale, manifest_of_locale in manifest.manifests.items():
+        for entry in manifest_of_locale.entry_by_name.values():
+            env.index.update_entry(locale, entry)
+
+
+def get_jobs(plan):
+    return {item.key: item.jobs for item in plan}
+
+
+def test_match_task_shared_by_subtasks(env):
+    index_all(env, MANIFEST)
+    # Indexed from another version
+    env.index.update_entry(Locale.JP, make_manifest("B2").manifests[Locale.JP].entry_by_name["chara/b"])
+
+    matches = match_task(env, MANIFEST, TASK_CHARA)
+
+    assert [(match.locale, match.entries[0].name, match.is_updated) for match in matches] == [
+        (Locale.JP, "chara/a", False), (Locale.JP, "chara/b", True), (Locale.EN, "chara/a", False),
+    ]
+    # Dependencies included
+    assert [entry.name for entry in matches[0].entries] == ["chara/a", "shader"]
+
+
+def test_plan_merge_jobs(env):
+    plan = plan_export(env, MANIFEST, [TASK_CHARA, TASK_ALL])
+
+    assert get_jobs(plan) == {
+        (Locale.JP, "chara/a"): [(TASK_CHARA, SPRITE), (TASK_CHARA, TEXTURE), (TASK_ALL, DATA)],
+        (Locale.JP, "chara/b"): [(TASK_CHARA, SPRITE), (TASK_CHARA, TEXTURE), (TASK_ALL, DATA)],
+        # Only multi-locale subtasks for the other locales
+        (Locale.EN, "chara/a"): [(TASK_CHARA, TEXTURE)],
+        (Locale.JP, "images/c"): [(TASK_ALL, DATA)],
+    }
+    assert {item.key: item.tasks for item in plan}[(Locale.JP, "chara/a")] == {TASK_CHARA, TASK_ALL}
+
+
+def test_plan_master_only(env):
+    plan = plan_export(env, MANIFEST, [TASK_ALL])
+
+    assert all(item.locale.is_master for item in plan)
+
+
+def test_plan_index_up_to_date(env):
+    index_all(env, MANIFEST)
+
+    assert not plan_export(env, MANIFEST, [TASK_CHARA, TASK_ALL])
+
+
+def test_plan_quarantined(env):
+    index_all(env, MANIFEST)
+    entries = MANIFEST.get_entries_including_dependencies(
+        Locale.JP, MANIFEST.manifests[Locale.JP].entry_by_name["chara/a"]
+    )
+    env.quarantine.add(TASK_CHARA, SPRITE, Locale.JP, entries, ValueError("Failed"))
+
+    # Only the task which quarantined the entry exports it again
+    assert get_jobs(plan_export(env, MANIFEST, [TASK_CHARA, TASK_ALL])) == {
+        (Locale.JP, "chara/a"): [(TASK_CHARA, SPRITE), (TASK_CHARA, TEXTURE)],
+    }
+
+
+def test_plan_diff(env):
+    new_manifest = make_manifest("B2")
+    diff = diff_manifests(MANIFEST, new_manifest, "old", "new")
+
+    # Nothing is indexed, but only the changed entries are exported
+    assert get_jobs(plan_export(env, new_manifest, [TASK_CHARA, TASK_ALL], diff)) == {
+        (Locale.JP, "chara/b"): [(TASK_CHARA, SPRITE), (TASK_CHARA, TEXTURE), (TASK_ALL, DATA)],
+    }
+
+
+def test_plan_diff_quarantined(env):
+    new_manifest = make_manifest("B2")
+    diff = diff_manifests(MANIFEST, new_manifest, "old", "new")
+    env.quarantine.add(TASK_ALL, DATA, Locale.JP, [new_manifest.manifests[Locale.JP].entry_by_name["images/c"]],
+                       ValueError("Failed"))
+
+    assert set(get_jobs(plan_export(env, new_manifest, [TASK_CHARA, TASK_ALL], diff))) == {
+        (Locale.JP, "chara/b"), (Locale.JP, "images/c"),
+    }
@@ -0,0 +1,105 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from dlasset.config import AssetTask
+from dlasset.enums import Locale
+from dlasset.env import Quarantine, TaskTimings
+from dlasset.env.index import FileIndex
+from dlasset.export import export_by_tasks, task as export_task
+from dlasset.export.plan import plan_export
+from dlasset.manifest import Manifest
+from dlasset.utils import RetryPolicy
+
+TASK = AssetTask({
+    "name": "Character", "asset": "^chara/",
+    "tasks": [{"name": "Sprite", "container": "sprite", "type": "Texture2D"}],
+})
+
+
+def make_entry(name, asset_hash, dependencies=()):
+    return {
+        "name": name, "hash": asset_hash, "size": 1, "group": 0, "dependencies": list(dependencies), "assets": []
+    }
+
+
+MANIFEST = Manifest({
+    Locale.JP: {
+        "categories": [{
+            "name": "Character",
+            "assets": [
+                make_entry("chara/fail", "F1", ["shader"]),
+                make_entry("chara/ok", "K1", ["shader"]),
+                make_entry("shader", "S2"),
+            ]
+        }],
+        "rawAssets": [],
+    }
+})
+
+
+def export_or_fail(_, entries, jobs, *__):
+    if entries[0].name == "chara/fail":
+        raise ValueError("Failed to export")
+
+    return [[] for _ in jobs]
+
+
+def make_env(index_dir, log_dir, *, error_tolerant):
+    index = FileIndex(
+        index_dir=index_dir, version_code="test", enabled=True, export_updated=False, export_updated_dir=index_dir
+    )
+    quarantine = Quarantine(index_dir=index_dir)
+
+    def export_index():
+        # Same as the environment, except the updated file index which needs the run time
+        index._export_index()
+        quarantine.export()
+
+    return SimpleNamespace(
+        index=index, quarantine=quarantine, timings=TaskTimings(index_dir=index_dir), export_index=export_index,
+        args=SimpleNamespace(no_index=False), schedule_report_path=f"{log_dir}/schedule.json",
+        config=SimpleNamespace(
+            paths=SimpleNamespace(log=log_dir),
+            concurrency=SimpleNamespace(
+                processes=1, batch_size=None, retry=RetryPolicy(), error_tolerant=error_tolerant
+            ),
+        ),
+    )
+
+
+@pytest.fixture
+def dirs(tmp_path, monkeypatch):
+    monkeypatch.setattr(export_task, "export_from_manifest", export_or_fail)
+    # Nothing to download
+    monkeypatch.setattr(export_task, "prefetch_assets", lambda _, items, __: iter(items))
+
+    index_dir = tmp_path / "index"
+    index_dir.mkdir()
+    # Index of the previous version, which has a different hash of the shared dependency
+    for locale in Locale:
+        data = {"chara/fail": "F1", "chara/ok": "K1", "shader": "S1"} if locale.is_master else {}
+        (index_dir / f"index-{locale.value}.json").write_text(json.dumps(data), encoding="utf-8")
+
+    return str(index_dir), str(tmp_path)
+
+
+@pytest.mark.parametrize("error_tolerant", [True, False])
+def test_export_failed_item_sharing_dependency(dirs, error_tolerant):
+    index_dir, log_dir = dirs
+    env = make_env(index_dir, log_dir, error_tolerant=error_tolerant)
+
+    if error_tolerant:
+        # Index is stored once all items of the task are completed, without storing it at the end of the run
+        export_by_tasks(env, MANIFEST, [TASK])
+    else:
+        with pytest.raises(SystemExit):
+            export_by_tasks(env, MANIFEST, [TASK])
+
+    next_env = make_env(index_dir, log_dir, error_tolerant=error_tolerant)
+
+    # Dependency shared with the successful item is committed
+    assert not next_env.index.is_file_updated(Locale.JP, MANIFEST.manifests[Locale.JP].entry_by_name["shader"])
+    # Failed item is exported again in the next run
+    assert [item.key for item in plan_export(next_env, MANIFEST, [TASK])] == [(Locale.JP, "chara/fail")]
@@ -0,0 +1,112 @@
+import os
+import socket
+import threading
+import time
+
+from dlasset.utils import file_lock
+
+
+def write_stale_lock(lock_path, *, age=0, host=None):
+    # PID which never exists, as it's above the maximum PID on Linux
+    with open(lock_path, "w", encoding="utf-8") as f:
+        f.write(f"{host or socket.gethostname()}:99999999:stale")
+
+    if age:
+        os.utime(lock_path, (time.time() - age, time.time() - age))
+
+
+def test_lock_acquire_release(tmp_path):
+    lock_path = str(tmp_path / "asset.lock")
+
+    with file_lock(lock_path) as acquired_without_waiting:
+        assert acquired_without_waiting
+        assert os.path.exists(lock_path)
+
+    assert not os.path.exists(lock_path)
+
+
+def test_lock_take_over_dead_holder(tmp_path):
+    lock_path = str(tmp_path / "asset.lock")
+    write_stale_lock(lock_path)
+
+    with file_lock(lock_path) as acquired_without_waiting:
+        assert not acquired_without_waiting
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_lock_holder_on_other_host(tmp_path):
+    lock_path = str(tmp_path / "asset.lock")
+    # Process of the other host can't be checked
+    write_stale_lock(lock_path, host="other-host")
+
+    acquired = threading.Event()
+
+    def wait_for_lock():
+        with file_lock(lock_path, poll_interval=0.01, stale_after=1):
+            acquired.set()
+
+    waiter = threading.Thread(target=wait_for_lock)
+    waiter.start()
+
+    assert not acquired.wait(0.3)
+    # Taken over once the lock is not refreshed for `stale_after`
+    assert acquired.wait(5)
+    waiter.join()
+
+
+def test_lock_refreshed_while_held(tmp_path):
+    lock_path = str(tmp_path / "asset.lock")
+    taken_over = threading.Event()
+
+    def wait_for_lock():
+        with file_lock(lock_path, poll_interval=0.01, stale_after=0.4):
+            taken_over.set()
+
+    with file_lock(lock_path, stale_after=0.4):
+        waiter = threading.Thread(target=wait_for_lock)
+        waiter.start()
+
+        # Held for longer than `stale_after`
+        assert not taken_over.wait(1)
+
+    waiter.join()
+    assert taken_over.is_set()
+
+
+def test_lock_release_keeps_lock_of_other_holder(tmp_path):
+    lock_path = str(tmp_path / "asset.lock")
+
+    with file_lock(lock_path):
+        # Lock taken over by another holder
+        with open(lock_path, "w", encoding="utf-8") as f:
+            f.write(f"{socket.gethostname()}:{os.getpid()}:other")
+
+    assert os.path.exists(lock_path)
+
+
+def test_lock_stale_exclusive(tmp_path):
+    lock_path = str(tmp_path / "asset.lock")
+    write_stale_lock(lock_path, age=3600)
+
+    holders = []
+    overlaps = []
+    start = threading.Barrier(8)
+
+    def hold():
+        start.wait()
+        with file_lock(lock_path, poll_interval=0.001):
+            holders.append(1)
+            overlaps.append(len(holders))
+            time.sleep(0.01)
+            holders.pop()
+
+    threads = [threading.Thread(target=hold) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(overlaps) == 8
+    assert max(overlaps) == 1
+    assert os.listdir(tmp_path) == []
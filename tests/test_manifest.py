@@ -0,0 +1,80 @@
+import pickle
+
+from dlasset.enums import Locale
+from dlasset.manifest import Manifest, ManifestEntry, ManifestLocale, ManifestRawEntry
+
+
+def make_manifest(dependencies_of_name):
+    return Manifest({
+        Locale.JP: {
+            "categories": [{
+                "name": "Character",
+                "assets": [
+                    {"name": name, "hash": name.upper(), "size": 1, "group": 0, "dependencies": dependencies,
+                     "assets": []}
+                    for name, dependencies in dependencies_of_name.items()
+                ]
+            }],
+            "rawAssets": [],
+        }
+    })
+
+
+def get_dependency_names(manifest, name):
+    entry = manifest.manifests[Locale.JP].entry_by_name[name]
+
+    return [entry.name for entry in manifest.get_entries_including_dependencies(Locale.JP, entry)]
+
+
+def test_dependencies_transitive_order():
+    manifest = make_manifest({"a": ["b", "c"], "b": ["d"], "c": [], "d": []})
+
+    assert get_dependency_names(manifest, "a") == ["a", "b", "d", "c"]
+
+
+def test_dependencies_shared_once():
+    manifest = make_manifest({"a": ["b", "c"], "b": ["shader"], "c": ["shader"], "shader": []})
+
+    assert get_dependency_names(manifest, "a") == ["a", "b", "shader", "c"]
+
+
+def test_dependencies_cycle():
+    manifest = make_manifest({"a": ["b"], "b": ["c"], "c": ["a", "b"]})
+
+    assert get_dependency_names(manifest, "a") == ["a", "b", "c"]
+    assert get_dependency_names(manifest, "c") == ["c", "a", "b"]
+
+
+def test_dependencies_memoized():
+    manifest = make_manifest({"a": ["b"], "b": []})
+    entry = manifest.manifests[Locale.JP].entry_by_name["a"]
+
+    assert (
+        manifest.get_entries_including_dependencies(Locale.JP, entry)
+        is manifest.get_entries_including_dependencies(Locale.JP, entry)
+    )
+
+
+def test_pickle_roundtrip():
+    manifest_of_locale = ManifestLocale({
+        "categories": [{
+            "name": "Character",
+            "assets": [
+                {"name": "a", "hash": "AA01", "size": 1, "group": 0, "dependencies": ["b"], "assets": ["a.prefab"]},
+                {"name": "b", "hash": "BB02", "size": 2, "group": 1, "dependencies": [], "assets": ["b.mat"]},
+            ]
+        }],
+        "rawAssets": [{"name": "c.awb", "hash": "CC03", "size": 3, "group": 2}],
+    })
+
+    unpickled = pickle.loads(pickle.dumps(manifest_of_locale))
+
+    entry = unpickled.entry_by_name["a"]
+    assert isinstance(entry, ManifestEntry)
+    assert (entry.name, entry.hash, entry.size, entry.group) == ("a", "AA01", 1, 0)
+    assert (entry.dependencies, entry.assets, entry.hash_dir) == (("b",), ("a.prefab",), "AA")
+    assert [entry.name for entry in unpickled.get_entries_including_dependencies(entry)] == ["a", "b"]
+
+    raw_entry = unpickled.raw_assets[0]
+    assert isinstance(raw_entry, ManifestRawEntry)
+    assert (raw_entry.name, raw_entry.hash, raw_entry.size, raw_entry.group) == ("c.awb", "CC03", 3, 2)
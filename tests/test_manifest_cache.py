@@ -0,0 +1,92 @@
+import os
+import shutil
+from types import SimpleNamespace
+
+import pytest
+
+from dlasset.enums import Locale
+from dlasset.env import RunContext
+from dlasset.manifest import Manifest, load_cached_manifest, load_cached_manifest_of_version, store_manifest_cache
+from dlasset.manifest import cache
+from dlasset.manifest.cache import MANIFEST_CACHE_FILE_NAME
+
+
+def make_env(downloaded_dir, version_code):
+    return RunContext(
+        args=SimpleNamespace(version_code=version_code),
+        config=SimpleNamespace(paths=SimpleNamespace(downloaded=downloaded_dir)),
+    )
+
+
+def write_manifest_assets(env, content=b"manifest"):
+    os.makedirs(env.manifest_asset_dir, exist_ok=True)
+
+    for locale in Locale:
+        with open(env.manifest_asset_path_of_locale(locale), "wb") as f:
+            f.write(content + locale.value.encode())
+
+
+MANIFEST = Manifest({
+    locale: {
+        "categories": [{
+            "name": "Character",
+            "assets": [{"name": "chara/a", "hash": "A1", "size": 1, "group": 0, "dependencies": [], "assets": []}],
+        }],
+        "rawAssets": [],
+    }
+    for locale in Locale
+})
+
+
+@pytest.fixture
+def env(tmp_path):
+    env = make_env(str(tmp_path), "v1")
+    write_manifest_assets(env)
+    store_manifest_cache(env, MANIFEST)
+
+    return env
+
+
+def test_cache_roundtrip(env):
+    manifest = load_cached_manifest(env)
+
+    assert manifest is not None
+    assert manifest.hashes == MANIFEST.hashes
+    assert manifest.manifests[Locale.EN].entry_by_name["chara/a"].hash == "A1"
+
+
+def test_cache_invalid_by_manifest_asset(env):
+    write_manifest_assets(env, b"updated")
+
+    assert load_cached_manifest(env) is None
+
+
+def test_cache_invalid_by_missing_manifest_asset(env):
+    os.remove(env.manifest_asset_path_of_locale(Locale.EN))
+
+    assert load_cached_manifest(env) is None
+
+
+def test_cache_invalid_by_format(env, monkeypatch):
+    monkeypatch.setattr(cache, "MANIFEST_CACHE_FORMAT", cache.MANIFEST_CACHE_FORMAT + 1)
+
+    assert load_cached_manifest(env) is None
+
+
+def test_cache_invalid_by_version(env, tmp_path):
+    other_env = make_env(str(tmp_path), "v2")
+    # Same manifest assets, but the cache is of the other version
+    shutil.copytree(env.manifest_asset_dir, other_env.manifest_asset_dir)
+
+    assert load_cached_manifest(other_env) is None
+
+
+def test_cache_corrupted(env):
+    with open(os.path.join(env.manifest_asset_dir, MANIFEST_CACHE_FILE_NAME), "wb") as f:
+        f.write(b"corrupted")
+
+    assert load_cached_manifest(env) is None
+
+
+def test_cache_not_stored(tmp_path):
+    assert load_cached_manifest_of_version(str(tmp_path), "v1") is None
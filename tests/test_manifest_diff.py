@@ -0,0 +1,97 @@
+from dlasset.enums import Locale
+from dlasset.manifest import Manifest, diff_manifests
+
+
+def make_entry(name, asset_hash, dependencies=()):
+    return {
+        "name": name, "hash": asset_hash, "size": 1, "group": 0, "dependencies": list(dependencies), "assets": []
+    }
+
+
+def make_manifest(entries, raw_entries=()):
+    return Manifest({
+        Locale.JP: {
+            "categories": [{"name": "Character", "assets": list(entries)}],
+            "rawAssets": list(raw_entries),
+        }
+    })
+
+
+OLD = make_manifest(
+    [
+        make_entry("chara/a", "A1", ["shader"]),
+        make_entry("chara/b", "B1", ["chara/c"]),
+        make_entry("chara/c", "C1", ["shader"]),
+        make_entry("chara/d", "D1"),
+        make_entry("chara/old", "O1"),
+        make_entry("chara/removed", "R1"),
+        make_entry("shader", "S1"),
+    ],
+    [make_entry("raw/x", "X1")],
+)
+
+NEW = make_manifest(
+    [
+        make_entry("chara/a", "A1", ["shader"]),
+        make_entry("chara/b", "B1", ["chara/c"]),
+        make_entry("chara/c", "C1", ["shader"]),
+        make_entry("chara/d", "D1", ["chara/added"]),
+        make_entry("chara/new", "O1"),
+        make_entry("chara/added", "N1"),
+        make_entry("shader", "S2"),
+    ],
+    [make_entry("raw/x", "X2")],
+)
+
+
+def get_changes(diff):
+    return {change.name: change for change in diff.changes[Locale.JP]}
+
+
+def test_diff_change_types():
+    changes = get_changes(diff_manifests(OLD, NEW, "old", "new"))
+
+    assert {name: change.change_type for name, change in changes.items()} == {
+        "chara/a": "dependency",
+        "chara/b": "dependency",
+        "chara/c": "dependency",
+        "chara/d": "changed",
+        "chara/new": "renamed",
+        "chara/added": "added",
+        "chara/removed": "removed",
+        "shader": "changed",
+        "raw/x": "changed",
+    }
+    assert changes["chara/new"].old_name == "chara/old"
+    assert changes["raw/x"].category == "(raw)"
+
+
+def test_diff_transitive_dependency():
+    changes = get_changes(diff_manifests(OLD, NEW, "old", "new"))
+
+    assert changes["chara/c"].changed_dependencies == ["shader"]
+    assert changes["chara/b"].changed_dependencies == ["chara/c"]
+
+
+def test_diff_updated_names():
+    diff = diff_manifests(OLD, NEW, "old", "new")
+
+    assert diff.get_updated_names(Locale.JP) == {
+        "chara/a", "chara/b", "chara/c", "chara/d", "chara/new", "chara/added", "shader", "raw/x"
+    }
+    assert not diff.get_updated_names(Locale.EN)
+
+
+def test_diff_dependency_cycle():
+    old = make_manifest([make_entry("a", "A1", ["b"]), make_entry("b", "B1", ["a", "c"]), make_entry("c", "C1")])
+    new = make_manifest([make_entry("a", "A1", ["b"]), make_entry("b", "B1", ["a", "c"]), make_entry("c", "C2")])
+
+    changes = get_changes(diff_manifests(old, new, "old", "new"))
+
+    assert {name: change.change_type for name, change in changes.items()} == {
+        "a": "dependency", "b": "dependency", "c": "changed"
+    }
+
+
+def test_diff_same_manifest():
+    assert not diff_manifests(OLD, OLD, "old", "old").changes[Locale.JP]
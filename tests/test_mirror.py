@@ -0,0 +1,72 @@
+import os
+import threading
+
+import pytest
+import requests
+
+from dlasset.mirror import create_mirror_server
+from dlasset.utils import http_download
+
+CONTENT = bytes(range(256)) * 16
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    os.makedirs(os.path.join(tmp_path, "assets", "AB"))
+    with open(os.path.join(tmp_path, "assets", "AB", "ABCDEF"), "wb") as f:
+        f.write(CONTENT)
+
+    os.makedirs(os.path.join(tmp_path, "manifest", "abc123"))
+    with open(os.path.join(tmp_path, "manifest", "abc123", "assetbundle.manifest"), "wb") as f:
+        f.write(b"manifest")
+
+    server = create_mirror_server(str(tmp_path), "127.0.0.1", 0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield f"http://127.0.0.1:{server.server_port}"
+
+    server.shutdown()
+    server.server_close()
+
+
+def test_mirror_asset(mirror, tmp_path):
+    file_path = os.path.join(tmp_path, "downloaded")
+
+    assert http_download(f"{mirror}/assetbundles/Android/AB/ABCDEF", file_path) == len(CONTENT)
+
+    with open(file_path, "rb") as f:
+        assert f.read() == CONTENT
+
+
+def test_mirror_manifest(mirror):
+    response = requests.get(f"{mirror}/manifests/Android/abc123/assetbundle.manifest")
+
+    assert response.status_code == 200
+    assert response.content == b"manifest"
+
+
+def test_mirror_range(mirror):
+    response = requests.get(f"{mirror}/assetbundles/Android/AB/ABCDEF", headers={"Range": "bytes=100-"})
+
+    assert response.status_code == 206
+    assert response.headers["Content-Range"] == f"bytes 100-{len(CONTENT) - 1}/{len(CONTENT)}"
+    assert response.content == CONTENT[100:]
+
+
+def test_mirror_range_not_satisfiable(mirror):
+    response = requests.get(
+        f"{mirror}/assetbundles/Android/AB/ABCDEF", headers={"Range": f"bytes={len(CONTENT)}-"}
+    )
+
+    assert response.status_code == 416
+
+
+@pytest.mark.parametrize("path", [
+    "/assetbundles/Android/AB/MISSING",
+    "/assetbundles/Android/../ABCDEF",
+    "/manifests/Android/abc123/..",
+    "/assets/AB/ABCDEF",
+])
+def test_mirror_not_found(mirror, path):
+    assert requests.get(f"{mirror}{path}").status_code == 404
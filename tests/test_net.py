@@ -0,0 +1,141 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from dlasset.utils import IncompleteDownloadError, http_download
+
+CONTENT = bytes(range(256)) * 4096  # 1 MB
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    # Count of the requests to drop in the middle of the content
+    drops = 0
+    supports_range = True
+    # Size of the blocks which the ranges are aligned to, such as by a cache in front of the server
+    range_alignment = 1
+    requests: list[dict[str, str]] = []
+
+    def do_GET(self):
+        type(self).requests.append(dict(self.headers))
+
+        start = 0
+        if self.supports_range and (range_header := self.headers.get("Range")):
+            start = int(range_header[len("bytes="):].split("-")[0])
+            start -= start % self.range_alignment
+
+        body = CONTENT[start:]
+
+        if self.headers.get("Range") and self.supports_range:
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(CONTENT) - 1}/{len(CONTENT)}")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+
+        if type(self).drops:
+            type(self).drops -= 1
+            self.wfile.write(body[:len(body) // 3])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+
+        self.wfile.write(body)
+
+    def log_message(self, *_):
+        pass
+
+
+@pytest.fixture
+def server():
+    StandInHandler.drops = 0
+    StandInHandler.supports_range = True
+    StandInHandler.range_alignment = 1
+    StandInHandler.requests = []
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+
+    yield f"http://127.0.0.1:{httpd.server_port}/asset"
+
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_download(server, tmp_path):
+    file_path = os.path.join(tmp_path, "asset")
+
+    assert http_download(server, file_path, expected_size=len(CONTENT)) == len(CONTENT)
+
+    with open(file_path, "rb") as f:
+        assert f.read() == CONTENT
+    assert os.listdir(tmp_path) == ["asset"]
+
+
+def test_download_resumes_dropped_connection(server, tmp_path):
+    StandInHandler.drops = 2
+    file_path = os.path.join(tmp_path, "asset")
+
+    http_download(server, file_path, expected_size=len(CONTENT))
+
+    with open(file_path, "rb") as f:
+        assert f.read() == CONTENT
+    # Received content is written in chunks, so it resumes from the end of the last complete chunk
+    range_starts = [
+        int(request["Range"][len("bytes="):].rstrip("-")) for request in StandInHandler.requests[1:]
+    ]
+    assert "Range" not in StandInHandler.requests[0]
+    assert len(range_starts) == 2
+    assert 0 < range_starts[0] < range_starts[1]
+
+
+def test_download_restarts_without_range_support(server, tmp_path):
+    StandInHandler.drops = 1
+    StandInHandler.supports_range = False
+    file_path = os.path.join(tmp_path, "asset")
+
+    http_download(server, file_path, expected_size=len(CONTENT))
+
+    with open(file_path, "rb") as f:
+        assert f.read() == CONTENT
+    assert len(StandInHandler.requests) == 2
+
+
+def test_download_resumes_partial_file_of_previous_run(server, tmp_path):
+    file_path = os.path.join(tmp_path, "asset")
+    with open(f"{file_path}.part", "wb") as f:
+        f.write(CONTENT[:1000])
+
+    http_download(server, file_path, expected_size=len(CONTENT))
+
+    with open(file_path, "rb") as f:
+        assert f.read() == CONTENT
+    assert StandInHandler.requests[0]["Range"] == "bytes=1000-"
+
+
+def test_download_restarts_on_range_mismatch(server, tmp_path):
+    StandInHandler.range_alignment = 4096
+    file_path = os.path.join(tmp_path, "asset")
+    with open(f"{file_path}.part", "wb") as f:
+        f.write(CONTENT[:1000])
+
+    http_download(server, file_path, expected_size=len(CONTENT))
+
+    with open(file_path, "rb") as f:
+        assert f.read() == CONTENT
+    assert StandInHandler.requests[0]["Range"] == "bytes=1000-"
+    assert "Range" not in StandInHandler.requests[1]
+
+
+def test_download_size_mismatch(server, tmp_path):
+    file_path = os.path.join(tmp_path, "asset")
+
+    with pytest.raises(IncompleteDownloadError):
+        http_download(server, file_path, expected_size=len(CONTENT) - 1)
+
+    assert not os.listdir(tmp_path)
@@ -0,0 +1,152 @@
+import os
+import time
+from types import SimpleNamespace
+
+import psutil
+import pytest
+
+from dlasset.manage import main as manage_main
+from dlasset.manage import get_download_stats
+from dlasset.utils import BrokenWorkerError, WorkerPool, get_http_stats, net
+
+
+def get_pid():
+    return os.getpid()
+
+
+def crash():
+    os._exit(1)
+
+
+def return_unpicklable():
+    return lambda: None
+
+
+def get_pid_after(seconds):
+    time.sleep(seconds)
+    return os.getpid()
+
+
+@pytest.fixture
+def pool_factory():
+    pools = []
+
+    def make_pool(*args, **kwargs):
+        pool = WorkerPool(*args, **kwargs)
+        pools.append(pool)
+        return pool
+
+    yield make_pool
+
+    for pool in pools:
+        pool.shutdown(cancel_pending=True)
+
+
+def test_pool_run(pool_factory):
+    pool = pool_factory(2)
+
+    futures = [pool.submit(pow, 2, idx) for idx in range(10)]
+
+    assert [future.result(timeout=10) for future in futures] == [2 ** idx for idx in range(10)]
+    assert all(future.duration is not None for future in futures)
+
+
+def test_pool_worker_crash(pool_factory):
+    pool = pool_factory(1)
+
+    with pytest.raises(BrokenWorkerError):
+        pool.submit(crash).result(timeout=10)
+
+    # Crashed worker is replaced
+    assert pool.submit(pow, 2, 3).result(timeout=10) == 8
+
+
+def test_pool_unpicklable_result(pool_factory):
+    pool = pool_factory(1)
+
+    with pytest.raises(RuntimeError, match="Failed to send the task result"):
+        pool.submit(return_unpicklable).result(timeout=10)
+
+    assert pool.submit(pow, 2, 3).result(timeout=10) == 8
+
+
+def test_pool_recycle_by_task_count(pool_factory):
+    pool = pool_factory(1, max_tasks_per_worker=2)
+
+    pids = [pool.submit(get_pid).result(timeout=10) for _ in range(5)]
+
+    assert pids[0] == pids[1]
+    assert pids[1] != pids[2]
+    assert pids[2] == pids[3]
+    assert len(set(pids)) == 3
+
+
+def test_pool_affinity(pool_factory):
+    pool = pool_factory(2)
+
+    futures_a = []
+    futures_b = []
+    for _ in range(6):
+        # The first task of each key binds the key to an idle worker, the others wait for both workers to be busy
+        futures_a.append(pool.submit(get_pid_after, 0.05, affinity="a"))
+        futures_b.append(pool.submit(get_pid_after, 0.05, affinity="b"))
+
+    pids_a = [future.result(timeout=10) for future in futures_a]
+    pids_b = [future.result(timeout=10) for future in futures_b]
+
+    # The tasks at the tail could be stolen by the idle worker
+    assert len(set(pids_a[:4])) == 1
+    assert len(set(pids_b[:4])) == 1
+    assert pids_a[0] != pids_b[0]
+    assert futures_a[1].worker_id == futures_a[0].worker_id
+
+
+def test_pool_submit_after_shutdown(pool_factory):
+    pool = pool_factory(1)
+    pool.shutdown()
+
+    with pytest.raises(RuntimeError):
+        pool.submit(get_pid)
+
+
+def get_worker_stats_names():
+    return sorted(get_download_stats()) + sorted(get_http_stats())
+
+
+def test_pool_recycle_with_held_module_locks(pool_factory):
+    # Replacement workers are forked from the collector thread while the download threads could hold these locks
+    with manage_main._DOWNLOAD_STATS_LOCK, net._SESSION_LOCK:
+        pool = pool_factory(1, max_tasks_per_worker=1)
+
+        pids = [pool.submit(get_pid).result(timeout=10) for _ in range(3)]
+
+    assert len(set(pids)) == 3
+    assert pool.submit(get_worker_stats_names).result(timeout=10)
+
+
+def test_pool_recycle_by_memory(pool_factory, monkeypatch):
+    monkeypatch.setattr(psutil.Process, "memory_info", lambda _: SimpleNamespace(rss=2048))
+    pool = pool_factory(1, memory_budget=1024, sample_interval=0.05)
+
+    pids = set()
+    for _ in range(3):
+        pids.add(pool.submit(get_pid_after, 0.2).result(timeout=10))
+
+    # Recycled after the task running while the budget is exceeded
+    assert len(pids) > 1
+    assert pool._stats.recycled["memory"] >= 1
+
+
+def test_pool_hold_tasks_on_low_memory(pool_factory, monkeypatch):
+    monkeypatch.setattr(psutil, "virtual_memory", lambda: SimpleNamespace(available=512))
+    pool = pool_factory(2, memory_floor=1024, sample_interval=0.05)
+
+    slow = pool.submit(get_pid_after, 0.5)
+    fast = pool.submit(get_pid)
+
+    # Held while another task is running, even if a worker is idle
+    time.sleep(0.3)
+    assert not fast.done()
+
+    slow.result(timeout=10)
+    fast.result(timeout=10)
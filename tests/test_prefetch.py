@@ -0,0 +1,67 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from dlasset.manage import prefetch
+from dlasset.manage.prefetch import READY_LOOK_AHEAD, prefetch_assets
+
+
+class StandInEntry:
+    def __init__(self, name, delay=0.0):
+        self.name = name
+        self.size = 1
+        self.delay = delay
+
+    def get_asset_path(self, _):
+        return self.name
+
+
+class StandInIndex:
+    @staticmethod
+    def is_downloaded(_):
+        return False
+
+
+@pytest.fixture
+def env(monkeypatch):
+    release = threading.Event()
+
+    def ensure_asset(_, entry):
+        if entry.delay:
+            release.wait(timeout=10)
+        return True
+
+    monkeypatch.setattr(prefetch, "ensure_asset", ensure_asset)
+    monkeypatch.setattr(prefetch, "get_cached_asset_index", lambda _: StandInIndex())
+
+    return SimpleNamespace(config=SimpleNamespace(concurrency=SimpleNamespace(download_threads=4)), release=release)
+
+
+def test_prefetch_keeps_order(env):
+    items = [[StandInEntry(f"asset-{idx}")] for idx in range(40)]
+
+    ready = [int(item[0].name.split("-")[1]) for item in prefetch_assets(env, items, lambda item: item)]
+
+    assert ready == list(range(40))
+
+
+def test_prefetch_shared_asset_once(env):
+    shared = StandInEntry("shared")
+    items = [[shared, StandInEntry("a")], [shared], []]
+
+    assert list(prefetch_assets(env, items, lambda item: item)) == items
+
+
+def test_prefetch_look_ahead(env):
+    items = [[StandInEntry("slow", delay=1)]] + [[StandInEntry(f"asset-{idx}")] for idx in range(READY_LOOK_AHEAD + 5)]
+
+    ready = []
+    for item in prefetch_assets(env, items, lambda item: item):
+        ready.append(item[0].name)
+        # Items after the look-ahead are not held for the slow download
+        if len(ready) == 5:
+            env.release.set()
+
+    assert ready[:5] == [f"asset-{idx}" for idx in range(5)]
+    assert sorted(ready) == sorted(item[0].name for item in items)
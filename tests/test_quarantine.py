@@ -0,0 +1,126 @@
+import json
+from types import SimpleNamespace
+
+from dlasset.config import AssetTask
+from dlasset.enums import Locale
+from dlasset.env import Quarantine
+from dlasset.env.index import FileIndex
+from dlasset.export.plan import plan_export
+from dlasset.manifest import Manifest
+
+TASK = AssetTask({
+    "name": "Character", "asset": "^chara/",
+    "tasks": [
+        {"name": "Sprite", "container": "sprite", "type": "Texture2D"},
+        {"name": "Data", "container": "data", "type": "MonoBehaviour"},
+    ],
+})
+
+SPRITE, DATA = TASK.tasks
+
+
+def make_entry(name, asset_hash, dependencies=()):
+    return {
+        "name": name, "hash": asset_hash, "size": 1, "group": 0, "dependencies": list(dependencies), "assets": []
+    }
+
+
+MANIFEST = Manifest({
+    Locale.JP: {
+        "categories": [{
+            "name": "Character",
+            "assets": [
+                make_entry("chara/a", "A1", ["shader"]),
+                make_entry("chara/b", "B1"),
+                make_entry("shader", "S1"),
+            ]
+        }],
+        "rawAssets": [],
+    }
+})
+
+
+def get_entries(name):
+    entry = MANIFEST.manifests[Locale.JP].entry_by_name[name]
+
+    return MANIFEST.get_entries_including_dependencies(Locale.JP, entry)
+
+
+def test_quarantine_add(tmp_path):
+    quarantine = Quarantine(str(tmp_path))
+    entries = get_entries("chara/a")
+
+    quarantine.add(TASK, SPRITE, Locale.JP, entries, ValueError("Broken sprite"))
+    quarantine.add(TASK, DATA, Locale.JP, entries, KeyError("data"))
+
+    # Each entry is quarantined once, with the errors of each subtask
+    assert len(quarantine) == 1
+    assert quarantine.is_quarantined(TASK, Locale.JP, entries[0])
+    assert not quarantine.is_quarantined(TASK, Locale.EN, entries[0])
+    assert quarantine.get_entry_names(TASK, Locale.JP) == {"chara/a"}
+
+
+def test_quarantine_release(tmp_path):
+    quarantine = Quarantine(str(tmp_path))
+    entries = get_entries("chara/a")
+    quarantine.add(TASK, SPRITE, Locale.JP, entries, ValueError("Broken sprite"))
+
+    quarantine.release(TASK, Locale.JP, entries[0])
+    # Releasing an entry not quarantined does nothing
+    quarantine.release(TASK, Locale.JP, get_entries("chara/b")[0])
+
+    assert not quarantine
+    assert not quarantine.is_quarantined(TASK, Locale.JP, entries[0])
+
+
+def test_quarantine_export(tmp_path):
+    quarantine = Quarantine(str(tmp_path))
+    quarantine.add(TASK, SPRITE, Locale.JP, get_entries("chara/a"), ValueError("Broken sprite"))
+    quarantine.add(TASK, SPRITE, Locale.JP, get_entries("chara/b"), ValueError("Broken sprite"))
+    quarantine.release(TASK, Locale.JP, get_entries("chara/b")[0])
+    quarantine.export()
+
+    with open(quarantine.file_path, encoding="utf-8") as f:
+        assert json.load(f) == {
+            "Character": {
+                "jp": {
+                    "chara/a": {
+                        "hash": "A1",
+                        "dependencies": ["shader"],
+                        "errors": {SPRITE.title: "ValueError: Broken sprite"},
+                    }
+                }
+            }
+        }
+
+    assert Quarantine(str(tmp_path)).is_quarantined(TASK, Locale.JP, get_entries("chara/a")[0])
+
+
+def test_quarantine_export_drops_empty(tmp_path):
+    quarantine = Quarantine(str(tmp_path))
+    quarantine.add(TASK, SPRITE, Locale.JP, get_entries("chara/a"), ValueError("Broken sprite"))
+    quarantine.release(TASK, Locale.JP, get_entries("chara/a")[0])
+    quarantine.export()
+
+    with open(quarantine.file_path, encoding="utf-8") as f:
+        assert not json.load(f)
+
+
+def test_quarantine_planned_in_next_run(tmp_path):
+    quarantine = Quarantine(str(tmp_path))
+    quarantine.add(TASK, SPRITE, Locale.JP, get_entries("chara/a"), ValueError("Broken sprite"))
+    quarantine.export()
+
+    index = FileIndex(
+        index_dir=str(tmp_path), version_code="test", enabled=True,
+        export_updated=False, export_updated_dir=str(tmp_path)
+    )
+    for entry in MANIFEST.manifests[Locale.JP].entry_by_name.values():
+        index.update_entry(Locale.JP, entry)
+
+    env = SimpleNamespace(args=SimpleNamespace(no_index=False), index=index, quarantine=Quarantine(str(tmp_path)))
+
+    # Everything else is up to date
+    assert [(item.key, item.jobs) for item in plan_export(env, MANIFEST, [TASK])] == [
+        ((Locale.JP, "chara/a"), [(TASK, SPRITE), (TASK, DATA)]),
+    ]
@@ -0,0 +1,88 @@
+import json
+from datetime import datetime
+from types import SimpleNamespace
+
+from dlasset.config import AssetTask
+from dlasset.enums import Locale
+from dlasset.env import Environment, TaskTimings
+from dlasset.export.plan import ExportPlanItem
+from dlasset.export.schedule import DEFAULT_SECONDS_PER_BYTE, ExportSchedule
+
+TASK = AssetTask({
+    "name": "Character", "asset": "^chara/",
+    "tasks": [{"name": "Sprite", "container": "sprite", "type": "Texture2D"}],
+})
+
+
+class StubEntry:
+    def __init__(self, name, size):
+        self.name = name
+        self.hash = name
+        self.size = size
+
+
+def make_item(name, size, *dependency_sizes):
+    entries = [StubEntry(name, size)]
+    entries.extend(StubEntry(f"{name}-dep-{idx}", dep_size) for idx, dep_size in enumerate(dependency_sizes))
+
+    return ExportPlanItem(locale=Locale.JP, entries=entries, jobs=[(TASK, TASK.tasks[0])])
+
+
+def get_names(items):
+    return [item.entries[0].name for item in items]
+
+
+def test_schedule_longest_first_by_size(tmp_path):
+    items = [make_item("small", 10), make_item("large", 1000), make_item("with-deps", 10, 500, 500)]
+    schedule = ExportSchedule(TaskTimings(str(tmp_path)), items)
+
+    # Dependencies are included in the cost
+    assert get_names(schedule.ordered) == ["with-deps", "large", "small"]
+
+
+def test_schedule_recorded_timings(tmp_path):
+    timings = TaskTimings(str(tmp_path))
+    timings.record("jp|small", 10, 5)
+    timings.record("jp|large", 1000, 1)
+
+    items = [make_item("small", 10), make_item("large", 1000), make_item("new", 100000)]
+    schedule = ExportSchedule(timings, items)
+
+    # Items without timings are estimated from the recorded seconds per byte
+    # (6 secs / 1010 bytes * 100000 bytes)
+    assert get_names(schedule.ordered) == ["new", "small", "large"]
+
+
+def test_schedule_default_speed(tmp_path):
+    schedule = ExportSchedule(TaskTimings(str(tmp_path)), [make_item("large", 1000)])
+
+    assert schedule._tasks[(Locale.JP, "large")].predicted == 1000 * DEFAULT_SECONDS_PER_BYTE
+
+
+def test_schedule_on_timing_recorded(tmp_path):
+    timings = TaskTimings(str(tmp_path))
+    schedule = ExportSchedule(timings, [make_item("large", 1000)])
+
+    schedule.on_timing((Locale.JP, "large"), 3)
+
+    assert timings.get_duration("jp|large") == 3
+
+
+def test_schedule_report_per_run(tmp_path):
+    def get_report_path(init_time):
+        env = SimpleNamespace(config=SimpleNamespace(paths=SimpleNamespace(log=str(tmp_path))), init_time=init_time)
+        return Environment.schedule_report_path.fget(env)
+
+    first_path = get_report_path(datetime(2022, 1, 1, 0, 0, 0))
+    second_path = get_report_path(datetime(2022, 1, 1, 0, 0, 1))
+    assert first_path != second_path
+
+    timings = TaskTimings(str(tmp_path))
+    for report_path, name in ((first_path, "first"), (second_path, "second")):
+        schedule = ExportSchedule(timings, [make_item(name, 1000), make_item("not-run", 10)])
+        schedule.on_timing((Locale.JP, name), 2)
+        schedule.report(report_path)
+
+    # Only the completed tasks of the run
+    with open(second_path, encoding="utf-8") as f:
+        assert [task["name"] for task in json.load(f)["tasks"]] == ["second"]